@@ -4,6 +4,7 @@ import base64
 import logging
 import os
 import time
+from collections.abc import AsyncIterator
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
@@ -14,6 +15,17 @@ from aiohttp_session import get_session, setup
 from aiohttp_session.cookie_storage import EncryptedCookieStorage
 from dotenv import load_dotenv
 
+from .services.client_session_pool import (
+    close_client_sessions,
+    init_client_sessions,
+)
+from .services.competition_format_adapter import COMPETITION_FORMAT_SERVICE_URL
+from .services.config_adapter import get_global_settings
+from .services.events_adapter import EVENT_SERVICE_URL
+from .services.photos_adapter import PHOTO_SERVICE_URL
+from .services.status_adapter import close_status_writer, get_status_writer
+from .services.transcode_service import get_transcode_service
+from .services.user_adapter import USER_SERVICE_URL
 from .views import (
     Config,
     Login,
@@ -22,7 +34,10 @@ from .views import (
     Photos,
     Ping,
     Status,
+    Thumbnail,
     VideoEvents,
+    VideoEventsStream,
+    close_video_status_collectors,
 )
 
 load_dotenv()
@@ -41,6 +56,34 @@ async def handler(request) -> web.Response:
     return web.Response(text=text)
 
 
+async def client_sessions_ctx(_app: web.Application) -> AsyncIterator[None]:
+    """Open shared backend client sessions on startup, close them on cleanup."""
+    init_client_sessions(
+        [
+            COMPETITION_FORMAT_SERVICE_URL,
+            EVENT_SERVICE_URL,
+            PHOTO_SERVICE_URL,
+            USER_SERVICE_URL,
+        ],
+    )
+    yield
+    await close_client_sessions()
+
+
+async def status_writer_ctx(_app: web.Application) -> AsyncIterator[None]:
+    """Start the status writer, write queued status messages on cleanup."""
+    get_status_writer().start()
+    yield
+    await close_status_writer()
+
+
+async def transcode_ctx(_app: web.Application) -> AsyncIterator[None]:
+    """Transcode raw captured video files, if this worker gets the lock."""
+    get_transcode_service().start_supervisor()
+    yield
+    await get_transcode_service().close()
+
+
 async def create_app() -> web.Application:
     """Create an web application."""
     app = web.Application()
@@ -68,6 +111,9 @@ async def create_app() -> web.Application:
     )
     logging.info(f"template_path: {template_path}")
 
+    # parse default config values once, reloaded only if the file changes
+    get_global_settings()
+
     app.add_routes(
         [
             web.view("/", Main),
@@ -77,7 +123,9 @@ async def create_app() -> web.Application:
             web.view("/ping", Ping),
             web.view("/photos", Photos),
             web.view("/status", Status),
+            web.view("/thumbnail", Thumbnail),
             web.view("/video_events", VideoEvents),
+            web.view("/video_events/stream", VideoEventsStream),
         ],
     )
     static_dir = f"{PROJECT_ROOT}/static"
@@ -88,4 +136,12 @@ async def create_app() -> web.Application:
     app.router.add_static("/static/", path=static_dir, name="static")
     app.router.add_static("/files/", path=files_dir, name="files")
 
+    # connection pooled sessions towards the backend services
+    app.cleanup_ctx.append(client_sessions_ctx)
+    # cleaned up in reverse order - queued status is written before sessions close
+    app.cleanup_ctx.append(status_writer_ctx)
+    app.cleanup_ctx.append(transcode_ctx)
+    # end open status streams, they would otherwise delay shutdown
+    app.on_shutdown.append(close_video_status_collectors)
+
     return app
@@ -1,5 +1,6 @@
 """Package for all services."""
 
+from .cloud_storage_service import CloudStorageService
 from .competition_format_adapter import CompetitionFormatAdapter
 from .config_adapter import ConfigAdapter
 from .events_adapter import EventsAdapter
@@ -11,4 +12,7 @@ from .photos_adapter import PhotosAdapter
 from .photos_file_adapter import PhotosFileAdapter
 from .service_instance_adapter import ServiceInstanceAdapter
 from .status_adapter import StatusAdapter
+from .status_writer import StatusWriter
+from .thumbnail_service import ThumbnailService
+from .transcode_service import TranscodeService
 from .user_adapter import UserAdapter
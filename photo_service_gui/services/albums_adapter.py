@@ -4,11 +4,13 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs
+from aiohttp import hdrs
 from multidict import MultiDict
 
 from photo_service_gui.model import Album, AlbumSchema
 
+from .client_session_pool import get_client_session
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
@@ -29,7 +31,7 @@ class AlbumsAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/albums", headers=headers,
         ) as resp:
             logging.info(f"get_all_albums - got response {resp.status}")
@@ -56,7 +58,7 @@ class AlbumsAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/albums/{album_id}", headers=headers,
         ) as resp:
             logging.info(f"get_album {album_id} - got response {resp.status}")
@@ -84,7 +86,7 @@ class AlbumsAdapter:
         )
         servicename = "get_album_by_g_id"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/albums?gId={g_id}", headers=headers,
         ) as resp:
             logging.info(f"get_album_by_g_id {g_id} - got response {resp.status}")
@@ -114,7 +116,7 @@ class AlbumsAdapter:
         )
         request_body = AlbumSchema().dump(album)
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(PHOTO_SERVICE_URL).post(
             f"{PHOTO_SERVICE_URL}/albums", headers=headers, json=request_body,
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
@@ -140,7 +142,7 @@ class AlbumsAdapter:
             ],
         )
         url = f"{PHOTO_SERVICE_URL}/albums/{album_id}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(PHOTO_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             pass
@@ -167,7 +169,7 @@ class AlbumsAdapter:
         )
         request_body = AlbumSchema().dump(album)
 
-        async with ClientSession() as session, session.put(
+        async with get_client_session(PHOTO_SERVICE_URL).put(
             f"{
                 PHOTO_SERVICE_URL
             }/albums/{album_id}", headers=headers, json=request_body,
@@ -0,0 +1,64 @@
+"""Module for shared, connection pooled http client sessions."""
+
+import asyncio
+import logging
+import os
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+from dotenv import load_dotenv
+
+load_dotenv()
+HTTP_CONNECTION_LIMIT = int(os.getenv("HTTP_CONNECTION_LIMIT", "100"))
+HTTP_CONNECTION_LIMIT_PER_HOST = int(os.getenv("HTTP_CONNECTION_LIMIT_PER_HOST", "20"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_TOTAL_TIMEOUT = float(os.getenv("HTTP_TOTAL_TIMEOUT", "60"))
+
+# one session per backend service url, bound to the loop that created it
+_sessions: dict[str, tuple[asyncio.AbstractEventLoop, ClientSession]] = {}
+
+
+def get_client_session(service_url: str) -> ClientSession:
+    """Return the shared client session for a backend service.
+
+    The session is created on first use. A new session is created if the
+    previous one is closed or belongs to another event loop.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _sessions.get(service_url)
+    if entry:
+        session_loop, session = entry
+        if session_loop is loop and not session.closed:
+            return session
+    session = ClientSession(
+        connector=TCPConnector(
+            limit=HTTP_CONNECTION_LIMIT,
+            limit_per_host=HTTP_CONNECTION_LIMIT_PER_HOST,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+        ),
+        timeout=ClientTimeout(
+            total=HTTP_TOTAL_TIMEOUT,
+            connect=HTTP_CONNECT_TIMEOUT,
+        ),
+    )
+    _sessions[service_url] = (loop, session)
+    logging.debug(f"Created client session for {service_url}")
+    return session
+
+
+def init_client_sessions(service_urls: list[str]) -> None:
+    """Create shared client sessions for the given backend services."""
+    for service_url in service_urls:
+        get_client_session(service_url)
+
+
+async def close_client_sessions() -> None:
+    """Close all shared client sessions owned by the running event loop."""
+    loop = asyncio.get_running_loop()
+    while _sessions:
+        service_url, (session_loop, session) = _sessions.popitem()
+        if session_loop is loop and not session.closed:
+            await session.close()
+        logging.debug(f"Closed client session for {service_url}")
@@ -0,0 +1,214 @@
+"""Service for non-blocking Google Cloud Storage operations."""
+
+import asyncio
+import functools
+import logging
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+from dotenv import load_dotenv
+
+from .google_cloud_storage_adapter import (
+    GOOGLE_STORAGE_BATCH_SIZE,
+    GoogleCloudStorageAdapter,
+)
+from .ttl_cache import TTLCache
+
+load_dotenv()
+GOOGLE_STORAGE_MAX_WORKERS = int(os.getenv("GOOGLE_STORAGE_MAX_WORKERS", "8"))
+GOOGLE_STORAGE_TIMEOUT = float(os.getenv("GOOGLE_STORAGE_TIMEOUT", "30"))
+GOOGLE_STORAGE_UPLOAD_TIMEOUT = float(
+    os.getenv("GOOGLE_STORAGE_UPLOAD_TIMEOUT", "120"),
+)
+QUEUE_LENGTH_CACHE_TTL = float(os.getenv("QUEUE_LENGTH_CACHE_TTL", "5"))
+
+# queue lengths shared by all sessions in this process, key is (event_id, prefix)
+_queue_length_cache = TTLCache(maxsize=256, ttl=QUEUE_LENGTH_CACHE_TTL)
+
+# thread pool for blocking storage calls, one per process
+_executors: dict[int, ThreadPoolExecutor] = {}
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Return the storage thread pool for this process."""
+    pid = os.getpid()
+    if pid not in _executors:
+        # first use, or inherited from parent process - start over
+        _executors.clear()
+        _executors[pid] = ThreadPoolExecutor(
+            max_workers=GOOGLE_STORAGE_MAX_WORKERS,
+            thread_name_prefix="cloud-storage",
+        )
+    return _executors[pid]
+
+
+async def _run_in_thread(
+    time_limit: float, func: Callable[..., Any], *args: Any,
+) -> Any:
+    """Run blocking storage call in the thread pool, with time limit."""
+    loop = asyncio.get_running_loop()
+    return await asyncio.wait_for(
+        loop.run_in_executor(_get_executor(), functools.partial(func, *args)),
+        time_limit,
+    )
+
+
+class CloudStorageService:
+
+    """Service for Google Cloud Storage operations without blocking.
+
+    The storage client library is synchronous. This service runs each call
+    on a bounded thread pool with a time limit, so a slow bucket operation
+    does not stall the event loop serving other users.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Cloud Storage Service."""
+        self.adapter = GoogleCloudStorageAdapter()
+
+    async def list_blobs(self, event_id: str, prefix: str) -> list[dict]:
+        """List all blobs in the bucket that begin with the prefix."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT, self.adapter.list_blobs, event_id, prefix,
+        )
+
+    async def list_blobs_page(
+        self, event_id: str, prefix: str, page_token: str, max_results: int,
+    ) -> tuple[list[dict], str]:
+        """List one page of blobs that begin with the prefix, and next token."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT,
+            self.adapter.list_blobs_page,
+            event_id,
+            prefix,
+            page_token,
+            max_results,
+        )
+
+    async def get_queue_length(self, event_id: str, prefix: str) -> int:
+        """Return number of blobs waiting directly under the prefix.
+
+        The count is cached for a few seconds, so frequent polling from
+        many browsers results in one listing per event.
+        """
+        queue_length = _queue_length_cache.get((event_id, prefix))
+        if queue_length is None:
+            queue_length = await _run_in_thread(
+                GOOGLE_STORAGE_TIMEOUT, self.adapter.count_blobs, event_id, prefix,
+            )
+            _queue_length_cache.set((event_id, prefix), queue_length)
+        return queue_length
+
+    async def move_blob(
+        self, source_blob_name: str, destination_blob_name: str,
+    ) -> str:
+        """Move a blob within the bucket, return URL to moved file."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT,
+            self.adapter.move_blob,
+            source_blob_name,
+            destination_blob_name,
+        )
+
+    async def delete_blob(self, blob_name: str) -> None:
+        """Delete a blob in the bucket."""
+        await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT, self.adapter.delete_blob, blob_name,
+        )
+
+    async def delete_blobs(self, blob_names: list[str]) -> dict[str, str]:
+        """Delete blobs in batches, return error per blob, empty if deleted."""
+        batch_count = -(-len(blob_names) // GOOGLE_STORAGE_BATCH_SIZE)
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT * max(batch_count, 1),
+            self.adapter.delete_blobs,
+            blob_names,
+        )
+
+    async def move_blobs(self, blob_names: dict[str, str]) -> dict[str, str]:
+        """Move blobs (source: destination) concurrently.
+
+        Returns error per source blob name, empty if the blob was moved.
+        """
+        # not more moves in flight than the thread pool can run
+        semaphore = asyncio.Semaphore(GOOGLE_STORAGE_MAX_WORKERS)
+
+        async def move(source: str, destination: str) -> tuple[str, str]:
+            async with semaphore:
+                try:
+                    await self.move_blob(source, destination)
+                except Exception as e:
+                    logging.exception(f"Error moving {source} to {destination}")
+                    return source, str(e) or e.__class__.__name__
+                return source, ""
+
+        results = await asyncio.gather(
+            *(move(source, destination) for source, destination in blob_names.items()),
+        )
+        return dict(results)
+
+    async def move_to_capture_archive(self, event_id: str, filename: str) -> str:
+        """Move photo to capture archive."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT,
+            self.adapter.move_to_capture_archive,
+            event_id,
+            filename,
+        )
+
+    async def move_to_error_archive(self, event_id: str, filename: str) -> str:
+        """Move photo to error archive."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT,
+            self.adapter.move_to_error_archive,
+            event_id,
+            filename,
+        )
+
+    async def download_blob_bytes(self, blob_name: str) -> bytes:
+        """Download content of a blob in the bucket."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_UPLOAD_TIMEOUT, self.adapter.download_blob_bytes, blob_name,
+        )
+
+    async def get_blob_generation(self, blob_name: str) -> str:
+        """Get generation of a blob, it changes when the blob is overwritten."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_TIMEOUT, self.adapter.get_blob_generation, blob_name,
+        )
+
+    async def upload_blob(
+        self, event_id: str, destination_folder: str, source_file_name: str,
+    ) -> str:
+        """Upload a file to the bucket, return URL to uploaded file."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_UPLOAD_TIMEOUT,
+            self.adapter.upload_blob,
+            event_id,
+            destination_folder,
+            source_file_name,
+        )
+
+    async def upload_blob_bytes(
+        self,
+        event_id: str,
+        destination_folder: str,
+        filename: str,
+        data: bytes,
+        *,
+        content_type: str,
+        metadata: dict,
+    ) -> str:
+        """Upload a byte object to the bucket, return URL to uploaded file."""
+        return await _run_in_thread(
+            GOOGLE_STORAGE_UPLOAD_TIMEOUT,
+            self.adapter.upload_blob_bytes,
+            event_id,
+            destination_folder,
+            filename,
+            data,
+            content_type,
+            metadata,
+        )
@@ -6,9 +6,11 @@ import os
 from http import HTTPStatus
 from pathlib import Path
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
+
 COMPETITION_FORMAT_HOST_SERVER = os.getenv(
     "COMPETITION_FORMAT_HOST_SERVER", "localhost",
 )
@@ -32,7 +34,7 @@ class CompetitionFormatAdapter:
             ],
         )
         url = f"{COMPETITION_FORMAT_SERVICE_URL}/competition-formats"
-        async with ClientSession() as session, session.post(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).post(
             url, headers=headers, json=request_body,
         ) as resp:
             res = resp.status
@@ -59,7 +61,7 @@ class CompetitionFormatAdapter:
             ],
         )
         url = f"{COMPETITION_FORMAT_SERVICE_URL}/competition-formats/{my_id}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             res = resp.status
@@ -87,7 +89,7 @@ class CompetitionFormatAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).get(
             f"{COMPETITION_FORMAT_SERVICE_URL}/competition-formats", headers=headers,
         ) as resp:
             logging.info(f"get_competition_formats - got response {resp.status}")
@@ -149,7 +151,7 @@ class CompetitionFormatAdapter:
                 COMPETITION_FORMAT_SERVICE_URL
             }/competition-formats/{request_body['id']}"
         )
-        async with ClientSession() as session, session.put(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).put(
             url, headers=headers, json=request_body,
         ) as resp:
             res = resp.status
@@ -177,7 +179,7 @@ class CompetitionFormatAdapter:
             ],
         )
         url = f"{COMPETITION_FORMAT_SERVICE_URL}/race-configs"
-        async with ClientSession() as session, session.post(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).post(
             url, headers=headers, json=request_body,
         ) as resp:
             res = resp.status
@@ -204,7 +206,7 @@ class CompetitionFormatAdapter:
             ],
         )
         url = f"{COMPETITION_FORMAT_SERVICE_URL}/race-configs/{my_id}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             res = resp.status
@@ -232,7 +234,7 @@ class CompetitionFormatAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).get(
             f"{COMPETITION_FORMAT_SERVICE_URL}/race-configs", headers=headers,
         ) as resp:
             logging.info(f"get_race_configs - got response {resp.status}")
@@ -261,7 +263,7 @@ class CompetitionFormatAdapter:
             ],
         )
         url = f"{COMPETITION_FORMAT_SERVICE_URL}/race-configs/{request_body['id']}"
-        async with ClientSession() as session, session.put(
+        async with get_client_session(COMPETITION_FORMAT_SERVICE_URL).put(
             url, headers=headers, json=request_body,
         ) as resp:
             res = resp.status
@@ -5,16 +5,133 @@ import copy
 import json
 import logging
 import os
+from collections.abc import Mapping
 from http import HTTPStatus
 from pathlib import Path
+from types import MappingProxyType
+from typing import Any
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
+from .ttl_cache import TTLCache
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
 PROJECT_ROOT = f"{Path.cwd()}/photo_service_gui"
+CONFIG_CACHE_TTL = float(os.getenv("CONFIG_CACHE_TTL", "30"))
+CONFIG_CACHE_MAXSIZE = int(os.getenv("CONFIG_CACHE_MAXSIZE", "1000"))
+
+# config values shared by all adapters in this process, key is (event_id, key)
+_config_cache = TTLCache(CONFIG_CACHE_MAXSIZE, CONFIG_CACHE_TTL)
+# written by other services (detect), always read fresh
+UNCACHED_CONFIG_KEYS = {"LATEST_DETECTED_PHOTO_URL", "TRIGGER_LINE_PHOTO_URL"}
+
+
+def _get_cached_config(event_id: str, key: str) -> str | None:
+    """Return cached config value, None if not cached."""
+    if key in UNCACHED_CONFIG_KEYS:
+        return None
+    return _config_cache.get((event_id, key))
+
+
+def _set_cached_config(event_id: str, key: str, value: str) -> None:
+    """Cache config value, unless written by other services."""
+    if key not in UNCACHED_CONFIG_KEYS:
+        _config_cache.set((event_id, key), value)
+
+
+class GlobalSettings:
+
+    """Class representing default config values from global settings file.
+
+    The file is parsed once into an immutable mapping, and parsed again
+    only when its modification time changes.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """Initialize the global settings.
+
+        Args:
+            path: Path to the global settings json file
+
+        """
+        self.path = path
+        self._mtime_ns: int | None = None
+        self._values: Mapping[str, Any] = MappingProxyType({})
+
+    def get_values(self) -> Mapping[str, Any]:
+        """Return default config values, reload if file has changed."""
+        mtime_ns = self.path.stat().st_mtime_ns
+        if mtime_ns != self._mtime_ns:
+            try:
+                with self.path.open() as json_file:
+                    self._values = MappingProxyType(json.load(json_file))
+            except json.JSONDecodeError as e:
+                informasjon = f"Error decoding JSON from {self.path}"
+                logging.exception(informasjon)
+                if self._mtime_ns is None:
+                    raise web.HTTPBadRequest(reason=informasjon) from e
+                # keep last valid settings until the file is fixed
+            self._mtime_ns = mtime_ns
+            logging.debug(f"Loaded global settings from {self.path}")
+        return self._values
+
+
+_global_settings = GlobalSettings(
+    Path(f"{PROJECT_ROOT}/config/global_settings.json"),
+)
+
+
+def get_global_settings() -> Mapping[str, Any]:
+    """Return default config values from global settings file."""
+    return _global_settings.get_values()
+
+
+def _to_list(key: str, value: Any) -> list:
+    """Convert config value to list."""
+    if isinstance(value, list):
+        return value
+    try:
+        # convert from json string to list
+        return json.loads(value)
+    except json.JSONDecodeError:
+        pass
+    # then try Python literal (handles "['a','b']")
+    try:
+        return ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        logging.exception(f"JSON for key '{key}', value '{value}'")
+        return []
+
+
+def _to_img_res_tuple(key: str, value: Any) -> tuple:
+    """Convert config value, like 480x640, to tuple."""
+    try:
+        return tuple(map(int, value.split("x")))
+    except ValueError:
+        informasjon = f"Error - {key} is not a tuple."
+        raise Exception(informasjon) from None
+
+
+_CONFIG_CONVERTERS = {
+    "str": lambda _key, value: value,
+    "bool": lambda _key, value: value in ["True", "true", "1"],
+    "int": lambda _key, value: int(value),
+    "list": _to_list,
+    "img_res_tuple": _to_img_res_tuple,
+}
+CONFIG_VALUE_TYPES = tuple(_CONFIG_CONVERTERS)
+
+
+def convert_config_value(key: str, value: Any, value_type: str) -> Any:
+    """Convert config value to type - one of CONFIG_VALUE_TYPES."""
+    if value_type not in _CONFIG_CONVERTERS:
+        informasjon = f"Error - unknown config type {value_type} for {key}."
+        raise ValueError(informasjon)
+    return _CONFIG_CONVERTERS[value_type](key, value)
 
 
 class ConfigAdapter:
@@ -23,6 +140,9 @@ class ConfigAdapter:
 
     async def get_config(self, token: str, event_id: str, key: str) -> str:
         """Get config by key function."""
+        cached_value = _get_cached_config(event_id, key)
+        if cached_value is not None:
+            return cached_value
         config = {}
         headers = MultiDict(
             [
@@ -31,8 +151,9 @@ class ConfigAdapter:
             ],
         )
         servicename = "get_config"
+        config_not_found = False
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/config?key={key}&eventId={event_id}",
             headers=headers,
         ) as resp:
@@ -42,29 +163,20 @@ class ConfigAdapter:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
             elif resp.status == HTTPStatus.NOT_FOUND:
-                # config not found - find default value
-                config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
-                with config_file.open() as json_file:
-                    try:
-                        settings = json.load(json_file)
-                    except json.JSONDecodeError as e:
-                        informasjon = f"Error decoding JSON from {config_file}"
-                        logging.exception(informasjon)
-                        raise web.HTTPBadRequest(reason=informasjon) from e
-                    if key in settings:
-                        value = settings[key]
-                        # create config
-                        await self.create_config(token, event_id, key, value)
-                        return value
-                informasjon = f"Config {key} not found in config file {config_file}."
-                logging.error(informasjon)
-                raise web.HTTPBadRequest(reason=informasjon)
+                # config not found - create from default value, see below
+                config_not_found = True
             else:
                 body = await resp.json()
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
                 logging.error(informasjon)
                 raise web.HTTPBadRequest(reason=informasjon)
-        return config["value"].strip()
+        if config_not_found:
+            value = self.get_default_value(key)
+            await self.create_config(token, event_id, key, value)
+            return value
+        value = config["value"].strip()
+        _set_cached_config(event_id, key, value)
+        return value
 
     async def get_all_configs(self, token: str, event_id: str) -> list:
         """Get config by google id function."""
@@ -81,7 +193,7 @@ class ConfigAdapter:
         else:
             url = f"{PHOTO_SERVICE_URL}/configs"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             url,
             headers=headers,
         ) as resp:
@@ -97,46 +209,78 @@ class ConfigAdapter:
                 raise web.HTTPBadRequest(reason=informasjon)
         return config
 
+    async def get_configs(
+        self, token: str, event_id: str, key_types: dict[str, str],
+    ) -> dict:
+        """Get several typed config values with one request.
+
+        All configs for the event are fetched in one request, unless every
+        key is cached. Keys missing for the event are created with the
+        default value from global settings.
+
+        Args:
+            token: Authentication token
+            event_id: The event id
+            key_types: Config key mapped to type - one of CONFIG_VALUE_TYPES
+
+        Returns:
+            Config key mapped to typed value
+
+        """
+        values = {}
+        for key in key_types:
+            cached_value = _get_cached_config(event_id, key)
+            if cached_value is not None:
+                values[key] = cached_value
+
+        if len(values) < len(key_types):
+            for config in await self.get_all_configs(token, event_id):
+                value = str(config["value"]).strip()
+                _set_cached_config(event_id, config["key"], value)
+                if config["key"] in key_types:
+                    values[config["key"]] = value
+            for key in key_types.keys() - values.keys():
+                value = self.get_default_value(key)
+                await self.create_config(token, event_id, key, value)
+                values[key] = value
+
+        return {
+            key: convert_config_value(key, values[key], value_type)
+            for key, value_type in key_types.items()
+        }
+
     async def get_config_bool(self, token: str, event_id: str, key: str) -> bool:
         """Get config boolean value."""
         string_value = await self.get_config(token, event_id, key)
-        boolean_value = False
-        if string_value in ["True", "true", "1"]:
-            boolean_value = True
-
-        return boolean_value
+        return convert_config_value(key, string_value, "bool")
 
     async def get_config_int(self, token: str, event_id: str, key: str) -> int:
         """Get config int value."""
         string_value = await self.get_config(token, event_id, key)
-        return int(string_value)
+        return convert_config_value(key, string_value, "int")
 
     async def get_config_list(self, token: str, event_id: str, key: str) -> list:
         """Get config list value."""
         string_value = await self.get_config(token, event_id, key)
-        try:
-            # convert from json string to list
-            return json.loads(string_value)
-        except json.JSONDecodeError:
-            pass
-        # then try Python literal (handles "['a','b']")
-        try:
-            return ast.literal_eval(string_value)
-        except (ValueError, SyntaxError):
-            logging.exception(f"JSON for key '{key}', value '{string_value}'")
-            return []
+        return convert_config_value(key, string_value, "list")
 
     async def get_config_img_res_tuple(
         self, token: str, event_id: str, key: str,
     ) -> tuple:
         """Get config tuple value."""
         string_value = await self.get_config(token, event_id, key)
-        try:
-            tuple_value = tuple(map(int, string_value.split("x")))
-        except ValueError:
-            informasjon = f"Error - {key} is not a tuple."
-            raise Exception(informasjon) from None
-        return tuple_value
+        return convert_config_value(key, string_value, "img_res_tuple")
+
+    def get_default_value(self, key: str) -> Any:
+        """Get default config value from global settings."""
+        settings = get_global_settings()
+        if key not in settings:
+            informasjon = (
+                f"Config {key} not found in config file {_global_settings.path}."
+            )
+            logging.error(informasjon)
+            raise web.HTTPBadRequest(reason=informasjon)
+        return settings[key]
 
     async def create_config(
         self, token: str, event_id: str, key: str, value: str,
@@ -157,13 +301,14 @@ class ConfigAdapter:
         }
         request_body = copy.deepcopy(config)
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(PHOTO_SERVICE_URL).post(
             f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body,
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
                 logging.debug(f"result - got response {resp}")
                 location = resp.headers[hdrs.LOCATION]
                 result = location.split(os.path.sep)[-1]
+                _config_cache.delete((event_id, key))
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -188,6 +333,7 @@ class ConfigAdapter:
         """Update config function."""
         response = ""
         servicename = "update_config"
+        config_not_found = False
         headers = MultiDict(
             [
                 (hdrs.CONTENT_TYPE, "application/json"),
@@ -200,25 +346,16 @@ class ConfigAdapter:
             "value": new_value,
         }
 
-        async with ClientSession() as session, session.put(
+        async with get_client_session(PHOTO_SERVICE_URL).put(
             f"{PHOTO_SERVICE_URL}/config", headers=headers, json=request_body,
         ) as resp:
             response = str(resp.status)
             if resp.status == HTTPStatus.NO_CONTENT:
                 logging.debug(f"update config - got response {resp}")
+                _set_cached_config(event_id, key, new_value.strip())
             elif resp.status == HTTPStatus.NOT_FOUND:
-                # config not found - find default value
-                config_file = Path(f"{PROJECT_ROOT}/config/global_settings.json")
-                with config_file.open() as json_file:
-                    settings = json.load(json_file)
-                    if key in settings:
-                        value = settings[key]
-                        # create config
-                        await self.create_config(token, event_id, key, value)
-                        return value
-                informasjon = f"Config {key} not found in config file {config_file}."
-                logging.error(informasjon)
-                raise web.HTTPBadRequest(reason=informasjon)
+                # config not found - create from default value, see below
+                config_not_found = True
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -227,4 +364,8 @@ class ConfigAdapter:
                 informasjon = f"{servicename} failed - {resp.status} - {body['detail']}"
                 logging.error(informasjon)
                 raise web.HTTPBadRequest(reason=informasjon)
+        if config_not_found:
+            value = self.get_default_value(key)
+            await self.create_config(token, event_id, key, value)
+            return value
         return response
@@ -0,0 +1,96 @@
+"""Module for an in-process index of files in local folders."""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+load_dotenv()
+DIRECTORY_INDEX_RECONCILE_INTERVAL = float(
+    os.getenv("DIRECTORY_INDEX_RECONCILE_INTERVAL", "60"),
+)
+# changes within this window after a scan may not change folder mtime
+DIRECTORY_INDEX_RACY_WINDOW = 1.0
+
+
+class DirectoryIndex:
+
+    """Class representing the file names in a folder, rescanned on change.
+
+    A folder's modification time changes when files are added, removed or
+    renamed in it. The index checks it with one stat call and only rescans
+    the folder when it has changed, or when the reconcile interval has
+    passed, so repeated counts and listings do not stat every file.
+    """
+
+    def __init__(
+        self, path: str, reconcile_interval: float = DIRECTORY_INDEX_RECONCILE_INTERVAL,
+    ) -> None:
+        """Initialize the index.
+
+        Args:
+            path: Folder to index
+            reconcile_interval: Seconds before a full rescan, even if unchanged
+
+        """
+        self.path = path
+        self.reconcile_interval = reconcile_interval
+        self._file_names: list[str] = []
+        self._mtime_ns: int | None = None
+        self._scanned_at = 0.0
+        self._lock = threading.Lock()
+
+    def _is_current(self, mtime_ns: int) -> bool:
+        """Check if the last scan still reflects the folder."""
+        now = time.time()
+        return (
+            mtime_ns == self._mtime_ns
+            and now - self._scanned_at < self.reconcile_interval
+            and mtime_ns / 1e9 < self._scanned_at - DIRECTORY_INDEX_RACY_WINDOW
+        )
+
+    def get_file_names(self) -> list[str]:
+        """Get names of all files in the folder, empty if folder is missing."""
+        with self._lock:
+            try:
+                mtime_ns = Path(self.path).stat().st_mtime_ns
+            except FileNotFoundError:
+                self._file_names = []
+                self._mtime_ns = None
+                return []
+            if not self._is_current(mtime_ns):
+                scanned_at = time.time()
+                with os.scandir(self.path) as entries:
+                    self._file_names = [
+                        entry.name for entry in entries if entry.is_file()
+                    ]
+                self._mtime_ns = mtime_ns
+                self._scanned_at = scanned_at
+                logging.debug(
+                    f"Indexed {len(self._file_names)} files in {self.path}",
+                )
+            return list(self._file_names)
+
+    def count_files(self) -> int:
+        """Get number of files in the folder."""
+        return len(self.get_file_names())
+
+    def invalidate(self) -> None:
+        """Force a rescan on next use."""
+        with self._lock:
+            self._mtime_ns = None
+
+
+_directory_indexes: dict[str, DirectoryIndex] = {}
+_directory_indexes_lock = threading.Lock()
+
+
+def get_directory_index(path: str) -> DirectoryIndex:
+    """Return the shared index of a folder, created on first use."""
+    with _directory_indexes_lock:
+        if path not in _directory_indexes:
+            _directory_indexes[path] = DirectoryIndex(path)
+        return _directory_indexes[path]
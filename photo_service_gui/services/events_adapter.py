@@ -7,16 +7,33 @@ import logging
 import os
 from http import HTTPStatus
 from pathlib import Path
-from zoneinfo import ZoneInfo
 
 from aiohttp import ClientSession, hdrs, web
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
 from .competition_format_adapter import CompetitionFormatAdapter
+from .single_flight import single_flight
+from .time_utils import format_local_time, get_local_datetime_now
+from .ttl_cache import TTLCache
 
 EVENTS_HOST_SERVER = os.getenv("EVENTS_HOST_SERVER", "localhost")
 EVENTS_HOST_PORT = os.getenv("EVENTS_HOST_PORT", "8082")
 EVENT_SERVICE_URL = f"http://{EVENTS_HOST_SERVER}:{EVENTS_HOST_PORT}"
+EVENT_CACHE_TTL = float(os.getenv("EVENT_CACHE_TTL", "30"))
+
+# events fetched in this process, key is (event_id, token)
+_event_cache = TTLCache(maxsize=256, ttl=EVENT_CACHE_TTL)
+
+
+def invalidate_event_cache(event_id: str | None = None) -> None:
+    """Remove an event from the cache, or all events if no id is given."""
+    if event_id is None:
+        _event_cache.clear()
+        return
+    for key in _event_cache.list_keys():
+        if key[0] == event_id:
+            _event_cache.delete(key)
 
 
 class EventsAdapter:
@@ -32,7 +49,7 @@ class EventsAdapter:
             ],
         )
         url = f"{EVENT_SERVICE_URL}/events/{event_id}/generate-raceclasses"
-        async with ClientSession() as session, session.post(
+        async with get_client_session(EVENT_SERVICE_URL).post(
             url, headers=headers,
         ) as resp:
             res = resp.status
@@ -60,7 +77,7 @@ class EventsAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(EVENT_SERVICE_URL).get(
             f"{EVENT_SERVICE_URL}/events", headers=headers,
         ) as resp:
             logging.info(f"get_all_events - got response {resp.status}")
@@ -76,7 +93,16 @@ class EventsAdapter:
         return events
 
     async def get_event(self, token: str, my_id: str) -> dict:
-        """Get event function."""
+        """Get event function, cached for a short time in this process."""
+        event = _event_cache.get((my_id, token))
+        if event is None:
+            event = await self.fetch_event(token, my_id)
+            _event_cache.set((my_id, token), event)
+        return copy.deepcopy(event)
+
+    @single_flight
+    async def fetch_event(self, token: str, my_id: str) -> dict:
+        """Get event from the event service."""
         event = {}
         headers = MultiDict(
             [
@@ -85,7 +111,7 @@ class EventsAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(EVENT_SERVICE_URL).get(
             f"{EVENT_SERVICE_URL}/events/{my_id}", headers=headers,
         ) as resp:
             logging.info(f"get_event {my_id} - got response {resp.status}")
@@ -107,30 +133,11 @@ class EventsAdapter:
 
     def get_local_datetime_now(self, event: dict) -> datetime.datetime:
         """Return local datetime object, time zone adjusted from event info."""
-        time_zone = event["timezone"]
-        if time_zone:
-            local_time_obj = datetime.datetime.now(ZoneInfo(time_zone))
-        else:
-            local_time_obj = datetime.datetime.now(datetime.UTC)
-        return local_time_obj
+        return get_local_datetime_now(event)
 
     def get_local_time(self, event: dict, time_format: str) -> str:
         """Return local time string, time zone adjusted from event info."""
-        lt = "" # local time
-        time_zone = event["timezone"]
-        tn = datetime.datetime.now(
-            ZoneInfo(time_zone),
-        )if time_zone else datetime.datetime.now(datetime.UTC)
-
-        if time_format == "HH:MM":
-            lt = f"{tn.strftime('%H')}:{tn.strftime('%M')}"
-        elif time_format == "log":
-            lt = f"{
-                tn.strftime('%Y')
-            }-{tn.strftime('%m')}-{tn.strftime('%d')}T{tn.strftime('%X')}"
-        else:
-            lt = tn.strftime("%X")
-        return lt
+        return format_local_time(event, time_format)
 
     def get_club_logo_url(self, club_name: str) -> str:
         """Get url to club logo - input is 4 first chars of club name."""
@@ -160,6 +167,7 @@ class EventsAdapter:
             ],
         )
         url = f"{remote_url}/?action=REST"
+        # remote server is not one of our backend services - use own session
         async with ClientSession() as session, session.get(
             url, headers=headers,
         ) as resp:
@@ -181,6 +189,7 @@ class EventsAdapter:
                 raise web.HTTPBadRequest(
                     reason=f"Error - {resp.status}: {body['detail']}.",
                 )
+        invalidate_event_cache()
         return information
 
     async def create_event(self, token: str, event: dict) -> str:
@@ -218,7 +227,7 @@ class EventsAdapter:
         )
         request_body = copy.deepcopy(event)
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(EVENT_SERVICE_URL).post(
                 f"{EVENT_SERVICE_URL}/events", headers=headers, json=request_body,
             ) as resp:
                 if resp.status == HTTPStatus.CREATED:
@@ -246,7 +255,7 @@ class EventsAdapter:
             ],
         )
         url = f"{EVENT_SERVICE_URL}/events/{my_id}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(EVENT_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.NO_CONTENT:
@@ -257,6 +266,7 @@ class EventsAdapter:
                 raise web.HTTPBadRequest(
                     reason=f"Error - {resp.status}: {body['detail']}.",
                 )
+        invalidate_event_cache(my_id)
         return str(resp.status)
 
     async def update_event(self, token: str, my_id: str, request_body: dict) -> str:
@@ -269,7 +279,7 @@ class EventsAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.put(
+        async with get_client_session(EVENT_SERVICE_URL).put(
             f"{EVENT_SERVICE_URL}/events/{my_id}", headers=headers, json=request_body,
         ) as resp:
             result = resp.status
@@ -284,4 +294,5 @@ class EventsAdapter:
                 raise web.HTTPBadRequest(
                     reason=f"Error - {resp.status}: {body['detail']}.",
                 )
+        invalidate_event_cache(my_id)
         return str(result)
@@ -1,11 +1,55 @@
 """Module for foto service."""
 
+import asyncio
 import json
 import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from dotenv import load_dotenv
 
 from .albums_adapter import AlbumsAdapter
 from .photos_adapter import PhotosAdapter
 
+load_dotenv()
+BULK_DELETE_CONCURRENCY = int(os.getenv("BULK_DELETE_CONCURRENCY", "20"))
+BULK_UPDATE_CONCURRENCY = int(os.getenv("BULK_UPDATE_CONCURRENCY", "10"))
+# only enable when the photo service supports deleting all photos of an event
+PHOTOS_BULK_DELETE = os.getenv("PHOTOS_BULK_DELETE", "false").lower() == "true"
+BULK_PROGRESS_INTERVAL = 500
+
+
+async def _run_concurrently(
+    ids: list[str],
+    action: Callable[[str], Awaitable],
+    description: str,
+    concurrency: int,
+) -> int:
+    """Run action for each id with a limited number of requests in flight.
+
+    Progress is logged, and one failed action does not stop the others.
+    Returns number of failed actions.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    progress = {"done": 0, "failed": 0}
+
+    async def run_one(my_id: str) -> None:
+        async with semaphore:
+            try:
+                await action(my_id)
+            except Exception:
+                logging.exception(f"Error - {description} with id {my_id}")
+                progress["failed"] += 1
+        progress["done"] += 1
+        if progress["done"] % BULK_PROGRESS_INTERVAL == 0:
+            logging.info(f"{description}: {progress['done']} of {len(ids)} done")
+
+    await asyncio.gather(*(run_one(my_id) for my_id in ids))
+    logging.info(
+        f"{description}: {len(ids)} done, {progress['failed']} failed",
+    )
+    return progress["failed"]
+
 
 class FotoService:
 
@@ -14,37 +58,50 @@ class FotoService:
     async def delete_all_local_albums(self, token: str, event_id: str) -> str:
         """Delete all local copies of album sync information."""
         albums = await AlbumsAdapter().get_all_albums(token, event_id)
-        for album in albums:
-            result = await AlbumsAdapter().delete_album(token, album.id)
-            logging.info(f"Deleted album with id {album.id}, result {result}")
+        albums_adapter = AlbumsAdapter()
+        failed = await _run_concurrently(
+            [album.id for album in albums],
+            lambda album_id: albums_adapter.delete_album(token, album_id),
+            "Delete albums",
+            BULK_DELETE_CONCURRENCY,
+        )
+        if failed:
+            return f"{len(albums) - failed} av {len(albums)} lokale kopier er slettet."
         return "Alle lokale kopier er slettet."
 
     async def delete_all_local_photos(self, token: str, event_id: str) -> str:
         """Delete all local copies of photo information."""
-        photos = await PhotosAdapter().get_all_photos(token, event_id)
-        for photo in photos:
-            result = await PhotosAdapter().delete_photo(token, photo["id"])
-            logging.info(f"Deleted photo with id {photo['id']}, result {result}")
+        photos_adapter = PhotosAdapter()
+        if PHOTOS_BULK_DELETE:
+            await photos_adapter.delete_photos_by_event(token, event_id)
+            logging.info(f"Deleted all photos in event {event_id} with one request")
+            return "Alle lokale kopier er slettet."
+
+        photos = await photos_adapter.get_all_photos(token, event_id)
+        failed = await _run_concurrently(
+            [photo["id"] for photo in photos],
+            lambda photo_id: photos_adapter.delete_photo(token, photo_id),
+            "Delete photos",
+            BULK_DELETE_CONCURRENCY,
+        )
+        if failed:
+            return f"{len(photos) - failed} av {len(photos)} lokale kopier er slettet."
         return "Alle lokale kopier er slettet."
 
     async def star_photo(self, token: str, photo_id: str) -> str:
         """Mark photo as starred."""
-        photo = await PhotosAdapter().get_photo(token, photo_id)
-        photo["starred"] = True
-        await PhotosAdapter().update_photo(token, photo["id"], photo)
+        await PhotosAdapter().patch_photo(token, photo_id, {"starred": True})
         return "* Stjerne *"
 
     async def unstar_photo(self, token: str, photo_id: str) -> str:
         """Unstarr photo."""
-        photo = await PhotosAdapter().get_photo(token, photo_id)
-        photo["starred"] = False
-        await PhotosAdapter().update_photo(token, photo["id"], photo)
+        await PhotosAdapter().patch_photo(token, photo_id, {"starred": False})
         return "* Fjernet *"
 
     async def update_race_info(self, token: str, event_id: str, form: dict) -> str:
         """Update race information in phostos, biblist."""
         informasjon = ""
-        i_count = 0
+        changes = {}
         for key, value in form.items():
             if key.startswith("biblist_"):
                 try:
@@ -52,14 +109,23 @@ class FotoService:
                     photo_id = key[8:]
                     old_biblist = form[f"old_biblist_{photo_id}"]
                     if new_biblist != old_biblist:
-                        photo = await PhotosAdapter().get_photo(token, photo_id)
-                        photo["biblist"] = json.loads(new_biblist)
-                        photo["event_id"] = event_id
-                        await PhotosAdapter().update_photo(
-                            token, photo["id"], photo,
-                        )
-                        i_count += 1
+                        changes[photo_id] = {
+                            "biblist": json.loads(new_biblist),
+                            "event_id": event_id,
+                        }
                 except Exception:
                     logging.exception(f"Error reading biblist - {value}.")
                     informasjon += "En Feil oppstod. "
-        return f"Oppdatert {i_count} bilder."
+
+        photos_adapter = PhotosAdapter()
+        failed = await _run_concurrently(
+            list(changes),
+            lambda photo_id: photos_adapter.patch_photo(
+                token, photo_id, changes[photo_id],
+            ),
+            "Update biblist",
+            BULK_UPDATE_CONCURRENCY,
+        )
+        if failed:
+            informasjon += f"{failed} bilder feilet. "
+        return f"Oppdatert {len(changes) - failed} bilder. {informasjon}".strip()
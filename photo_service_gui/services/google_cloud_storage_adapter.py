@@ -2,10 +2,54 @@
 
 import logging
 import os
+import threading
 from pathlib import Path
 
+import google.auth
 from google.api_core.exceptions import Forbidden, NotFound
+from google.auth.transport.requests import AuthorizedSession
 from google.cloud import storage
+from requests.adapters import HTTPAdapter
+
+GOOGLE_STORAGE_HTTP_POOL_SIZE = int(os.getenv("GOOGLE_STORAGE_HTTP_POOL_SIZE", "16"))
+# maximum number of calls in one batch request, limit set by cloud storage
+GOOGLE_STORAGE_BATCH_SIZE = 100
+
+# process wide storage client and bucket handles, re-created after fork
+_storage_handles: dict = {}
+_storage_handles_lock = threading.Lock()
+os.register_at_fork(after_in_child=_storage_handles.clear)
+
+
+def _create_storage_client() -> storage.Client:
+    """Create storage client with a pooled http transport."""
+    credentials, _ = google.auth.default(scopes=storage.Client.SCOPE)
+    http = AuthorizedSession(credentials)
+    http.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=GOOGLE_STORAGE_HTTP_POOL_SIZE,
+            pool_maxsize=GOOGLE_STORAGE_HTTP_POOL_SIZE,
+        ),
+    )
+    return storage.Client(credentials=credentials, _http=http)
+
+
+def get_bucket(storage_bucket: str) -> storage.Bucket:
+    """Return the shared bucket handle, client is created on first use."""
+    with _storage_handles_lock:
+        if _storage_handles.get("pid") != os.getpid():
+            # first use, or inherited from parent process - start over
+            _storage_handles.clear()
+            _storage_handles["pid"] = os.getpid()
+            _storage_handles["client"] = _create_storage_client()
+            _storage_handles["buckets"] = {}
+        buckets = _storage_handles["buckets"]
+        if storage_bucket not in buckets:
+            buckets[storage_bucket] = _storage_handles["client"].bucket(
+                storage_bucket,
+            )
+        return buckets[storage_bucket]
 
 
 class GoogleCloudStorageAdapter:
@@ -28,8 +72,7 @@ class GoogleCloudStorageAdapter:
 
         try:
 
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(storage_bucket)
+            bucket = get_bucket(storage_bucket)
             destination_blob_name = f"{Path(source_file_name).name}"
             if destination_folder != "":
                 destination_blob_name = (
@@ -61,8 +104,7 @@ class GoogleCloudStorageAdapter:
             err_msg = "GOOGLE_STORAGE_BUCKET or GOOGLE_STORAGE_SERVER not found in .env"
             raise Exception(err_msg)
 
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(storage_bucket)
+        bucket = get_bucket(storage_bucket)
 
         try:
             destination_blob_name = (
@@ -97,8 +139,7 @@ class GoogleCloudStorageAdapter:
             raise Exception(err_msg)
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(storage_bucket)
+            bucket = get_bucket(storage_bucket)
             blob = bucket.blob(source_blob_name)
             new_blob = bucket.rename_blob(blob, destination_blob_name)
         except Exception as e:
@@ -142,8 +183,7 @@ class GoogleCloudStorageAdapter:
         if storage_bucket == "":
             err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
             raise Exception(err_msg)
-        storage_client = storage.Client()
-        bucket = storage_client.bucket(storage_bucket)
+        bucket = get_bucket(storage_bucket)
 
         try:
             blobs = list(bucket.list_blobs(prefix=f"{event_id}/{prefix}"))
@@ -167,6 +207,150 @@ class GoogleCloudStorageAdapter:
             logging.exception(servicename)
             raise Exception(servicename) from e
 
+    def list_blobs_page(
+        self, event_id: str, prefix: str, page_token: str, max_results: int,
+    ) -> tuple[list[dict], str]:
+        """List one page of blobs in the bucket that begin with the prefix.
+
+        Returns the blobs and the token for the next page, empty if last page.
+        """
+        servicename = "GoogleCloudStorageAdapter.list_blobs_page"
+        logging.debug(f"{servicename} event_id: {event_id}, prefix: {prefix}")
+        storage_bucket = os.getenv("GOOGLE_STORAGE_BUCKET", "")
+        if storage_bucket == "":
+            err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
+            raise Exception(err_msg)
+        bucket = get_bucket(storage_bucket)
+
+        try:
+            blobs = bucket.list_blobs(
+                prefix=f"{event_id}/{prefix}",
+                max_results=max_results,
+                page_token=page_token or None,
+            )
+            page = next(blobs.pages)
+            photos = [
+                {"name": f.name, "url": f.public_url, "metadata": f.metadata}
+                for f in page
+            ]
+            next_page_token = blobs.next_page_token or ""
+        except Forbidden as e:
+            informasjon = f"{servicename} Access denied listing blobs for {bucket.name}"
+            logging.exception(informasjon)
+            raise Exception(informasjon) from e
+        except NotFound as e:
+            informasjon = f"{servicename} Bucket {bucket.name} not found"
+            logging.exception(informasjon)
+            raise Exception(informasjon) from e
+        except Exception as e:
+            logging.exception(servicename)
+            raise Exception(servicename) from e
+        return photos, next_page_token
+
+    def count_blobs(self, event_id: str, prefix: str) -> int:
+        """Count blobs directly under the prefix, sub-folders not included.
+
+        Only blob names are requested, one page at a time.
+        """
+        servicename = "GoogleCloudStorageAdapter.count_blobs"
+        storage_bucket = os.getenv("GOOGLE_STORAGE_BUCKET", "")
+        if storage_bucket == "":
+            err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
+            raise Exception(err_msg)
+        bucket = get_bucket(storage_bucket)
+
+        try:
+            blobs = bucket.list_blobs(
+                prefix=f"{event_id}/{prefix}",
+                delimiter="/",
+                fields="items(name),nextPageToken",
+            )
+            count = sum(1 for _ in blobs)
+            logging.debug(
+                f"{servicename} found {count} blobs in {event_id}/{prefix}.",
+            )
+        except Forbidden as e:
+            informasjon = f"{servicename} Access denied listing blobs for {bucket.name}"
+            logging.exception(informasjon)
+            raise Exception(informasjon) from e
+        except NotFound as e:
+            informasjon = f"{servicename} Bucket {bucket.name} not found"
+            logging.exception(informasjon)
+            raise Exception(informasjon) from e
+        except Exception as e:
+            logging.exception(servicename)
+            raise Exception(servicename) from e
+        return count
+
+    def delete_blobs(self, blob_names: list[str]) -> dict[str, str]:
+        """Delete blobs using batch requests.
+
+        Returns error per blob name, empty if the blob was deleted.
+        """
+        servicename = "GoogleCloudStorageAdapter.delete_blobs"
+        storage_bucket = os.getenv("GOOGLE_STORAGE_BUCKET", "")
+        if storage_bucket == "":
+            err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
+            raise Exception(err_msg)
+        bucket = get_bucket(storage_bucket)
+
+        results = {}
+        for i in range(0, len(blob_names), GOOGLE_STORAGE_BATCH_SIZE):
+            chunk = blob_names[i : i + GOOGLE_STORAGE_BATCH_SIZE]
+            try:
+                with bucket.client.batch(raise_exception=False) as batch:
+                    for blob_name in chunk:
+                        bucket.delete_blob(blob_name)
+                # one response per deferred call, in the same order
+                responses = batch._responses  # noqa: SLF001
+                for blob_name, response in zip(chunk, responses, strict=True):
+                    results[blob_name] = (
+                        ""
+                        if 200 <= response.status_code < 300  # noqa: PLR2004
+                        else f"HTTP {response.status_code}"
+                    )
+            except Exception as e:
+                logging.exception(servicename)
+                for blob_name in chunk:
+                    results[blob_name] = str(e)
+        logging.debug(f"{servicename} deleted {len(blob_names)} blobs.")
+        return results
+
+    def download_blob_bytes(self, blob_name: str) -> bytes:
+        """Download content of a blob in the bucket."""
+        servicename = "GoogleCloudStorageAdapter.download_blob_bytes"
+        storage_bucket = os.getenv("GOOGLE_STORAGE_BUCKET", "")
+        if storage_bucket == "":
+            err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
+            raise Exception(err_msg)
+
+        try:
+            bucket = get_bucket(storage_bucket)
+            blob = bucket.blob(blob_name)
+            return blob.download_as_bytes()
+        except Exception as e:
+            logging.exception(servicename)
+            raise Exception(servicename) from e
+
+    def get_blob_generation(self, blob_name: str) -> str:
+        """Get generation of a blob, it changes when the blob is overwritten."""
+        servicename = "GoogleCloudStorageAdapter.get_blob_generation"
+        storage_bucket = os.getenv("GOOGLE_STORAGE_BUCKET", "")
+        if storage_bucket == "":
+            err_msg = "GOOGLE_STORAGE_BUCKET not found in .env"
+            raise Exception(err_msg)
+
+        try:
+            bucket = get_bucket(storage_bucket)
+            blob = bucket.get_blob(blob_name)
+        except Exception as e:
+            logging.exception(servicename)
+            raise Exception(servicename) from e
+        if blob is None:
+            err_msg = f"{servicename} - blob not found: {blob_name}"
+            raise Exception(err_msg)
+        return str(blob.generation)
+
     def delete_blob(self, blob_name: str) -> None:
         """Delete a blob in the bucket."""
         servicename = "GoogleCloudStorageAdapter.delete_blob"
@@ -176,8 +360,7 @@ class GoogleCloudStorageAdapter:
             raise Exception(err_msg)
 
         try:
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(storage_bucket)
+            bucket = get_bucket(storage_bucket)
             blob = bucket.blob(blob_name)
             blob.delete()
         except Exception as e:
@@ -11,6 +11,26 @@ from .config_adapter import ConfigAdapter
 from .events_adapter import EventsAdapter
 from .live_stream_adapter import LiveStreamAdapter
 from .service_instance_adapter import ServiceInstanceAdapter
+from .single_flight import SingleFlight
+from .ttl_cache import TTLCache
+
+CHANNEL_STATUS_CACHE_TTL = float(os.getenv("CHANNEL_STATUS_CACHE_TTL", "5"))
+
+# channel statuses shared by all sessions in this process, key is project/location
+_channel_status_cache = TTLCache(maxsize=16, ttl=CHANNEL_STATUS_CACHE_TTL)
+# concurrent cache misses share one lookup
+_channel_status_flight = SingleFlight()
+
+
+def get_status_from_channel(channel_id: str, channel: Any) -> dict[str, Any]:
+    """Return status information from a channel resource."""
+    return {
+        "channel_id": channel_id,
+        "state": channel.streaming_state.name,
+        "streaming_error": str(channel.streaming_error)
+        if channel.streaming_error
+        else None,
+    }
 
 
 class LiveStreamService:
@@ -93,21 +113,28 @@ class LiveStreamService:
 
         """
         information = ""
-        clip_duration = await ConfigAdapter().get_config_int(
-            token, event["id"], "VIDEO_CLIP_DURATION",
+        configs = await ConfigAdapter().get_configs(
+            token,
+            event["id"],
+            {
+                "VIDEO_CLIP_DURATION": "int",
+                "LIVESTREAM_INPUT_PREFIX": "str",
+                "VIDEO_OUTPUT_PATH_TEMPLATE": "str",
+                "VIDEO_BITRATE_BPS": "int",
+                "VIDEO_WIDTH": "int",
+                "VIDEO_HEIGHT": "int",
+                "VIDEO_CLIP_FPS": "int",
+            },
         )
+        clip_duration = configs["VIDEO_CLIP_DURATION"]
 
         # Generate resource IDs
-        input_prefix = await ConfigAdapter().get_config(
-            token, event["id"], "LIVESTREAM_INPUT_PREFIX",
-        )
+        input_prefix = configs["LIVESTREAM_INPUT_PREFIX"]
         input_id = f"{input_prefix}-{name}"
         channel_id = name
 
         # Create output path in cloud storage
-        output_path_template = await ConfigAdapter().get_config(
-            token, event["id"], "VIDEO_OUTPUT_PATH_TEMPLATE",
-        )
+        output_path_template = configs["VIDEO_OUTPUT_PATH_TEMPLATE"]
         output_path = output_path_template.format(event_id=event["id"])
         output_uri = f"gs://{self.bucket_name}/{output_path}"
 
@@ -130,30 +157,16 @@ class LiveStreamService:
 
             # Create channel
             logging.info("Creating channel for event: %s", event["id"])
-            adapter = ConfigAdapter()
-            video_bitrate = await adapter.get_config_int(
-                token, event["id"], "VIDEO_BITRATE_BPS",
-            )
-            video_width = await adapter.get_config_int(
-                token, event["id"], "VIDEO_WIDTH",
-            )
-            video_height = await adapter.get_config_int(
-                token, event["id"], "VIDEO_HEIGHT",
-            )
-            video_fps = await adapter.get_config_int(
-                token, event["id"], "VIDEO_CLIP_FPS",
-            )
-
             await asyncio.to_thread(
                 self.adapter.create_channel,
                 channel_id=channel_id,
                 input_id=input_id,
                 output_uri=output_uri,
                 segment_duration=clip_duration,
-                video_bitrate_bps=video_bitrate,
-                video_width=video_width,
-                video_height=video_height,
-                video_fps=video_fps,
+                video_bitrate_bps=configs["VIDEO_BITRATE_BPS"],
+                video_width=configs["VIDEO_WIDTH"],
+                video_height=configs["VIDEO_HEIGHT"],
+                video_fps=configs["VIDEO_CLIP_FPS"],
                 audio_codec="aac",
                 audio_bitrate_bps=128000,
                 audio_channels=2,
@@ -253,14 +266,34 @@ class LiveStreamService:
             self.adapter.get_channel,
             channel_id=channel_id,
         )
+        return get_status_from_channel(channel_id, channel)
+
+    async def get_channel_statuses(self) -> dict[str, dict[str, Any]]:
+        """Get the status of all live stream channels with one lookup.
 
-        return {
-            "channel_id": channel_id,
-            "state": channel.streaming_state.name,
-            "streaming_error": str(channel.streaming_error)
-            if channel.streaming_error
-            else None,
-        }
+        The result is cached for a few seconds and shared by all sessions,
+        so concurrent polls do not repeat the lookup.
+
+        Returns:
+            Dictionary with channel id mapped to channel status information
+
+        """
+        statuses = _channel_status_cache.get(self.adapter.parent)
+        if statuses is None:
+            statuses = await _channel_status_flight.do(
+                self.adapter.parent, self._list_channel_statuses,
+            )
+            _channel_status_cache.set(self.adapter.parent, statuses)
+        return statuses
+
+    async def _list_channel_statuses(self) -> dict[str, dict[str, Any]]:
+        """List all channels, return channel id mapped to status."""
+        channels = await asyncio.to_thread(self.adapter.list_channels)
+        statuses = {}
+        for channel in channels:
+            channel_id = channel.name.split("/")[-1]
+            statuses[channel_id] = get_status_from_channel(channel_id, channel)
+        return statuses
 
     async def list_active_channels(self) -> list[Any]:
         """List all active channels.
@@ -280,6 +313,7 @@ class LiveStreamService:
         """
         return await asyncio.to_thread(self.adapter.list_inputs)
 
+
 async def create_service_instance(
     token: str,
     event: dict,
@@ -297,6 +331,11 @@ async def create_service_instance(
 
     """
     time_now = EventsAdapter().get_local_time(event, "log")
+    configs = await ConfigAdapter().get_configs(
+        token,
+        event["id"],
+        {"TRIGGER_LINE_XYXYN": "str", "VIDEO_URL": "str"},
+    )
     service_instance = {
         "service_type": "VIDEO_SERVICE_CAPTURE_SRT",
         "instance_name": name,
@@ -309,12 +348,8 @@ async def create_service_instance(
         "metadata": {
             "latest_photo_url": "",
             "trigger_line_photo_url": "",
-            "trigger_line_xyxyn": await ConfigAdapter().get_config(
-                token, event["id"], "TRIGGER_LINE_XYXYN",
-            ),
-            "video_url": await ConfigAdapter().get_config(
-                token, event["id"], "VIDEO_URL",
-            ),
+            "trigger_line_xyxyn": configs["TRIGGER_LINE_XYXYN"],
+            "video_url": configs["VIDEO_URL"],
         },
     }
     await ServiceInstanceAdapter().create_service_instance(token, service_instance)
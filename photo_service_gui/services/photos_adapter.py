@@ -5,13 +5,18 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
+
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
 
+# set to False when the photo service rejects partial updates (PATCH)
+_photo_patch_supported = {"value": True}
+
 
 class PhotosAdapter:
 
@@ -32,7 +37,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             url, headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.OK:
@@ -56,7 +61,7 @@ class PhotosAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/photos/{my_id}", headers=headers,
         ) as resp:
             logging.debug(f"get_photo {my_id} - got response {resp.status}")
@@ -93,7 +98,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             url, headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.OK:
@@ -125,7 +130,7 @@ class PhotosAdapter:
         if limit:
             url += f"&limit={limit}"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             url, headers=headers,
         ) as resp:
             logging.debug(
@@ -151,7 +156,7 @@ class PhotosAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/photos?gBaseUrl={g_base_url}", headers=headers,
         ) as resp:
             logging.debug(
@@ -183,7 +188,7 @@ class PhotosAdapter:
         )
         request_body = copy.deepcopy(photo)
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(PHOTO_SERVICE_URL).post(
             f"{PHOTO_SERVICE_URL}/photos", headers=headers, json=request_body,
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
@@ -211,7 +216,7 @@ class PhotosAdapter:
             ],
         )
         url = f"{PHOTO_SERVICE_URL}/photos/{my_id}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(PHOTO_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             logging.debug(f"Delete photo: {my_id} - res {resp.status}")
@@ -222,6 +227,72 @@ class PhotosAdapter:
                 raise web.HTTPBadRequest(reason=f"Error - {resp.status}: {resp}.")
         return resp.status
 
+    async def delete_photos_by_event(self, token: str, event_id: str) -> int:
+        """Delete all photos in event with one request.
+
+        Only use when the photo service is known to support it, see
+        PHOTOS_BULK_DELETE. The response is never used to detect support.
+        """
+        servicename = "delete_photos_by_event"
+        headers = MultiDict(
+            [
+                (hdrs.CONTENT_TYPE, "application/json"),
+                (hdrs.AUTHORIZATION, f"Bearer {token}"),
+            ],
+        )
+        url = f"{PHOTO_SERVICE_URL}/photos?eventId={event_id}"
+        async with get_client_session(PHOTO_SERVICE_URL).delete(
+            url, headers=headers,
+        ) as resp:
+            logging.debug(f"Delete photos in event: {event_id} - res {resp.status}")
+            if resp.status in (HTTPStatus.OK, HTTPStatus.NO_CONTENT):
+                logging.debug(f"result - got response {resp}")
+            elif resp.status == HTTPStatus.UNAUTHORIZED:
+                err_msg = f"401 Unathorized - {servicename}"
+                raise web.HTTPBadRequest(reason=err_msg)
+            else:
+                logging.error(f"{servicename} failed - {resp.status} - {resp}")
+                raise web.HTTPBadRequest(reason=f"Error - {resp.status}: {resp}.")
+        return resp.status
+
+    async def patch_photo(self, token: str, my_id: str, changes: dict) -> int:
+        """Update only the given fields of a photo.
+
+        Falls back to get and full update if the photo service has no PATCH.
+        """
+        servicename = "patch_photo"
+        if _photo_patch_supported["value"]:
+            headers = MultiDict(
+                [
+                    (hdrs.CONTENT_TYPE, "application/json"),
+                    (hdrs.AUTHORIZATION, f"Bearer {token}"),
+                ],
+            )
+            async with get_client_session(PHOTO_SERVICE_URL).patch(
+                f"{PHOTO_SERVICE_URL}/photos/{my_id}", headers=headers, json=changes,
+            ) as resp:
+                logging.debug(f"Patched photo: {my_id} - res {resp.status}")
+                if resp.status in (HTTPStatus.OK, HTTPStatus.NO_CONTENT):
+                    return resp.status
+                if resp.status == HTTPStatus.UNAUTHORIZED:
+                    err_msg = f"401 Unathorized - {servicename}"
+                    raise web.HTTPBadRequest(reason=err_msg)
+                if resp.status not in (
+                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    HTTPStatus.NOT_IMPLEMENTED,
+                ):
+                    body = await resp.json()
+                    logging.error(f"{servicename} failed - {resp.status} - {body}")
+                    raise web.HTTPBadRequest(
+                        reason=f"Error - {resp.status}: {body['detail']}.",
+                    )
+            logging.info(f"{servicename} not supported, using full update")
+            _photo_patch_supported["value"] = False
+
+        photo = await self.get_photo(token, my_id)
+        photo.update(changes)
+        return await self.update_photo(token, my_id, photo)
+
     async def update_photo(self, token: str, my_id: str, request_body: dict) -> int:
         """Update photo function."""
         servicename = "update_photo"
@@ -233,7 +304,7 @@ class PhotosAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.put(
+        async with get_client_session(PHOTO_SERVICE_URL).put(
             f"{PHOTO_SERVICE_URL}/photos/{my_id}", headers=headers, json=request_body,
         ) as resp:
             result = resp.status
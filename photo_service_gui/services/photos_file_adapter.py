@@ -1,21 +1,96 @@
 """Module adapter for photos on file storage."""
 
+import asyncio
+import json
 import logging
+import os
 import subprocess
+import time
+from collections.abc import Iterator
+from itertools import islice
 from pathlib import Path
+from typing import Any
 
-from photo_service_gui.services.google_cloud_storage_adapter import (
-    GoogleCloudStorageAdapter,
-)
+from photo_service_gui.services.cloud_storage_service import CloudStorageService
+from photo_service_gui.services.directory_index import get_directory_index
 
 VISION_ROOT_PATH = f"{Path.cwd()}/photo_service_gui/files"
 CAPTURED_FILE_PATH = f"{VISION_ROOT_PATH}/CAPTURE"
 CAPTURED_RAW_FILE_PATH = f"{VISION_ROOT_PATH}/RAW_CAPTURE"
 CAPTURED_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/CAPTURE/archive"
 CAPTURED_ERROR_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/CAPTURE/error_archive"
+CAPTURED_RAW_ERROR_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/RAW_CAPTURE/error_archive"
 PHOTOS_ARCHIVE_PATH = f"{VISION_ROOT_PATH}/archive"
 PHOTOS_URL_PATH = "files"
 
+# codecs that can be copied to MP4 as is, without re-encoding
+REMUX_VIDEO_CODECS = {"h264"}
+REMUX_AUDIO_CODECS = {"aac"}
+
+
+def get_probe_command(input_file: str) -> list[str]:
+    """Get FFprobe command listing codec of each stream as JSON."""
+    return [
+        "ffprobe",
+        "-v", "error",
+        "-show_entries", "stream=codec_type,codec_name",
+        "-of", "json",
+        input_file,
+    ]
+
+
+def can_remux(probe_output: str) -> bool:
+    """Check FFprobe output if streams can be copied to MP4 without re-encoding."""
+    try:
+        streams = json.loads(probe_output).get("streams", [])
+    except (json.JSONDecodeError, AttributeError):
+        return False
+    video = [s for s in streams if s.get("codec_type") == "video"]
+    audio = [s for s in streams if s.get("codec_type") == "audio"]
+    return (
+        bool(video)
+        and video[0].get("codec_name") in REMUX_VIDEO_CODECS
+        and all(a.get("codec_name") in REMUX_AUDIO_CODECS for a in audio)
+    )
+
+
+def get_remux_command(input_file: str, output_file: str) -> list[str]:
+    """Get FFmpeg command copying H.264/AAC streams to MP4 without re-encoding."""
+    return [
+        "ffmpeg",
+        "-y",                        # Overwrite output, e.g. left over temporary file
+        "-i", input_file,
+        "-map", "0:v:0",             # Map first video stream
+        "-map", "0:a?",              # Map audio if present (? makes it optional)
+        "-c", "copy",                # Copy streams, no re-encoding
+        "-movflags", "+faststart",   # Index first, playback can start at once
+        output_file,
+    ]
+
+
+def get_transcode_command(
+    input_file: str,
+    output_file: str,
+    preset: str = "fast",
+    crf: int = 23,
+    audio_bitrate: str = "128k",
+) -> list[str]:
+    """Get FFmpeg command converting (and repairing) a video file to MP4."""
+    # Using -c:a aac if audio exists, otherwise ffmpeg will ignore it
+    return [
+        "ffmpeg",
+        "-y",                  # Overwrite output, e.g. left over temporary file
+        "-i", input_file,
+        "-c:v", "libx264",    # H.264 video codec
+        "-preset", preset,     # Encoding speed preset
+        "-crf", str(crf),      # Constant Rate Factor (quality)
+        "-c:a", "aac",        # AAC audio codec (ignored if no audio stream)
+        "-b:a", audio_bitrate, # Audio bitrate (ignored if no audio stream)
+        "-map", "0:v:0",       # Map first video stream
+        "-map", "0:a?",        # Map audio if present (? makes it optional)
+        output_file,
+    ]
+
 
 class PhotosFileAdapter:
 
@@ -46,48 +121,103 @@ class PhotosFileAdapter:
         """Get path to photo archive folder."""
         return PHOTOS_ARCHIVE_PATH
 
+    def list_files(
+        self,
+        folder: str,
+        *,
+        suffixes: tuple[str, ...] = (),
+        prefix: str = "",
+        contains: str = "",
+        exclude: str = "",
+        min_age: float = 0,
+        sort_by_mtime: bool = False,
+    ) -> Iterator[str]:
+        """List names of files in folder, in one pass.
+
+        Name filters use no extra system calls. Files are only stat'ed,
+        after name filtering, if filtered by age (seconds since modified)
+        or sorted by modification time (oldest first).
+        """
+
+        def matches(name: str) -> bool:
+            return (
+                (not suffixes or name.endswith(suffixes))
+                and name.startswith(prefix)
+                and contains in name
+                and not (exclude and exclude in name)
+            )
+
+        if not min_age and not sort_by_mtime:
+            names = get_directory_index(folder).get_file_names()
+            yield from (name for name in names if matches(name))
+            return
+
+        try:
+            with os.scandir(folder) as entries:
+                files = [
+                    (entry.stat().st_mtime, entry.name)
+                    for entry in entries
+                    if entry.is_file() and matches(entry.name)
+                ]
+        except FileNotFoundError:
+            return
+        if sort_by_mtime:
+            files.sort()
+        newest_allowed = time.time() - min_age
+        yield from (name for mtime, name in files if mtime <= newest_allowed)
+
+    def get_files_page(
+        self, folder: str, page: int, page_size: int, **filters: Any,
+    ) -> list[str]:
+        """Get one page (from 0) of file names in folder, see list_files."""
+        start = page * page_size
+        files = self.list_files(folder, **filters)
+        return list(islice(files, start, start + page_size))
+
     def get_local_capture_queue_length(self) -> int:
         """Get length of local capture queue."""
-        capture_folder = Path(self.get_capture_folder_path())
-
-        return sum(1 for f in capture_folder.iterdir() if f.is_file())
+        return get_directory_index(self.get_capture_folder_path()).count_files()
 
     def get_local_raw_capture_queue_length(self) -> int:
         """Get length of local raw capture queue."""
-        capture_folder = Path(self.get_raw_capture_folder_path())
-        if not capture_folder.exists():
-            return 0
-
-        return sum(1 for f in capture_folder.iterdir() if f.is_file())
+        return get_directory_index(self.get_raw_capture_folder_path()).count_files()
 
     def get_all_photos(self) -> list:
         """Get all path/filename to all photos on file directory."""
         photos = []
         try:
-            files = list(Path(VISION_ROOT_PATH).iterdir())
             photos = [
-                f"{VISION_ROOT_PATH}/{f.name}"
-                for f in files
-                if f.suffix in [".jpg", ".png"] and "_config" not in f.name
+                f"{VISION_ROOT_PATH}/{name}"
+                for name in self.list_files(
+                    VISION_ROOT_PATH, suffixes=(".jpg", ".png"), exclude="_config",
+                )
             ]
         except Exception:
             logging.exception("Error getting photos")
         return photos
 
-    def get_all_capture_files(self, event_id: str, storage_mode: str) ->  list[dict]:
+    def _list_local_files(self, folder: str) -> list[dict]:
+        """List name and path of the files in a local folder."""
+        return [
+            {"name": name, "url": f"{folder}/{name}"}
+            for name in self.list_files(folder)
+        ]
+
+    async def get_all_capture_files(
+            self, event_id: str, storage_mode: str,
+        ) ->  list[dict]:
         """Get all url to all captured files on file directory."""
         file_list = []
         try:
             if storage_mode == "cloud_storage":
-                file_list = GoogleCloudStorageAdapter().list_blobs(event_id, "CAPTURE/")
+                file_list = await CloudStorageService().list_blobs(
+                    event_id, "CAPTURE/",
+                )
             else:
                 # Local file system
-                files = list(Path(CAPTURED_FILE_PATH).iterdir())
-                file_list = [
-                    {"name": f.name, "url": f"{CAPTURED_FILE_PATH}/{f.name}"}
-                    for f in files
-                if f.is_file()
-                ]
+                file_list = await asyncio.to_thread(
+                    self._list_local_files, CAPTURED_FILE_PATH,
+                )
         except Exception:
             informasjon = "Error getting captured files"
             logging.exception(informasjon)
@@ -95,24 +225,21 @@ class PhotosFileAdapter:
         else:
             return file_list
 
-    def get_all_raw_capture_files(
+    async def get_all_raw_capture_files(
             self, event_id: str, storage_mode: str,
         ) ->  list[dict]:
         """Get all url to all raw captured files on file directory."""
         file_list = []
         try:
             if storage_mode == "cloud_storage":
-                file_list = GoogleCloudStorageAdapter().list_blobs(
+                file_list = await CloudStorageService().list_blobs(
                     event_id, "RAW_CAPTURE/",
                 )
             else:
                 # Local file system
-                files = list(Path(CAPTURED_RAW_FILE_PATH).iterdir())
-                file_list = [
-                    {"name": f.name, "url": f"{CAPTURED_RAW_FILE_PATH}/{f.name}"}
-                    for f in files
-                if f.is_file()
-                ]
+                file_list = await asyncio.to_thread(
+                    self._list_local_files, CAPTURED_RAW_FILE_PATH,
+                )
         except Exception:
             informasjon = "Error getting captured files"
             logging.exception(informasjon)
@@ -124,11 +251,11 @@ class PhotosFileAdapter:
         """Get all url to all files on file directory with given prefix and suffix."""
         my_files = []
         try:
-            files = list(Path(VISION_ROOT_PATH).iterdir())  # Materialize close
             my_files = [
-                f"{VISION_ROOT_PATH}/{file.name}"
-                for file in files
-                if file.suffix == suffix and prefix in file.name
+                f"{VISION_ROOT_PATH}/{name}"
+                for name in self.list_files(
+                    VISION_ROOT_PATH, suffixes=(suffix,), contains=prefix,
+                )
             ]
         except Exception:
             informasjon = f"Error getting files, prefix: {prefix}, suffix: {suffix}"
@@ -164,45 +291,43 @@ class PhotosFileAdapter:
         except Exception:
             logging.exception("Error moving photo to archive.")
 
-    def move_to_capture_archive(
-            self, event_id: str, storage_mode: str, filename: str,
-        ) -> str:
-        """Move photo to local archive."""
-        if storage_mode == "cloud_storage":
-            return GoogleCloudStorageAdapter().move_to_capture_archive(
-                event_id, filename,
-            )
+    def _move_capture_file(self, filename: str, destination_folder: str) -> str:
+        """Move file in local capture folder to another folder."""
         source_file = Path(CAPTURED_FILE_PATH) / filename
-        destination_file = Path(CAPTURED_ARCHIVE_PATH) / filename
+        destination_file = Path(destination_folder) / filename
         try:
             source_file.rename(destination_file)
         except FileNotFoundError:
             logging.info("Destination folder not found. Creating.")
-            Path(CAPTURED_ARCHIVE_PATH).mkdir(parents=True, exist_ok=True)
+            Path(destination_folder).mkdir(parents=True, exist_ok=True)
             source_file.rename(destination_file)
         except Exception:
-            logging.exception(f"Error moving photo to archive: {filename}")
+            logging.exception(f"Error moving photo to {destination_folder}: {filename}")
         return destination_file.name
 
-    def move_to_error_archive(
+    async def move_to_capture_archive(
+            self, event_id: str, storage_mode: str, filename: str,
+        ) -> str:
+        """Move photo to local archive."""
+        if storage_mode == "cloud_storage":
+            return await CloudStorageService().move_to_capture_archive(
+                event_id, filename,
+            )
+        return await asyncio.to_thread(
+            self._move_capture_file, filename, CAPTURED_ARCHIVE_PATH,
+        )
+
+    async def move_to_error_archive(
             self, event_id: str, storage_mode: str, filename: str,
         ) -> str:
         """Move photo to local error archive."""
         if storage_mode == "cloud_storage":
-            return GoogleCloudStorageAdapter().move_to_error_archive(
+            return await CloudStorageService().move_to_error_archive(
                 event_id, filename,
             )
-        source_file = Path(CAPTURED_FILE_PATH) / filename
-        destination_file = Path(CAPTURED_ERROR_ARCHIVE_PATH) / filename
-        try:
-            source_file.rename(destination_file)
-        except FileNotFoundError:
-            logging.info("Destination folder not found. Creating.")
-            Path(CAPTURED_ERROR_ARCHIVE_PATH).mkdir(parents=True, exist_ok=True)
-            source_file.rename(destination_file)
-        except Exception:
-            logging.exception(f"Error moving photo to error archive: {filename}")
-        return destination_file.name
+        return await asyncio.to_thread(
+            self._move_capture_file, filename, CAPTURED_ERROR_ARCHIVE_PATH,
+        )
 
     def convert_raw_to_mp4(self, input_file: str) -> None:
         """Convert (and repair) a video file to MP4 using FFmpeg."""
@@ -217,21 +342,30 @@ class PhotosFileAdapter:
             raise ValueError(err_msg) from e
 
         try:
-            # Build ffmpeg command with conditional audio handling
-            # Using -c:a aac if audio exists, otherwise ffmpeg will ignore it
-            command = [
-                "ffmpeg",
-                "-i", input_file,
-                "-c:v", "libx264",    # H.264 video codec
-                "-preset", "fast",     # Encoding speed preset
-                "-crf", "23",          # Constant Rate Factor (quality)
-                "-c:a", "aac",        # AAC audio codec (ignored if no audio stream)
-                "-b:a", "128k",        # Audio bitrate (ignored if no audio stream)
-                "-map", "0:v:0",       # Map first video stream
-                "-map", "0:a?",        # Map audio if present (? makes it optional)
-                str(output_path),
-            ]
-            subprocess.run(command, check=True)  # noqa: S603
+            probe = subprocess.run(  # noqa: S603
+                get_probe_command(input_file),
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+            remuxed = False
+            if probe.returncode == 0 and can_remux(probe.stdout):
+                remux = subprocess.run(  # noqa: S603
+                    get_remux_command(input_file, str(output_path)),
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+                remuxed = remux.returncode == 0
+                if not remuxed:
+                    logging.warning(
+                        f"Remux failed, re-encoding {input_file}: {remux.stderr}",
+                    )
+            if not remuxed:
+                subprocess.run(  # noqa: S603
+                    get_transcode_command(input_file, str(output_path)),
+                    check=True,
+                )
 
             # delete input file
             input_path.unlink()
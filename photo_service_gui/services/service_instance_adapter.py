@@ -4,12 +4,14 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
 from .events_adapter import (
     EventsAdapter,
 )
+from .single_flight import single_flight
 
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
@@ -20,6 +22,7 @@ class ServiceInstanceAdapter:
 
     """Class representing service instance."""
 
+    @single_flight
     async def get_all_service_instances(
         self,
         token: str,
@@ -50,7 +53,7 @@ class ServiceInstanceAdapter:
         if query_params:
             url += "?" + "&".join(query_params)
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             url,
             headers=headers,
         ) as resp:
@@ -81,7 +84,7 @@ class ServiceInstanceAdapter:
         )
         servicename = "get_service_instance_by_id"
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(PHOTO_SERVICE_URL).get(
             f"{PHOTO_SERVICE_URL}/service-instances/{service_instance_id}",
             headers=headers,
         ) as resp:
@@ -118,7 +121,7 @@ class ServiceInstanceAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(PHOTO_SERVICE_URL).post(
             f"{PHOTO_SERVICE_URL}/service-instances",
             headers=headers,
             json=service_instance,
@@ -285,7 +288,7 @@ class ServiceInstanceAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.put(
+        async with get_client_session(PHOTO_SERVICE_URL).put(
             f"{PHOTO_SERVICE_URL}/service-instances/{service_instance_id}",
             headers=headers,
             json=service_instance,
@@ -331,7 +334,7 @@ class ServiceInstanceAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(PHOTO_SERVICE_URL).delete(
             f"{PHOTO_SERVICE_URL}/service-instances/{service_instance_id}",
             headers=headers,
         ) as resp:
@@ -0,0 +1,94 @@
+"""Module for sharing concurrent identical backend reads."""
+
+import asyncio
+import base64
+import copy
+import functools
+import json
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from .ttl_cache import TTLCache
+
+# seconds a token counts as accepted by the backend after a successful read
+VERIFIED_TOKEN_TTL = 60
+
+
+class SingleFlight:
+
+    """Class representing reads in flight, shared by concurrent callers.
+
+    A caller asking for a key that is already being read waits for that
+    read instead of starting a new one. Each caller gets its own copy of
+    the result, or the same exception. Nothing is kept after the read
+    completes, so this is not a cache.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the single-flight group."""
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Return number of reads in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        """Return result of func, shared with concurrent callers of same key."""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # a cancelled caller must not cancel the read for the others
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+
+def get_auth_scope(token: str) -> str:
+    """Return authorization scope of a token, role or subject of the user.
+
+    The token payload is decoded without verifying the signature, so the
+    scope must only be trusted for tokens the backend has accepted. Tokens
+    without role or subject are their own scope.
+    """
+    try:
+        payload_part = token.split(".")[1]
+        payload = json.loads(
+            base64.urlsafe_b64decode(payload_part + "=" * (-len(payload_part) % 4)),
+        )
+    except Exception:
+        return token
+    if isinstance(payload, dict):
+        if payload.get("role"):
+            return f"role:{payload['role']}"
+        if payload.get("sub"):
+            return f"sub:{payload['sub']}"
+    return token
+
+
+_single_flight = SingleFlight()
+_verified_tokens = TTLCache(1024, VERIFIED_TOKEN_TTL)
+
+
+def single_flight(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    """Share concurrent calls of an adapter method with identical arguments.
+
+    The first argument is the bearer token. Callers with the same
+    authorization scope share reads, but only if the backend has recently
+    accepted their own token, others get a read of their own. The adapter
+    method must raise if the backend rejects the token.
+    """
+
+    @functools.wraps(func)
+    async def wrapper(self: Any, token: str, *args: Any, **kwargs: Any) -> Any:
+        scope = get_auth_scope(token) if _verified_tokens.get(token) else token
+        key = (func.__qualname__, scope, args, tuple(sorted(kwargs.items())))
+
+        async def call() -> Any:
+            result = await func(self, token, *args, **kwargs)
+            _verified_tokens.set(token, value=True)
+            return result
+
+        return await _single_flight.do(key, call)
+
+    return wrapper
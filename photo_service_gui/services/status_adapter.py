@@ -1,15 +1,19 @@
 """Module for status adapter."""
 
-import copy
+import asyncio
 import logging
 import os
+import urllib.parse
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from dotenv import load_dotenv
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
 from .events_adapter import EventsAdapter
+from .single_flight import single_flight
+from .status_writer import StatusWriter
 
 # get base settings
 load_dotenv()
@@ -17,13 +21,78 @@ PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 PHOTO_SERVICE_URL = f"http://{PHOTOS_HOST_SERVER}:{PHOTOS_HOST_PORT}"
 
+# set to False if the photo service has no batch endpoint for status
+_status_batch_supported = {"value": True}
+# set to False if the photo service returns messages newer than before
+_status_before_supported = {"value": True}
+
+
+def get_status_url(
+    event_id: str,
+    count: int,
+    status_type: str = "",
+    *,
+    since: str = "",
+    before: str = "",
+) -> str:
+    """Return url for status messages, cursors are added only when given."""
+    url = f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event_id}"
+    if status_type:
+        url += f"&type={status_type}"
+    if since:
+        url += f"&since={urllib.parse.quote(since, safe='')}"
+    if before:
+        url += f"&before={urllib.parse.quote(before, safe='')}"
+    return url
+
+
+def filter_status(status: list, since: str = "", before: str = "") -> list:
+    """Keep status messages from since and until before, both included.
+
+    Times have second resolution, so messages at the cursor time are kept
+    and the caller removes the ones already shown by id. Applied to the
+    response as well, so the cursors hold even if the status service
+    returns the latest messages regardless.
+    """
+    return [
+        res for res in status
+        if (not since or res["time"] >= since)
+        and (not before or res["time"] <= before)
+    ]
+
+
+def check_before_supported(status: list, before: str) -> None:
+    """Remember if the status service ignored the before cursor.
+
+    The local filter cannot find older messages in a response with only
+    the latest ones, so loading older messages is not possible then.
+    """
+    if before and any(res["time"] > before for res in status):
+        if _status_before_supported["value"]:
+            logging.warning("Status service ignores before, older status not shown")
+        _status_before_supported["value"] = False
+
+
+def is_before_supported() -> bool:
+    """Return False if the status service is known to ignore before."""
+    return _status_before_supported["value"]
+
 
 class StatusAdapter:
 
     """Class representing status."""
 
-    async def get_status(self, token: str, event_id: str, count: int) -> list:
-        """Get latest status messages."""
+    @single_flight
+    async def get_status(
+        self,
+        token: str,
+        event_id: str,
+        count: int,
+        *,
+        since: str = "",
+        before: str = "",
+    ) -> list:
+        """Get latest status messages, optionally only newer or older than time."""
         status = []
         headers = MultiDict(
             [
@@ -33,12 +102,14 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
-            f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event_id}",
+        async with get_client_session(PHOTO_SERVICE_URL).get(
+            get_status_url(event_id, count, since=since, before=before),
             headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.OK:
                 status = await resp.json()
+                check_before_supported(status, before)
+                status = filter_status(status, since, before)
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -50,9 +121,16 @@ class StatusAdapter:
         return status
 
     async def get_status_by_type(
-        self, token: str, event: dict, status_type: str, count: int,
+        self,
+        token: str,
+        event: dict,
+        status_type: str,
+        count: int,
+        *,
+        since: str = "",
+        before: str = "",
     ) -> list:
-        """Get latest status messages for a given type."""
+        """Get latest status messages for a given type, optionally by time."""
         status = []
         headers = MultiDict(
             [
@@ -62,12 +140,16 @@ class StatusAdapter:
         )
         servicename = "get_status"
 
-        async with ClientSession() as session, session.get(
-            f"{PHOTO_SERVICE_URL}/status?count={count}&eventId={event['id']}&type={status_type}",
+        async with get_client_session(PHOTO_SERVICE_URL).get(
+            get_status_url(
+                event["id"], count, status_type, since=since, before=before,
+            ),
             headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.OK:
                 status = await resp.json()
+                check_before_supported(status, before)
+                status = filter_status(status, since, before)
             elif resp.status == HTTPStatus.UNAUTHORIZED:
                 informasjon = f"Login expired: {resp}"
                 raise Exception(informasjon)
@@ -78,29 +160,41 @@ class StatusAdapter:
                 raise Exception(informasjon)
         return status
 
+    def get_status_body(
+        self, event: dict, status_type: str, message: str, details: dict,
+    ) -> dict:
+        """Return new status message, stamped with local time of the event."""
+        return {
+            "event_id": event["id"],
+            "time": EventsAdapter().get_local_time(event, "log"),
+            "type": status_type,
+            "message": message,
+            "details": details,
+        }
+
     async def create_status(
         self, token: str, event: dict, status_type: str, message: str, details: dict,
-    ) -> str:
-        """Create new status function."""
+    ) -> asyncio.Future:
+        """Queue new status message, it is written in the background in batches.
+
+        Returns future with the id of the message, it can be ignored.
+        """
+        logging.info(message)
+        return await get_status_writer().write(
+            token, self.get_status_body(event, status_type, message, details),
+        )
+
+    async def post_status(self, token: str, request_body: dict) -> str:
+        """Store a status message, return its id."""
         servicename = "create_status"
-        time = EventsAdapter().get_local_time(event, "log")
         headers = MultiDict(
             [
                 (hdrs.CONTENT_TYPE, "application/json"),
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ],
         )
-        logging.info(message)
-        status_dict = {
-            "event_id": event["id"],
-            "time": time,
-            "type": status_type,
-            "message": message,
-            "details": details,
-        }
-        request_body = copy.deepcopy(status_dict)
 
-        async with ClientSession() as session, session.post(
+        async with get_client_session(PHOTO_SERVICE_URL).post(
             f"{PHOTO_SERVICE_URL}/status", headers=headers, json=request_body,
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
@@ -119,6 +213,49 @@ class StatusAdapter:
 
         return result
 
+    async def create_status_batch(
+        self, token: str, statuses: list[dict],
+    ) -> list[str | Exception]:
+        """Store several status messages, return id or error per message.
+
+        Falls back to one request per message if the photo service has no
+        batch endpoint.
+        """
+        servicename = "create_status_batch"
+        if _status_batch_supported["value"]:
+            headers = MultiDict(
+                [
+                    (hdrs.CONTENT_TYPE, "application/json"),
+                    (hdrs.AUTHORIZATION, f"Bearer {token}"),
+                ],
+            )
+            async with get_client_session(PHOTO_SERVICE_URL).post(
+                f"{PHOTO_SERVICE_URL}/status/batch", headers=headers, json=statuses,
+            ) as resp:
+                logging.debug(f"{servicename} {len(statuses)} - res {resp.status}")
+                if resp.status in (HTTPStatus.OK, HTTPStatus.CREATED):
+                    return await resp.json()
+                if resp.status == HTTPStatus.UNAUTHORIZED:
+                    err_msg = f"401 Unathorized - {servicename}"
+                    raise web.HTTPBadRequest(reason=err_msg)
+                if resp.status not in (
+                    HTTPStatus.NOT_FOUND,
+                    HTTPStatus.METHOD_NOT_ALLOWED,
+                    HTTPStatus.NOT_IMPLEMENTED,
+                ):
+                    body = await resp.json()
+                    logging.error(f"{servicename} failed - {resp.status} - {body}")
+                    raise web.HTTPBadRequest(
+                        reason=f"Error - {resp.status}: {body['detail']}.",
+                    )
+            logging.info(f"{servicename} not supported, using one request each")
+            _status_batch_supported["value"] = False
+
+        return await asyncio.gather(
+            *(self.post_status(token, status) for status in statuses),
+            return_exceptions=True,
+        )
+
     async def delete_all_status(self, token: str, event: dict) -> int:
         """Delete all status function."""
         servicename = "delete_status"
@@ -129,7 +266,7 @@ class StatusAdapter:
             ],
         )
         url = f"{PHOTO_SERVICE_URL}/status?eventId={event['id']}"
-        async with ClientSession() as session, session.delete(
+        async with get_client_session(PHOTO_SERVICE_URL).delete(
             url, headers=headers,
         ) as resp:
             if resp.status == HTTPStatus.NO_CONTENT:
@@ -144,3 +281,29 @@ class StatusAdapter:
                     reason=f"Error - {resp.status}: {body['detail']}.",
                 )
         return resp.status
+
+
+# one status writer, bound to the loop that created it
+_status_writer: dict[str, tuple[asyncio.AbstractEventLoop, StatusWriter]] = {}
+
+
+def get_status_writer() -> StatusWriter:
+    """Return the status writer of the running event loop.
+
+    The writer is created on first use. A new writer is created if the
+    previous one belongs to another event loop.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _status_writer.get("writer")
+    if entry and entry[0] is loop:
+        return entry[1]
+    writer = StatusWriter(StatusAdapter().create_status_batch)
+    _status_writer["writer"] = (loop, writer)
+    return writer
+
+
+async def close_status_writer() -> None:
+    """Write queued messages and stop the writer of the running event loop."""
+    entry = _status_writer.pop("writer", None)
+    if entry and entry[0] is asyncio.get_running_loop():
+        await entry[1].close()
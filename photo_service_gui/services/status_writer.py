@@ -0,0 +1,149 @@
+"""Module for buffered, batched writing of status messages."""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+
+from aiohttp import ClientError
+from dotenv import load_dotenv
+
+load_dotenv()
+STATUS_WRITER_BATCH_SIZE = int(os.getenv("STATUS_WRITER_BATCH_SIZE", "50"))
+STATUS_WRITER_FLUSH_INTERVAL = float(os.getenv("STATUS_WRITER_FLUSH_INTERVAL", "0.5"))
+STATUS_WRITER_QUEUE_SIZE = int(os.getenv("STATUS_WRITER_QUEUE_SIZE", "1000"))
+STATUS_WRITER_RETRIES = int(os.getenv("STATUS_WRITER_RETRIES", "3"))
+STATUS_WRITER_RETRY_DELAY = 1.0
+STATUS_WRITER_DRAIN_TIMEOUT = 10.0
+
+
+def _mark_retrieved(future: asyncio.Future) -> None:
+    """Silence errors of futures nobody awaits, the writer logs them."""
+    if not future.cancelled():
+        future.exception()
+
+
+class StatusWriter:
+
+    """Class writing status messages in the background, in batches.
+
+    Messages are queued and sent in batches, when the batch is full or
+    the flush interval has passed. Failed batches are retried on
+    connection errors. Writers wait when the queue is full, so a slow
+    status service slows producers down instead of exhausting memory.
+    """
+
+    def __init__(
+        self,
+        send_batch: Callable[[str, list[dict]], Awaitable[list[str | Exception]]],
+    ) -> None:
+        """Initialize the Status Writer.
+
+        Args:
+            send_batch: Stores messages, returns id or error per message
+
+        """
+        self.send_batch = send_batch
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=STATUS_WRITER_QUEUE_SIZE)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sending queued messages in the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def write(self, token: str, status: dict) -> asyncio.Future:
+        """Queue a status message, return future with its id when written.
+
+        The future can be ignored, errors are logged by the writer.
+        """
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_mark_retrieved)
+        await self._queue.put((token, status, future))
+        self.start()
+        return future
+
+    async def _next_batch(self) -> list[tuple[str, dict, asyncio.Future]]:
+        """Wait for messages, until batch is full or flush interval passed."""
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + STATUS_WRITER_FLUSH_INTERVAL
+        while len(batch) < STATUS_WRITER_BATCH_SIZE:
+            time_left = deadline - loop.time()
+            if time_left <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), time_left))
+            except TimeoutError:
+                break
+        return batch
+
+    async def _run(self) -> None:
+        """Send batches until stopped."""
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self.flush(batch)
+            except Exception as e:
+                # keep writing later batches, fail this one
+                logging.exception("Error writing status batch")
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def flush(self, batch: list[tuple[str, dict, asyncio.Future]]) -> None:
+        """Send a batch, one request per token since each has its own access."""
+        by_token: dict[str, list[tuple[dict, asyncio.Future]]] = {}
+        for token, status, future in batch:
+            by_token.setdefault(token, []).append((status, future))
+        for token, items in by_token.items():
+            await self._send(token, items)
+
+    async def _send(
+        self, token: str, items: list[tuple[dict, asyncio.Future]],
+    ) -> None:
+        """Send messages, retry the ones failed on connection errors."""
+        for attempt in range(STATUS_WRITER_RETRIES + 1):
+            try:
+                results = await self.send_batch(token, [status for status, _ in items])
+            except Exception as e:
+                results = [e] * len(items)
+            if len(results) != len(items):
+                err_msg = f"Got {len(results)} results for {len(items)} status messages"
+                logging.error(err_msg)
+                results = [Exception(err_msg)] * len(items)
+            retry = []
+            for (status, future), result in zip(items, results, strict=True):
+                if future.done():
+                    continue
+                if not isinstance(result, Exception):
+                    future.set_result(result)
+                elif attempt < STATUS_WRITER_RETRIES and isinstance(
+                    result, (ClientError, TimeoutError),
+                ):
+                    retry.append((status, future))
+                else:
+                    logging.error(f"Status message not written: {status} - {result}")
+                    future.set_exception(result)
+            if not retry:
+                return
+            items = retry
+            await asyncio.sleep(STATUS_WRITER_RETRY_DELAY * 2**attempt)
+
+    async def close(self) -> None:
+        """Write queued messages, then stop."""
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), STATUS_WRITER_DRAIN_TIMEOUT)
+        except TimeoutError:
+            logging.exception(
+                f"Status writer stopped, {self._queue.qsize()} not written",
+            )
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
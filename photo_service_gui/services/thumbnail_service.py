@@ -0,0 +1,210 @@
+"""Service for downscaled photo previews, cached on disk."""
+
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+
+from dotenv import load_dotenv
+from PIL import Image, ImageOps
+
+from .cloud_storage_service import CloudStorageService
+from .photos_file_adapter import VISION_ROOT_PATH
+
+load_dotenv()
+THUMBNAIL_CACHE_DIR = os.getenv(
+    "THUMBNAIL_CACHE_DIR", f"{tempfile.gettempdir()}/photo_service_gui_thumbnails",
+)
+THUMBNAIL_CACHE_MAX_MB = int(os.getenv("THUMBNAIL_CACHE_MAX_MB", "500"))
+THUMBNAIL_HEIGHT = int(os.getenv("THUMBNAIL_HEIGHT", "200"))
+THUMBNAIL_FORMAT = os.getenv("THUMBNAIL_FORMAT", "WEBP").upper()
+THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+THUMBNAIL_WRITE_BACK = os.getenv("THUMBNAIL_WRITE_BACK", "false").lower() == "true"
+
+THUMBNAIL_CONTENT_TYPES = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+THUMBNAIL_SUFFIXES = {"JPEG": ".jpg", "WEBP": ".webp"}
+
+
+def create_thumbnail(data: bytes, height: int, image_format: str) -> bytes:
+    """Return image downscaled to the given height, aspect ratio is kept."""
+    with Image.open(io.BytesIO(data)) as image:
+        # let the jpeg decoder skip detail we do not need
+        image.draft("RGB", (height, height))
+        thumbnail = ImageOps.exif_transpose(image)
+    thumbnail.thumbnail((height * 10, height))
+    if thumbnail.mode not in ("RGB", "L"):
+        thumbnail = thumbnail.convert("RGB")
+    output = io.BytesIO()
+    thumbnail.save(output, format=image_format, quality=THUMBNAIL_QUALITY)
+    return output.getvalue()
+
+
+def get_file_path(file_name: str) -> Path:
+    """Return path of photo in files folder, paths outside are rejected."""
+    root = Path(VISION_ROOT_PATH).resolve()
+    file_path = (root / file_name).resolve()
+    if not file_path.is_relative_to(root):
+        err_msg = f"Ugyldig filnavn: {file_name}"
+        raise ValueError(err_msg)
+    return file_path
+
+
+def get_file_bytes(file_name: str) -> bytes:
+    """Read photo from files folder."""
+    return get_file_path(file_name).read_bytes()
+
+
+def get_file_version(file_name: str) -> str:
+    """Return version of photo in files folder, changes when file is replaced."""
+    stat = get_file_path(file_name).stat()
+    return f"{stat.st_mtime_ns}-{stat.st_size}"
+
+
+class ThumbnailDiskCache:
+
+    """Class representing a size bounded cache of files in a folder.
+
+    The least recently used files are removed when the cache is full.
+    """
+
+    def __init__(self, path: str, max_bytes: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            path: Folder for the cached files, created if missing
+            max_bytes: Maximum total size of the cached files
+
+        """
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self._size: int | None = None
+        self._lock = threading.Lock()
+
+    def get(self, key: str, suffix: str) -> bytes | None:
+        """Return cached content, or None if missing."""
+        file_path = self.path / f"{key}{suffix}"
+        try:
+            data = file_path.read_bytes()
+            # modification time is used to find least recently used files
+            os.utime(file_path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def set(self, key: str, suffix: str, data: bytes) -> None:
+        """Store content in the cache."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        file_path = self.path / f"{key}{suffix}"
+        # write to temporary file first, readers never see partial content
+        tmp_path = file_path.with_name(f"{file_path.name}.{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(data)
+        with self._lock:
+            try:
+                old_size = file_path.stat().st_size
+            except FileNotFoundError:
+                old_size = 0
+            tmp_path.replace(file_path)
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(data) - old_size
+            if self._size > self.max_bytes:
+                self._prune()
+
+    def _scan_size(self) -> int:
+        """Return total size of files in the cache folder."""
+        return sum(
+            entry.stat().st_size for entry in os.scandir(self.path) if entry.is_file()
+        )
+
+    def _prune(self) -> None:
+        """Remove least recently used files until the cache is below 90% full."""
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry.path)
+            for entry in os.scandir(self.path)
+            if entry.is_file()
+        )
+        size = sum(entry[1] for entry in entries)
+        for _, file_size, file_path in entries:
+            if size <= self.max_bytes * 0.9:
+                break
+            Path(file_path).unlink(missing_ok=True)
+            size -= file_size
+        self._size = size
+        logging.debug(f"Thumbnail cache pruned to {size} bytes")
+
+
+_disk_cache = ThumbnailDiskCache(
+    THUMBNAIL_CACHE_DIR, THUMBNAIL_CACHE_MAX_MB * 1024 * 1024,
+)
+
+
+class ThumbnailService:
+
+    """Service for downscaled previews of photos in cloud storage or files.
+
+    Previews are created on first request and kept in a disk cache,
+    optionally also written back to the THUMBS folder in the bucket.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the Thumbnail Service."""
+        self.image_format = THUMBNAIL_FORMAT
+        self.suffix = THUMBNAIL_SUFFIXES[THUMBNAIL_FORMAT]
+        self.content_type = THUMBNAIL_CONTENT_TYPES[THUMBNAIL_FORMAT]
+
+    async def get_version(self, blob_name: str, file_name: str) -> str:
+        """Return version of the photo, changes when the photo is replaced."""
+        if blob_name:
+            return await CloudStorageService().get_blob_generation(blob_name)
+        return await asyncio.to_thread(get_file_version, file_name)
+
+    def get_cache_key(self, blob_name: str, file_name: str, version: str) -> str:
+        """Return key identifying the preview of a photo version, used as ETag."""
+        source = f"gcs:{blob_name}" if blob_name else f"file:{file_name}"
+        return hashlib.sha256(
+            f"{source}:{version}:{THUMBNAIL_HEIGHT}:{self.image_format}".encode(),
+        ).hexdigest()
+
+    async def get_thumbnail(
+        self, blob_name: str, file_name: str, version: str,
+    ) -> bytes:
+        """Return preview of a photo in cloud storage (blob) or in files."""
+        key = self.get_cache_key(blob_name, file_name, version)
+        thumbnail = await asyncio.to_thread(_disk_cache.get, key, self.suffix)
+        if thumbnail is not None:
+            return thumbnail
+
+        if blob_name:
+            data = await CloudStorageService().download_blob_bytes(blob_name)
+        else:
+            data = await asyncio.to_thread(get_file_bytes, file_name)
+        thumbnail = await asyncio.to_thread(
+            create_thumbnail, data, THUMBNAIL_HEIGHT, self.image_format,
+        )
+        await asyncio.to_thread(_disk_cache.set, key, self.suffix, thumbnail)
+
+        if blob_name and THUMBNAIL_WRITE_BACK:
+            await self.write_back(blob_name, thumbnail)
+        return thumbnail
+
+    async def write_back(self, blob_name: str, thumbnail: bytes) -> None:
+        """Store preview in THUMBS folder, e.g. event/THUMBS/DETECT/photo.webp."""
+        event_id, _, photo_path = blob_name.partition("/")
+        folder, _, filename = photo_path.rpartition("/")
+        destination_folder = f"THUMBS/{folder}" if folder else "THUMBS"
+        try:
+            await CloudStorageService().upload_blob_bytes(
+                event_id,
+                destination_folder,
+                f"{Path(filename).stem}{self.suffix}",
+                thumbnail,
+                content_type=self.content_type,
+                metadata={},
+            )
+        except Exception:
+            logging.exception(f"Error writing back thumbnail for {blob_name}")
@@ -0,0 +1,61 @@
+"""Module for time zone adjusted time helpers."""
+
+import datetime as dt
+import functools
+from zoneinfo import ZoneInfo
+
+# strftime format per time format name, others use locale time (%X)
+TIME_FORMATS = {
+    "HH:MM": "%H:%M",
+    "log": "%Y-%m-%dT%X",
+}
+_SECONDS_PER_MINUTE = 60
+_MINUTES_PER_HOUR = 60
+
+
+@functools.lru_cache(maxsize=64)
+def get_zone_info(time_zone: str) -> ZoneInfo:
+    """Return time zone object, created once per time zone name."""
+    return ZoneInfo(time_zone)
+
+
+def get_event_tz(event: dict) -> dt.tzinfo:
+    """Return time zone of event, UTC if not set."""
+    time_zone = event["timezone"]
+    return get_zone_info(time_zone) if time_zone else dt.UTC
+
+
+def get_local_datetime_now(event: dict) -> dt.datetime:
+    """Return local datetime object, time zone adjusted from event info."""
+    return dt.datetime.now(get_event_tz(event))
+
+
+def format_local_time(event: dict, time_format: str) -> str:
+    """Return local time string, time zone adjusted from event info."""
+    return get_local_datetime_now(event).strftime(
+        TIME_FORMATS.get(time_format, "%X"),
+    )
+
+
+def format_time_ago(timestamp: str, now: dt.datetime) -> str:
+    """Return human-readable time elapsed from timestamp to now (naive)."""
+    if not timestamp:
+        return "-"
+    try:
+        then = dt.datetime.fromisoformat(timestamp)
+        total_seconds = int((now - then).total_seconds())
+    except Exception:
+        return "Error"
+    if total_seconds < _SECONDS_PER_MINUTE:
+        return f"{total_seconds} sec"
+    minutes = total_seconds // _SECONDS_PER_MINUTE
+    if minutes < _MINUTES_PER_HOUR:
+        return f"{minutes} min"
+    return f"{minutes // _MINUTES_PER_HOUR} hours"
+
+
+def get_times_ago(timestamps: list[str], event: dict) -> list[str]:
+    """Return time elapsed since each timestamp, local time read once."""
+    # timestamps are local time without time zone
+    now = get_local_datetime_now(event).replace(tzinfo=None)
+    return [format_time_ago(timestamp, now) for timestamp in timestamps]
@@ -0,0 +1,438 @@
+"""Service for transcoding raw captured video files to MP4."""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from .config_adapter import ConfigAdapter
+from .photos_file_adapter import (
+    CAPTURED_FILE_PATH,
+    CAPTURED_RAW_ERROR_ARCHIVE_PATH,
+    CAPTURED_RAW_FILE_PATH,
+    PhotosFileAdapter,
+    can_remux,
+    get_probe_command,
+    get_remux_command,
+    get_transcode_command,
+)
+
+load_dotenv()
+# one web worker transcodes, leave half of the CPUs to the others
+TRANSCODE_WORKERS = int(
+    os.getenv("TRANSCODE_WORKERS", str(max(1, (os.cpu_count() or 2) // 2))),
+)
+TRANSCODE_POLL_INTERVAL = float(os.getenv("TRANSCODE_POLL_INTERVAL", "2"))
+TRANSCODE_JOB_TIMEOUT = float(os.getenv("TRANSCODE_JOB_TIMEOUT", "600"))
+# files modified more recently may still be written by the capture service
+TRANSCODE_MIN_FILE_AGE = float(os.getenv("TRANSCODE_MIN_FILE_AGE", "2"))
+TRANSCODE_TMP_FOLDER = ".transcoding"
+# raw files are moved here when claimed, so they are transcoded only once
+TRANSCODE_PROCESSING_FOLDER = ".processing"
+# lock, control (start/stop) and stats files shared by all web workers
+TRANSCODE_STATE_FOLDER = ".transcode"
+TRANSCODE_RECENT_JOBS = 20
+
+
+class TranscodeService:
+
+    """Service transcoding raw captured video files with a pool of workers.
+
+    Only the web worker holding the transcode lock runs the pipeline.
+    Start and stop are written to a control file that the owner follows,
+    and the owner writes its stats to a file read by all web workers. If
+    the owner exits, another web worker takes the lock and continues.
+
+    The raw capture folder is scanned for new files, which are claimed by
+    moving them to a processing folder, queued and converted by concurrent
+    FFmpeg processes. Output is written to a temporary file and renamed
+    into the capture folder when complete, so readers of the capture
+    folder never see partial files.
+    """
+
+    def __init__(
+        self,
+        raw_folder: str = CAPTURED_RAW_FILE_PATH,
+        output_folder: str = CAPTURED_FILE_PATH,
+        error_folder: str = CAPTURED_RAW_ERROR_ARCHIVE_PATH,
+    ) -> None:
+        """Initialize the Transcode Service."""
+        self.raw_folder = Path(raw_folder)
+        self.output_folder = Path(output_folder)
+        self.error_folder = Path(error_folder)
+        self.processing_folder = self.raw_folder / TRANSCODE_PROCESSING_FOLDER
+        self.state_folder = self.raw_folder / TRANSCODE_STATE_FOLDER
+        self.event_id = ""
+        self.settings = {"preset": "fast", "crf": 23, "audio_bitrate": "128k"}
+        self._queue: asyncio.Queue[Path] = asyncio.Queue()
+        self._tasks: list[asyncio.Task] = []
+        self._supervisor: asyncio.Task | None = None
+        self._lock_fd: int | None = None
+        self._written_stats: dict = {}
+        self.stats = {
+            "running": 0,
+            "done": 0,
+            "remuxed": 0,
+            "failed": 0,
+            "recent_jobs": deque(maxlen=TRANSCODE_RECENT_JOBS),
+        }
+
+    def is_owner(self) -> bool:
+        """Return True if this web worker holds the transcode lock."""
+        return self._lock_fd is not None
+
+    def is_running(self) -> bool:
+        """Return True if the workers are started in this web worker."""
+        return bool(self._tasks)
+
+    def _get_local_stats(self) -> dict:
+        """Get stats of the pipeline in this web worker."""
+        return {
+            "active": self.is_running(),
+            "event_id": self.event_id,
+            "queue_depth": self._queue.qsize(),
+            "running": self.stats["running"],
+            "done": self.stats["done"],
+            "remuxed": self.stats["remuxed"],
+            "failed": self.stats["failed"],
+            "recent_jobs": list(self.stats["recent_jobs"]),
+        }
+
+    async def get_stats(self) -> dict:
+        """Get queue depth, job counts and timing of the most recent jobs.
+
+        The stats are the owner's, whichever web worker is asked.
+        """
+        if self.is_owner():
+            return self._get_local_stats()
+        stats = await asyncio.to_thread(
+            _read_json, self.state_folder / "stats.json",
+        )
+        return stats or {"active": False, "event_id": ""}
+
+    async def load_settings(self, token: str, event_id: str) -> dict:
+        """Load encoder settings from event config."""
+        configs = await ConfigAdapter().get_configs(
+            token,
+            event_id,
+            {
+                "VIDEO_ENCODER_PRESET": "str",
+                "VIDEO_ENCODER_CRF": "int",
+                "VIDEO_AUDIO_BITRATE": "str",
+            },
+        )
+        return {
+            "preset": configs["VIDEO_ENCODER_PRESET"],
+            "crf": configs["VIDEO_ENCODER_CRF"],
+            "audio_bitrate": configs["VIDEO_AUDIO_BITRATE"],
+        }
+
+    async def start(self, token: str, event_id: str) -> str:
+        """Ask the owner to start transcoding, with settings of the event."""
+        settings = await self.load_settings(token, event_id)
+        control = await asyncio.to_thread(
+            _read_json, self.state_folder / "control.json",
+        )
+        await asyncio.to_thread(
+            _write_json,
+            self.state_folder / "control.json",
+            {"active": True, "event_id": event_id, "settings": settings},
+        )
+        await self.supervise()
+        if control.get("active"):
+            return "Transkoding kjører allerede, innstillinger er oppdatert. "
+        return f"Transkoding startet med {TRANSCODE_WORKERS} arbeidere. "
+
+    async def stop(self) -> str:
+        """Ask the owner to stop transcoding, running jobs are cancelled."""
+        control = await asyncio.to_thread(
+            _read_json, self.state_folder / "control.json",
+        )
+        if control.get("active"):
+            await asyncio.to_thread(
+                _write_json, self.state_folder / "control.json", {"active": False},
+            )
+            await self.supervise()
+        return "Transkoding stoppet. "
+
+    def start_supervisor(self) -> None:
+        """Start competing for the transcode lock in this web worker."""
+        if self._supervisor is None:
+            self._supervisor = asyncio.create_task(self._supervise_loop())
+
+    async def close(self) -> None:
+        """Stop transcoding in this web worker, another one takes over."""
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        await self._stop_workers()
+        self._release_lock()
+
+    def _acquire_lock(self) -> bool:
+        """Take the transcode lock if no other web worker holds it."""
+        self.state_folder.mkdir(parents=True, exist_ok=True)
+        lock_fd = os.open(self.state_folder / "transcode.lock", os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(lock_fd)
+            return False
+        self._lock_fd = lock_fd
+        logging.info(f"Transcode lock taken by process {os.getpid()}")
+        return True
+
+    def _release_lock(self) -> None:
+        """Release the transcode lock, if held."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
+
+    async def supervise(self) -> None:
+        """Follow the control file and publish stats, if the owner.
+
+        The lock is only taken while transcoding is started, so nothing is
+        written to the state folder before that.
+        """
+        control = await asyncio.to_thread(
+            _read_json, self.state_folder / "control.json",
+        )
+        if not self.is_owner() and not (
+            control.get("active") and await asyncio.to_thread(self._acquire_lock)
+        ):
+            return
+        if control.get("active"):
+            self.event_id = control["event_id"]
+            self.settings = control["settings"]
+            if not self.is_running():
+                await self._start_workers()
+            await self.scan()
+        elif self.is_running():
+            await self._stop_workers()
+        stats = self._get_local_stats()
+        if stats != self._written_stats:
+            await asyncio.to_thread(
+                _write_json, self.state_folder / "stats.json", stats,
+            )
+            self._written_stats = stats
+        if not control.get("active"):
+            self._release_lock()
+
+    async def _supervise_loop(self) -> None:
+        """Supervise at regular intervals."""
+        while True:
+            try:
+                await self.supervise()
+            except Exception:
+                logging.exception("Error supervising transcoding")
+            await asyncio.sleep(TRANSCODE_POLL_INTERVAL)
+
+    async def _start_workers(self) -> None:
+        """Start transcoding workers, queue files claimed by a previous owner."""
+        (self.output_folder / TRANSCODE_TMP_FOLDER).mkdir(parents=True, exist_ok=True)
+        self.processing_folder.mkdir(parents=True, exist_ok=True)
+        for raw_file in await asyncio.to_thread(self._list_claimed_files):
+            self._queue.put_nowait(raw_file)
+        self._tasks = [
+            asyncio.create_task(self._worker()) for _ in range(TRANSCODE_WORKERS)
+        ]
+        logging.info(f"Started transcoding with {TRANSCODE_WORKERS} workers")
+
+    async def _stop_workers(self) -> None:
+        """Stop transcoding workers, claimed files are left for the next start."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._tasks:
+            logging.info("Stopped transcoding")
+        self._tasks = []
+        self._queue = asyncio.Queue()
+
+    def _list_claimed_files(self) -> list[Path]:
+        """List files in the processing folder, oldest first."""
+        names = PhotosFileAdapter().list_files(
+            str(self.processing_folder), sort_by_mtime=True,
+        )
+        return [self.processing_folder / name for name in names]
+
+    def _claim_new_files(self) -> list[Path]:
+        """Move complete raw files to the processing folder, oldest first."""
+        names = PhotosFileAdapter().list_files(
+            str(self.raw_folder),
+            min_age=TRANSCODE_MIN_FILE_AGE,
+            sort_by_mtime=True,
+        )
+        self.processing_folder.mkdir(parents=True, exist_ok=True)
+        claimed = []
+        for name in names:
+            raw_file = self.processing_folder / name
+            try:
+                (self.raw_folder / name).rename(raw_file)
+            except FileNotFoundError:
+                continue
+            claimed.append(raw_file)
+        return claimed
+
+    async def scan(self) -> int:
+        """Claim and queue new files in the raw capture folder, return number."""
+        new_files = await asyncio.to_thread(self._claim_new_files)
+        for raw_file in new_files:
+            self._queue.put_nowait(raw_file)
+        return len(new_files)
+
+    async def _worker(self) -> None:
+        """Transcode queued files, one at a time."""
+        while True:
+            raw_file = await self._queue.get()
+            try:
+                await self.transcode(raw_file)
+            finally:
+                self._queue.task_done()
+
+    async def transcode(self, raw_file: Path) -> bool:
+        """Transcode one raw file to MP4 in the capture folder.
+
+        Streams already in H.264/AAC are copied, others are re-encoded.
+        """
+        output_file = self.output_folder / f"{raw_file.stem}.mp4"
+        # unique name, a job left by a previous owner may still be writing
+        tmp_file = (
+            self.output_folder
+            / TRANSCODE_TMP_FOLDER
+            / f"{raw_file.stem}.{os.getpid()}.{uuid.uuid4().hex}.mp4"
+        )
+        self.stats["running"] += 1
+        start_time = time.monotonic()
+        mode = "encode"
+        error = ""
+        try:
+            if await self._can_remux(raw_file):
+                error = await self._run_ffmpeg(
+                    get_remux_command(str(raw_file), str(tmp_file)),
+                )
+                if error:
+                    logging.warning(f"Remux failed, re-encoding {raw_file}: {error}")
+                else:
+                    mode = "remux"
+            if mode == "encode":
+                error = await self._run_ffmpeg(
+                    get_transcode_command(
+                        str(raw_file),
+                        str(tmp_file),
+                        self.settings["preset"],
+                        self.settings["crf"],
+                        self.settings["audio_bitrate"],
+                    ),
+                )
+            if not error:
+                await asyncio.to_thread(self._publish, tmp_file, output_file, raw_file)
+        except asyncio.CancelledError:
+            # stopped, raw file stays in the processing folder for the next start
+            tmp_file.unlink(missing_ok=True)
+            raise
+        except Exception as e:
+            logging.exception(f"Error transcoding {raw_file.name}")
+            error = str(e) or e.__class__.__name__
+        finally:
+            self.stats["running"] -= 1
+        if error:
+            self.stats["failed"] += 1
+            await asyncio.to_thread(self._move_to_error_archive, tmp_file, raw_file)
+        else:
+            self.stats["done"] += 1
+            if mode == "remux":
+                self.stats["remuxed"] += 1
+        self.stats["recent_jobs"].append(
+            {
+                "file": raw_file.name,
+                "mode": mode,
+                "seconds": round(time.monotonic() - start_time, 2),
+                "error": error,
+            },
+        )
+        return not error
+
+    async def _run_process(self, command: list[str]) -> tuple[int, bytes, bytes]:
+        """Run command without blocking, return exit code, stdout and stderr."""
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(), TRANSCODE_JOB_TIMEOUT,
+            )
+        except (TimeoutError, asyncio.CancelledError):
+            process.kill()
+            await process.wait()
+            raise
+        return process.returncode or 0, stdout, stderr
+
+    async def _run_ffmpeg(self, command: list[str]) -> str:
+        """Run FFmpeg, return error message if failed."""
+        returncode, _, stderr = await self._run_process(command)
+        if returncode != 0:
+            # last line from ffmpeg usually tells what went wrong
+            lines = stderr.decode(errors="replace").strip().splitlines()
+            return lines[-1] if lines else f"FFmpeg exit code {returncode}"
+        return ""
+
+    async def _can_remux(self, raw_file: Path) -> bool:
+        """Probe raw file, True if streams can be copied without re-encoding."""
+        try:
+            returncode, stdout, _ = await self._run_process(
+                get_probe_command(str(raw_file)),
+            )
+        except Exception:
+            logging.exception(f"Error probing {raw_file.name}")
+            return False
+        return returncode == 0 and can_remux(stdout.decode(errors="replace"))
+
+    def _publish(self, tmp_file: Path, output_file: Path, raw_file: Path) -> None:
+        """Move complete output into capture folder and delete raw file."""
+        tmp_file.replace(output_file)
+        raw_file.unlink()
+        logging.debug(f"Transcoded {raw_file.name} to {output_file.name}")
+
+    def _move_to_error_archive(self, tmp_file: Path, raw_file: Path) -> None:
+        """Move raw file that could not be transcoded out of the queue."""
+        tmp_file.unlink(missing_ok=True)
+        try:
+            self.error_folder.mkdir(parents=True, exist_ok=True)
+            raw_file.replace(self.error_folder / raw_file.name)
+        except Exception:
+            logging.exception(f"Error moving raw file to error archive: {raw_file}")
+
+
+def _read_json(path: Path) -> dict:
+    """Read JSON file shared by the web workers, empty if missing."""
+    try:
+        return json.loads(path.read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def _write_json(path: Path, data: dict) -> None:
+    """Write JSON file shared by the web workers, readers never see partial."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text(json.dumps(data))
+    tmp_path.replace(path)
+
+
+_transcode_service: dict[str, TranscodeService] = {}
+
+
+def get_transcode_service() -> TranscodeService:
+    """Return the transcode service of this process."""
+    if "service" not in _transcode_service:
+        _transcode_service["service"] = TranscodeService()
+    return _transcode_service["service"]
@@ -4,10 +4,12 @@ import logging
 import os
 from http import HTTPStatus
 
-from aiohttp import ClientSession, hdrs, web
+from aiohttp import hdrs, web
 from aiohttp_session import Session
 from multidict import MultiDict
 
+from .client_session_pool import get_client_session
+
 USERS_HOST_SERVER = os.getenv("USERS_HOST_SERVER")
 USERS_HOST_PORT = os.getenv("USERS_HOST_PORT")
 USER_SERVICE_URL = f"http://{USERS_HOST_SERVER}:{USERS_HOST_PORT}"
@@ -38,7 +40,7 @@ class UserAdapter:
                 (hdrs.AUTHORIZATION, f"Bearer {token}"),
             ],
         )
-        async with ClientSession() as session, session.post(
+        async with get_client_session(USER_SERVICE_URL).post(
             f"{USER_SERVICE_URL}/users", headers=headers, json=request_body,
         ) as resp:
             if resp.status == HTTPStatus.CREATED:
@@ -63,17 +65,18 @@ class UserAdapter:
             ],
         )
         url = f"{USER_SERVICE_URL}/users/{w_id}"
-        async with ClientSession() as session:
-            async with session.delete(url, headers=headers) as resp:
-                pass
-            logging.info(f"Delete user: {w_id} - res {resp.status}")
-            if resp.status == HTTPStatus.NO_CONTENT:
-                logging.debug(f"result - got response {resp}")
-            elif resp.status == HTTPStatus.UNAUTHORIZED:
-                raise web.HTTPBadRequest(reason=f"401 Unathorized - {servicename}")
-            else:
-                logging.error(f"delete_user failed - {resp.status}, {resp}")
-                raise web.HTTPBadRequest(reason="Delete user failed.")
+        async with get_client_session(USER_SERVICE_URL).delete(
+            url, headers=headers,
+        ) as resp:
+            pass
+        logging.info(f"Delete user: {w_id} - res {resp.status}")
+        if resp.status == HTTPStatus.NO_CONTENT:
+            logging.debug(f"result - got response {resp}")
+        elif resp.status == HTTPStatus.UNAUTHORIZED:
+            raise web.HTTPBadRequest(reason=f"401 Unathorized - {servicename}")
+        else:
+            logging.error(f"delete_user failed - {resp.status}, {resp}")
+            raise web.HTTPBadRequest(reason="Delete user failed.")
         return resp.status
 
     async def get_all_users(self, token: str) -> list:
@@ -86,7 +89,7 @@ class UserAdapter:
             ],
         )
 
-        async with ClientSession() as session, session.get(
+        async with get_client_session(USER_SERVICE_URL).get(
             f"{USER_SERVICE_URL}/users", headers=headers,
         ) as resp:
             logging.info(f"get_all_users - got response {resp.status}")
@@ -109,7 +112,7 @@ class UserAdapter:
                 (hdrs.CONTENT_TYPE, "application/json"),
             ],
         )
-        async with ClientSession() as session, session.post(
+        async with get_client_session(USER_SERVICE_URL).post(
             f"{USER_SERVICE_URL}/login", headers=headers, json=request_body,
         ) as resp:
             result = resp.status
@@ -7,4 +7,6 @@ from .logout import Logout
 from .main import Main
 from .photos import Photos
 from .status import Status
+from .thumbnail import Thumbnail
 from .video_events import VideoEvents
+from .video_events_stream import VideoEventsStream, close_video_status_collectors
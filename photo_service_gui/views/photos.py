@@ -1,78 +1,91 @@
 """Resource module for photo edit view."""
 
 import logging
+import os
 
 import aiohttp_jinja2
 from aiohttp import web
 
-from photo_service_gui.services import EventsAdapter, GoogleCloudStorageAdapter
+from photo_service_gui.services import CloudStorageService, EventsAdapter
 
 from .utils import (
     check_login,
     get_event,
 )
 
+PHOTOS_PAGE_SIZE = int(os.getenv("PHOTOS_PAGE_SIZE", "60"))
+
 
 class Photos(web.View):
 
     """Class representing the photos edit view."""
 
-    def _delete_photos(self, form: dict) -> tuple[str, str]:
+    async def _delete_photos(self, form: dict) -> tuple[str, str]:
         """Delete selected photos."""
-        informasjon = "Sletting utført: "
-        error_text = ""
-        for key, value in form.items():
-            if key.startswith("edit_photo"):
-                photo_name = str(value)
-                result = GoogleCloudStorageAdapter().delete_blob(photo_name)
-                logging.debug(f"Deleted photo - {result}")
-                informasjon += f"{key} "
-        return informasjon, error_text
-
-    def _move_photos_to_capture(self, form: dict) -> tuple[str, str]:
-        """Move selected photos from archive to capture (inbox)."""
-        informasjon = "Flytting til innboks utført: "
+        photo_keys = {
+            str(value): key
+            for key, value in form.items()
+            if key.startswith("edit_photo")
+        }
+        results = await CloudStorageService().delete_blobs(list(photo_keys))
+        informasjon = "Sletting utført: " + self._format_results(
+            photo_keys, results,
+        )
+        return informasjon, ""
+
+    async def _move_photos(
+        self, form: dict, source_folder: str, destination_folder: str,
+    ) -> tuple[dict, dict, str]:
+        """Move selected photos from source to destination folder."""
+        photo_keys = {}
+        new_photo_names = {}
         error_text = ""
         for key, value in form.items():
             if key.startswith("edit_photo"):
                 photo_name = str(value)
-                if "/DETECT_ARCHIVE/" in photo_name:
-                    new_photo_name = photo_name.replace(
-                        "/DETECT_ARCHIVE/",
-                        "/DETECT/",
+                if source_folder in photo_name:
+                    photo_keys[photo_name] = key
+                    new_photo_names[photo_name] = photo_name.replace(
+                        source_folder,
+                        destination_folder,
                     )
-                    result = GoogleCloudStorageAdapter().move_blob(
-                        photo_name,
-                        new_photo_name,
-                    )
-                    logging.debug(f"Moved photo to capture - {result}")
-                    informasjon += f"{key}. "
                 else:
                     error_text += f" {key}. "
+        results = await CloudStorageService().move_blobs(new_photo_names)
+        return photo_keys, results, error_text
+
+    async def _move_photos_to_capture(self, form: dict) -> tuple[str, str]:
+        """Move selected photos from archive to capture (inbox)."""
+        photo_keys, results, error_text = await self._move_photos(
+            form, "/DETECT_ARCHIVE/", "/DETECT/",
+        )
+        informasjon = "Flytting til innboks utført: " + self._format_results(
+            photo_keys, results,
+        )
         return informasjon, error_text
 
-    def _move_photos_to_archive(self, form: dict) -> tuple[str, str]:
+    async def _move_photos_to_archive(self, form: dict) -> tuple[str, str]:
         """Move selected photos from capture (inbox) to archive."""
-        informasjon = "Flytting til arkiv utført: "
-        error_text = ""
-        for key, value in form.items():
-            if key.startswith("edit_photo"):
-                photo_name = str(value)
-                if "/DETECT/" in photo_name:
-                    new_photo_name = photo_name.replace(
-                        "/DETECT/",
-                        "/DETECT_ARCHIVE/",
-                    )
-                    result = GoogleCloudStorageAdapter().move_blob(
-                        photo_name,
-                        new_photo_name,
-                    )
-                    logging.debug(f"Moved photo to archive - {result}")
-                    informasjon += f"{key}. "
-                else:
-                    error_text += f" {key}. "
+        photo_keys, results, error_text = await self._move_photos(
+            form, "/DETECT/", "/DETECT_ARCHIVE/",
+        )
+        informasjon = "Flytting til arkiv utført: " + self._format_results(
+            photo_keys, results,
+        )
         return informasjon, error_text
 
+    def _format_results(self, photo_keys: dict, results: dict) -> str:
+        """Summarize result per photo, successful first and then failed."""
+        done = [photo_keys[name] for name, error in results.items() if not error]
+        failed = [
+            f"{photo_keys[name]} ({error})" for name, error in results.items() if error
+        ]
+        logging.debug(f"Photos done: {done}, failed: {failed}")
+        summary = f"{len(done)} av {len(results)}. "
+        if failed:
+            summary += f"Feilet: {', '.join(failed)}. "
+        return summary
+
     async def get(self) -> web.Response:
         """Get route function that return the dashboards page."""
         try:
@@ -91,6 +104,10 @@ class Photos(web.View):
             informasjon = self.request.rel_url.query["informasjon"]
         except Exception:
             informasjon = ""
+        try:
+            page_token = self.request.rel_url.query["page_token"]
+        except Exception:
+            page_token = ""
         try:
             user = await check_login(self)
         except Exception as e:
@@ -98,13 +115,10 @@ class Photos(web.View):
 
         try:
             event = await get_event(user, event_id)
-            photos = GoogleCloudStorageAdapter().list_blobs(
-                event_id, "",
+            # photo type is a folder in the event, e.g. /DETECT/
+            photos, next_page_token = await CloudStorageService().list_blobs_page(
+                event_id, photo_type.lstrip("/"), page_token, PHOTOS_PAGE_SIZE,
             )
-            photos.reverse()
-
-            if photo_type:
-                photos = [photo for photo in photos if photo_type in photo["name"]]
 
             return await aiohttp_jinja2.render_template_async(
                 "photos.html",
@@ -116,6 +130,8 @@ class Photos(web.View):
                     "event_id": event_id,
                     "informasjon": informasjon,
                     "local_time_now": EventsAdapter().get_local_time(event, "HH:MM"),
+                    "next_page_token": next_page_token,
+                    "page_token": page_token,
                     "photos": photos,
                     "photo_type": photo_type,
                     "username": user["name"],
@@ -139,11 +155,11 @@ class Photos(web.View):
 
         try:
             if "delete_select" in form:
-                informasjon, error_text = self._delete_photos(form)
+                informasjon, error_text = await self._delete_photos(form)
             elif "move_to_capture" in form:
-                informasjon, error_text = self._move_photos_to_capture(form)
+                informasjon, error_text = await self._move_photos_to_capture(form)
             elif "move_to_archive" in form:
-                informasjon, error_text = self._move_photos_to_archive(form)
+                informasjon, error_text = await self._move_photos_to_archive(form)
             else:
                 informasjon, error_text = "", ""
 
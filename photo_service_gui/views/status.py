@@ -1,17 +1,36 @@
 """Resource module for photo edit view."""
 
 import logging
+import os
 
 import aiohttp_jinja2
 from aiohttp import web
 
 from photo_service_gui.services import EventsAdapter, StatusAdapter
+from photo_service_gui.services.status_adapter import is_before_supported
 
 from .utils import (
     check_login,
     get_event,
 )
 
+STATUS_PAGE_SIZE = int(os.getenv("STATUS_PAGE_SIZE", "50"))
+
+
+def get_cursor_ids(status: list, time: str, cursor: str, exclude: list) -> list:
+    """Return ids of status messages at time, the excluded too if at cursor."""
+    ids = [res["id"] for res in status if res["time"] == time and "id" in res]
+    return ids + exclude if time == cursor else ids
+
+
+def get_older_message(status: list, before: str) -> str:
+    """Return message shown when no older status messages are loaded."""
+    if not before or status:
+        return ""
+    if not is_before_supported():
+        return "Eldre meldinger er ikke tilgjengelige fra statustjenesten."
+    return "Ingen eldre meldinger."
+
 
 class Status(web.View):
 
@@ -24,9 +43,17 @@ class Status(web.View):
         except Exception:
             action = ""
         try:
-            count = int(self.request.rel_url.query["count"])
+            count = int(
+                self.request.rel_url.query.get("limit")
+                or self.request.rel_url.query["count"],
+            )
         except Exception:
-            count = 50
+            count = STATUS_PAGE_SIZE
+        # cursors - messages from since or until before, except ids shown already
+        since = self.request.rel_url.query.get("since", "")
+        before = self.request.rel_url.query.get("before", "")
+        exclude = self.request.rel_url.query.get("exclude", "").split(",")
+        exclude = [my_id for my_id in exclude if my_id]
         try:
             my_filter = self.request.rel_url.query["filter"]
         except Exception:
@@ -48,13 +75,46 @@ class Status(web.View):
         try:
             event = await get_event(user, event_id)
             status = []
+            # excluded messages are in the response too, ask for that many more
+            fetch_count = count + len(exclude)
             if my_filter:
                 status = await StatusAdapter().get_status_by_type(
-                    user["token"], event, my_filter, count,
+                    user["token"],
+                    event,
+                    my_filter,
+                    fetch_count,
+                    since=since,
+                    before=before,
                 )
             else:
                 status = await StatusAdapter().get_status(
-                    user["token"], event["id"], count,
+                    user["token"], event["id"], fetch_count, since=since, before=before,
+                )
+            status = [res for res in status if res.get("id") not in exclude]
+            times = [res["time"] for res in status]
+            status_newest = max(times, default=since)
+            status_oldest = min(times, default=before)
+            # ids at the cursor times, excluded from the next page
+            newest_ids = get_cursor_ids(status, status_newest, since, exclude)
+            oldest_ids = get_cursor_ids(status, status_oldest, before, exclude)
+
+            if self.request.rel_url.query.get("format") == "json":
+                # only the new rows, for the page to add to those shown
+                html = await aiohttp_jinja2.render_string_async(
+                    "status_rows.html",
+                    self.request,
+                    {"action": action, "status": status},
+                )
+                return web.json_response(
+                    {
+                        "count": len(status),
+                        "html": html,
+                        "newest": status_newest,
+                        "newest_ids": newest_ids,
+                        "oldest": status_oldest,
+                        "oldest_ids": oldest_ids,
+                        "older_message": get_older_message(status, before),
+                    },
                 )
 
             return await aiohttp_jinja2.render_template_async(
@@ -68,6 +128,10 @@ class Status(web.View):
                     "filter": my_filter,
                     "informasjon": informasjon,
                     "status": status,
+                    "status_newest": status_newest,
+                    "status_newest_ids": newest_ids,
+                    "status_oldest": status_oldest,
+                    "status_oldest_ids": oldest_ids,
                     "username": user["name"],
                 },
             )
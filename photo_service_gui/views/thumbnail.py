@@ -0,0 +1,61 @@
+"""Resource module for photo thumbnail view."""
+
+import logging
+import os
+
+from aiohttp import web
+
+from photo_service_gui.services import ThumbnailService
+
+from .utils import check_login
+
+THUMBNAIL_MAX_AGE = int(os.getenv("THUMBNAIL_MAX_AGE", "86400"))
+
+
+class Thumbnail(web.View):
+
+    """Class representing the photo thumbnail view."""
+
+    async def get(self) -> web.Response:
+        """Get route function that return a downscaled preview of a photo."""
+        try:
+            blob_name = self.request.rel_url.query["name"]
+        except Exception:
+            blob_name = ""
+        try:
+            file_name = self.request.rel_url.query["file"]
+        except Exception:
+            file_name = ""
+        try:
+            await check_login(self)
+        except Exception:
+            return web.HTTPUnauthorized()
+        if not (blob_name or file_name):
+            return web.HTTPBadRequest(reason="Mangler name eller file.")
+
+        thumbnail_service = ThumbnailService()
+        try:
+            # the version changes when the photo is overwritten
+            version = await thumbnail_service.get_version(blob_name, file_name)
+            cache_key = thumbnail_service.get_cache_key(blob_name, file_name, version)
+            etag = f'"{cache_key}"'
+            not_modified = self.request.headers.get("If-None-Match") == etag
+            thumbnail = b"" if not_modified else (
+                await thumbnail_service.get_thumbnail(blob_name, file_name, version)
+            )
+        except ValueError as e:
+            return web.HTTPBadRequest(reason=str(e))
+        except Exception:
+            logging.exception(f"Error creating thumbnail for {blob_name}{file_name}")
+            return web.HTTPNotFound()
+        headers = {
+            "ETag": etag,
+            "Cache-Control": f"private, max-age={THUMBNAIL_MAX_AGE}",
+        }
+        if not_modified:
+            return web.Response(status=304, headers=headers)
+        return web.Response(
+            body=thumbnail,
+            content_type=thumbnail_service.content_type,
+            headers=headers,
+        )
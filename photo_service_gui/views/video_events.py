@@ -1,21 +1,28 @@
 """Resource module for video_event resources."""
 
+import asyncio
+import hashlib
 import json
 import logging
-from datetime import UTC, datetime, timezone
+import os
+from collections.abc import Awaitable
+from typing import Any
 
 import aiohttp_jinja2
 from aiohttp import web
 
 from photo_service_gui.services import (
+    CloudStorageService,
     ConfigAdapter,
     EventsAdapter,
-    GoogleCloudStorageAdapter,
     LiveStreamService,
     PhotosFileAdapter,
     ServiceInstanceAdapter,
     StatusAdapter,
 )
+from photo_service_gui.services.time_utils import get_times_ago
+from photo_service_gui.services.transcode_service import get_transcode_service
+from photo_service_gui.services.ttl_cache import TTLCache
 
 from .utils import (
     check_login,
@@ -38,7 +45,10 @@ class VideoEvents(web.View):
             user = await check_login(self)
             event = await get_event(user, event_id)
 
-            _instances = await get_service_instances(user, event)
+            _instances, service_status = await asyncio.gather(
+                get_service_instances(user, event),
+                get_service_status(user["token"], event),
+            )
 
             """Get route function."""
             return await aiohttp_jinja2.render_template_async(
@@ -50,7 +60,7 @@ class VideoEvents(web.View):
                     "informasjon": informasjon,
                     "local_time_now": EventsAdapter().get_local_time(event, "HH:MM"),
                     "username": user["name"],
-                    "service_status": await get_service_status(user["token"], event),
+                    "service_status": service_status,
                     "service_instances": _instances,
                 },
             )
@@ -64,6 +74,7 @@ class VideoEvents(web.View):
             "pub_message": "",
             "video_analytics": "",
             "video_status": "",
+            "video_status_tag": "",
             "local_raw_captured_queue_length": 0,
             "local_captured_queue_length": 0,
             "cloud_captured_queue_length": 0,
@@ -71,6 +82,7 @@ class VideoEvents(web.View):
             "photo_latest": "",
             "service_status": {},
             "service_instances": [],
+            "transcode_status": {},
         }
         event_id = ""
         try:
@@ -78,7 +90,12 @@ class VideoEvents(web.View):
             user = await check_login(self)
             event_id = str(form["event_id"])
             event = await get_event(user, event_id)
-            if form.keys() & {"instance_action", "update_config", "new_trigger_line"}:
+            if form.keys() & {
+                "instance_action",
+                "update_config",
+                "new_trigger_line",
+                "transcode_action",
+            }:
                 try:
                     informasjon = await handle_form_actions(
                         user, event, dict(form),
@@ -92,32 +109,10 @@ class VideoEvents(web.View):
                     return web.Response(body=json_response)
 
             if "video_status" in form or "photo_queue" in form:
-                response["video_status"] = await get_analytics_status(
-                    user["token"], event,
-                )
-                response[
-                    "local_raw_captured_queue_length"
-                ] = PhotosFileAdapter().get_local_raw_capture_queue_length()
-                response[
-                    "local_captured_queue_length"
-                ] = PhotosFileAdapter().get_local_capture_queue_length()
-                response[
-                    "cloud_captured_queue_length"
-                ] = GoogleCloudStorageAdapter().list_blobs(
-                    event_id, "CAPTURE/",
-                ).__len__()
-                response[
-                    "trigger_line_url"
-                ] = await ConfigAdapter().get_config(
-                    user["token"], event_id, "TRIGGER_LINE_PHOTO_URL",
-                )
-                response["photo_latest"] = await ConfigAdapter().get_config(
-                    user["token"], event_id, "LATEST_DETECTED_PHOTO_URL",
-                )
-                response["service_status"] = await get_service_status(
-                    user["token"], event,
-                )
-                response["service_instances"] = await get_service_instances(user, event)
+                response.update(await get_video_status(user, event))
+                # browser already has these status messages, do not resend
+                if form.get("video_status_tag") == response["video_status_tag"]:
+                    del response["video_status"]
         except Exception as e:
             err_msg = f"Error updating video events: {e}"
             logging.exception("Video events update")
@@ -128,31 +123,82 @@ class VideoEvents(web.View):
 
         return web.Response(body=json_response)
 
-_SECONDS_PER_MINUTE = 60
-_MINUTES_PER_HOUR = 60
+VIDEO_STATUS_TIMEOUT = float(os.getenv("VIDEO_STATUS_TIMEOUT", "8"))
+LOCAL_QUEUE_TIMEOUT = float(os.getenv("LOCAL_QUEUE_TIMEOUT", "2"))
 
 
-def get_time_ago(timestamp: str, event: dict) -> str:
-    """Return human-readable time elapsed since timestamp."""
-    if not timestamp:
-        return "-"
+async def _status_part(
+    name: str, awaitable: Awaitable, default: Any, time_limit: float,
+) -> Any:
+    """Await one part of the video status, return default on failure."""
     try:
-        then = datetime.fromisoformat(timestamp)
-        now = EventsAdapter().get_local_datetime_now(event)
-        if now.tzinfo is not None:
-            now = now.replace(tzinfo=None)
-        diff = now - then
-        total_seconds = int(diff.total_seconds())
-        if total_seconds < _SECONDS_PER_MINUTE:
-            return f"{total_seconds} sec"
-        minutes = total_seconds // _SECONDS_PER_MINUTE
-        if minutes < _MINUTES_PER_HOUR:
-            return f"{minutes} min"
-        hours = minutes // _MINUTES_PER_HOUR
+        return await asyncio.wait_for(awaitable, time_limit)
     except Exception:
-        return "Error"
-    else:
-        return f"{hours} hours"
+        logging.exception(f"Video status - {name} failed, using default value")
+        return default
+
+
+async def get_video_status(user: dict, event: dict) -> dict:
+    """Get video status, independent parts are fetched concurrently.
+
+    Each part has its own timeout, and a part that fails is returned with
+    its default value, so the response is partial rather than failed.
+    """
+    token = user["token"]
+    event_id = event["id"]
+    parts = {
+        "video_status_feed": (
+            get_analytics_status_feed(token, event), ("", ""), VIDEO_STATUS_TIMEOUT,
+        ),
+        "local_raw_captured_queue_length": (
+            asyncio.to_thread(
+                PhotosFileAdapter().get_local_raw_capture_queue_length,
+            ),
+            0,
+            LOCAL_QUEUE_TIMEOUT,
+        ),
+        "local_captured_queue_length": (
+            asyncio.to_thread(PhotosFileAdapter().get_local_capture_queue_length),
+            0,
+            LOCAL_QUEUE_TIMEOUT,
+        ),
+        "cloud_captured_queue_length": (
+            CloudStorageService().get_queue_length(event_id, "CAPTURE/"),
+            0,
+            VIDEO_STATUS_TIMEOUT,
+        ),
+        # one request for all configs, missing keys are created only once
+        "configs": (
+            ConfigAdapter().get_configs(
+                token,
+                event_id,
+                dict(SERVICE_STATUS_CONFIGS.values()) | PHOTO_URL_CONFIGS,
+            ),
+            {},
+            VIDEO_STATUS_TIMEOUT,
+        ),
+        "service_instances": (
+            get_service_instances(user, event), [], VIDEO_STATUS_TIMEOUT,
+        ),
+    }
+    results = await asyncio.gather(
+        *(
+            _status_part(name, awaitable, default, time_limit)
+            for name, (awaitable, default, time_limit) in parts.items()
+        ),
+    )
+    status = dict(zip(parts, results, strict=True))
+    status["video_status_tag"], status["video_status"] = status.pop(
+        "video_status_feed",
+    )
+    configs = status.pop("configs")
+    status["service_status"] = (
+        get_service_status_from_configs(configs) if configs else {}
+    )
+    status["trigger_line_url"] = configs.get("TRIGGER_LINE_PHOTO_URL", "")
+    status["photo_latest"] = configs.get("LATEST_DETECTED_PHOTO_URL", "")
+    status["transcode_status"] = await get_transcode_service().get_stats()
+    return status
 
 
 async def get_service_instances(user: dict, event: dict) -> list:
@@ -161,8 +207,21 @@ async def get_service_instances(user: dict, event: dict) -> list:
         user["token"], event["id"],
     )
     if service_instances:
-        service = LiveStreamService()
-        for instance in service_instances:
+        channel_statuses = {}
+        if any(
+            instance["service_type"] == "VIDEO_SERVICE_CAPTURE_SRT"
+            for instance in service_instances
+        ):
+            try:
+                channel_statuses = await LiveStreamService().get_channel_statuses()
+            except Exception:
+                logging.exception("Error getting channel statuses")
+        last_seen = get_times_ago(
+            [instance["last_heartbeat"] for instance in service_instances], event,
+        )
+        for instance, instance_last_seen in zip(
+            service_instances, last_seen, strict=True,
+        ):
             if instance["service_type"].startswith("VIDEO_SERVICE_"):
                 instance["icon_url"] = "capture.png"
             elif instance["service_type"] == "VIDEO_SERVICE_DETECT":
@@ -171,15 +230,13 @@ async def get_service_instances(user: dict, event: dict) -> list:
                 instance["icon_url"] = "upload.png"
             else:
                 instance["icon_url"] = ""
-            instance["last_seen"] = get_time_ago(instance["last_heartbeat"], event)
+            instance["last_seen"] = instance_last_seen
             if instance["service_type"] == "VIDEO_SERVICE_CAPTURE_SRT":
-                try:
-                    channel = await service.get_channel_status(
-                        instance["instance_name"],
-                    )
+                channel = channel_statuses.get(instance["instance_name"])
+                if channel:
                     instance["status"] = channel["state"]
-                except Exception:
-                    logging.exception(
+                else:
+                    logging.error(
                         f"Error getting channel {instance['instance_name']}",
                     )
                     instance["status"] = "ERROR"
@@ -216,43 +273,90 @@ async def handle_form_actions(user: dict, event: dict, form: dict) -> str:
         )
     if "update_config" in form:
         informasjon += await update_config(user["token"], event, form)
+    if "transcode_action" in form:
+        if form["transcode_action"] == "start":
+            informasjon += await get_transcode_service().start(
+                user["token"], event["id"],
+            )
+        else:
+            informasjon += await get_transcode_service().stop()
     return informasjon
 
+_CAPTURE_ICON = "<img id=menu_icon src=../static/capture.png title=Video>"
+STATUS_ICONS = {
+    "VIDEO_SERVICE_CAPTURE_SRT": _CAPTURE_ICON,
+    "VIDEO_SERVICE_CAPTURE_LOCAL": _CAPTURE_ICON,
+    "VIDEO_SERVICE_DETECT": (
+        "<img id=menu_icon src=../static/detect.png title=Deteksjon>"
+    ),
+    "integration_status": (
+        "<img id=menu_icon src=../static/upload.png title=Opplasting>"
+    ),
+}
+STATUS_DETAILS_TAG = '<details style="display: inline;">'
+STATUS_SUMMARY_TAG = (
+    '<summary style="display: inline; list-style: none; '
+    'color: #0066cc; text-decoration: underline; '
+    'cursor: pointer;">'
+)
+STATUS_PRE_STYLE = (
+    "margin: 5px 0; padding: 8px; background: #f5f5f5; "
+    "border-left: 3px solid #ccc; font-size: 0.9em; "
+    "white-space: pre-wrap;"
+)
+# rendered status rows, and latest rendered feed (tag, html) per event
+_status_row_cache = TTLCache(maxsize=2048, ttl=3600)
+_status_feed_cache = TTLCache(maxsize=256, ttl=3600)
+
+
+def get_status_key(res: dict) -> str:
+    """Return key identifying a status message."""
+    return res.get("id") or f"{res['time']}|{res['type']}|{res['message']}"
+
+
+def render_status_row(res: dict) -> str:
+    """Render one status message as html, cached since messages never change."""
+    key = get_status_key(res)
+    row = _status_row_cache.get(key)
+    if row is not None:
+        return row
+    info_time = f"<a title={res['time']}>{res['time'][-8:]}</a>"
+    res_type = STATUS_ICONS.get(res["type"], "")
+    if "Error" in res["message"]:
+        msg = res["message"]
+        row = f"{info_time} {res_type} <span id=red>{msg}</span><br>"
+        if res["details"]:
+            details = res["details"]
+            row += (
+                f"{STATUS_DETAILS_TAG}{STATUS_SUMMARY_TAG}(detaljer)</summary>"
+                f'<pre style="{STATUS_PRE_STYLE}">{details}</pre></details>'
+            )
+    else:
+        row = f"{info_time} {res_type} {res['message']}<br>"
+    _status_row_cache.set(key, row)
+    return row
+
+
+async def get_analytics_status_feed(token: str, event: dict) -> tuple[str, str]:
+    """Get video analytics status messages as html, and tag identifying them.
+
+    The feed is only rendered again when new messages have arrived, and
+    then only the new messages are rendered.
+    """
+    result_list = await StatusAdapter().get_status(token, event["id"], 8)
+    keys = "\n".join(get_status_key(res) for res in result_list)
+    tag = hashlib.sha256(keys.encode()).hexdigest()[:16]
+    cached = _status_feed_cache.get(event["id"])
+    if cached is not None and cached[0] == tag:
+        return cached
+    feed = (tag, "".join(render_status_row(res) for res in result_list))
+    _status_feed_cache.set(event["id"], feed)
+    return feed
+
+
 async def get_analytics_status(token: str, event: dict) -> str:
     """Get video analytics status messages."""
-    response = ""
-    result_list = await StatusAdapter().get_status(token, event["id"], 8)
-    for res in result_list:
-        info_time = f"<a title={res['time']}>{res['time'][-8:]}</a>"
-        res_type = ""
-        if res["type"] in ["VIDEO_SERVICE_CAPTURE_SRT", "VIDEO_SERVICE_CAPTURE_LOCAL"]:
-            res_type = "<img id=menu_icon src=../static/capture.png title=Video>"
-        elif res["type"] == "VIDEO_SERVICE_DETECT":
-            res_type = "<img id=menu_icon src=../static/detect.png title=Deteksjon>"
-        elif res["type"] == "integration_status":
-            res_type = "<img id=menu_icon src=../static/upload.png title=Opplasting>"
-        if "Error" in res["message"]:
-            msg = res["message"]
-            response += f"{info_time} {res_type} <span id=red>{msg}</span><br>"
-            if res["details"]:
-                details_tag = '<details style="display: inline;">'
-                summary_tag = (
-                    '<summary style="display: inline; list-style: none; '
-                    'color: #0066cc; text-decoration: underline; '
-                    'cursor: pointer;">'
-                )
-                pre_style = (
-                    "margin: 5px 0; padding: 8px; background: #f5f5f5; "
-                    "border-left: 3px solid #ccc; font-size: 0.9em; "
-                    "white-space: pre-wrap;"
-                )
-                details = res["details"]
-                response += (
-                    f'{details_tag}{summary_tag}(detaljer)</summary>'
-                    f'<pre style="{pre_style}">{details}</pre></details>'
-                )
-        else:
-            response += f"{info_time} {res_type} {res['message']}<br>"
+    _, response = await get_analytics_status_feed(token, event)
     return response
 
 async def update_config(token: str, event: dict, form: dict) -> str:
@@ -304,30 +408,35 @@ async def update_storage_mode(token: str, event: dict, new_storage_mode: str) ->
         return f"Oppdatert storage mode til {new_storage_mode}. "
     return "Ugyldig storage mode valgt. "
 
-async def get_service_status(token: str, event: dict) -> dict:
-    """Get config details from db."""
-    config_map = {
-        "confidence_limit": ("CONFIDENCE_LIMIT", "get_config"),
-        "storage_mode_name": ("VIDEO_STORAGE_MODE", "get_config"),
-        "detect_analytics_im_size": (
-            "DETECT_ANALYTICS_IMAGE_SIZE", "get_config",
-        ),
-        "video_analytics_im_size_def": (
-            "VIDEO_ANALYTICS_DEFAULT_IMAGE_SIZES", "get_config_list",
-        ),
-        "video_clip_duration": ("VIDEO_CLIP_DURATION", "get_config"),
-        "video_clip_fps": ("VIDEO_CLIP_FPS", "get_config"),
-    }
+SERVICE_STATUS_CONFIGS = {
+    "confidence_limit": ("CONFIDENCE_LIMIT", "str"),
+    "storage_mode_name": ("VIDEO_STORAGE_MODE", "str"),
+    "detect_analytics_im_size": ("DETECT_ANALYTICS_IMAGE_SIZE", "str"),
+    "video_analytics_im_size_def": (
+        "VIDEO_ANALYTICS_DEFAULT_IMAGE_SIZES", "list",
+    ),
+    "video_clip_duration": ("VIDEO_CLIP_DURATION", "str"),
+    "video_clip_fps": ("VIDEO_CLIP_FPS", "str"),
+}
+PHOTO_URL_CONFIGS = {
+    "TRIGGER_LINE_PHOTO_URL": "str",
+    "LATEST_DETECTED_PHOTO_URL": "str",
+}
+
 
-    adapter = ConfigAdapter()
-    result = {}
+def get_service_status_from_configs(configs: dict) -> dict:
+    """Return service status from typed config values."""
+    return {
+        key: configs[config_key]
+        for key, (config_key, _) in SERVICE_STATUS_CONFIGS.items()
+    }
 
-    for key, (config_key, method) in config_map.items():
-        if method == "get_config":
-            result[key] = await adapter.get_config(token, event["id"], config_key)
-        elif method == "get_config_bool":
-            result[key] = await adapter.get_config_bool(token, event["id"], config_key)
-        elif method == "get_config_list":
-            result[key] = await adapter.get_config_list(token, event["id"], config_key)
 
-    return result
+async def get_service_status(token: str, event: dict) -> dict:
+    """Get config details from db."""
+    configs = await ConfigAdapter().get_configs(
+        token,
+        event["id"],
+        dict(SERVICE_STATUS_CONFIGS.values()),
+    )
+    return get_service_status_from_configs(configs)
@@ -0,0 +1,185 @@
+"""Resource module for pushing video event status to the browser."""
+
+import asyncio
+import json
+import logging
+import os
+
+from aiohttp import web
+from dotenv import load_dotenv
+
+from photo_service_gui.services.single_flight import get_auth_scope
+
+from .utils import check_login, get_event
+from .video_events import get_video_status
+
+load_dotenv()
+VIDEO_STATUS_PUSH_INTERVAL = float(os.getenv("VIDEO_STATUS_PUSH_INTERVAL", "0.5"))
+VIDEO_STATUS_KEEPALIVE = float(os.getenv("VIDEO_STATUS_KEEPALIVE", "15"))
+# updates waiting for a slow browser before it is sent the full status instead
+VIDEO_STATUS_QUEUE_SIZE = 10
+
+
+class VideoStatusCollector:
+
+    """Class collecting the video status of one event for its subscribers.
+
+    The status is collected once per interval, however many browser tabs
+    are subscribed, and only the parts that changed are sent to them.
+    Subscribers share a collector only if their tokens have the same
+    authorization scope. Collecting starts with the first subscriber and
+    stops with the last.
+    """
+
+    def __init__(self, event_id: str, scope: str = "") -> None:
+        """Initialize the collector.
+
+        Args:
+            event_id: Event to collect status for
+            scope: Authorization scope of the subscribers
+
+        """
+        self.event_id = event_id
+        self.scope = scope
+        self.status: dict = {}
+        self._subscribers: dict[asyncio.Queue, dict] = {}
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, user: dict) -> asyncio.Queue:
+        """Add subscriber, the queue gets the full status and then changes."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=VIDEO_STATUS_QUEUE_SIZE)
+        if self.status:
+            queue.put_nowait(dict(self.status))
+        self._subscribers[queue] = user
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        """Remove subscriber, stop collecting when there are none left."""
+        self._subscribers.pop(queue, None)
+        if not self._subscribers:
+            self.stop()
+
+    def stop(self) -> None:
+        """Stop collecting and end all subscriptions."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for queue in self._subscribers:
+            self._send(queue, None)
+        self._subscribers.clear()
+
+    def update(self, status: dict) -> dict:
+        """Store new status, return the parts that changed."""
+        changes = {
+            key: value for key, value in status.items()
+            if key not in self.status or self.status[key] != value
+        }
+        self.status.update(changes)
+        return changes
+
+    def _send(self, queue: asyncio.Queue, changes: dict | None) -> None:
+        """Send changes to a subscriber, the full status if it lags behind."""
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            if changes is not None:
+                changes = dict(self.status)
+        queue.put_nowait(changes)
+
+    async def collect(self) -> None:
+        """Collect status once and send changes to all subscribers.
+
+        The most recent subscriber has the freshest token. If collecting
+        with a token fails, the stream of that subscriber is ended and the
+        next one is tried, so one expired login does not stop the others.
+        """
+        for queue, user in reversed(list(self._subscribers.items())):
+            try:
+                event = await get_event(user, self.event_id)
+                status = await get_video_status(user, event)
+            except Exception:
+                logging.exception(f"Error collecting video status {self.event_id}")
+                self._send(queue, None)
+                self._subscribers.pop(queue, None)
+                continue
+            changes = self.update(status)
+            if changes:
+                for subscriber in list(self._subscribers):
+                    self._send(subscriber, changes)
+            return
+
+    async def _run(self) -> None:
+        """Collect status at regular intervals."""
+        while self._subscribers:
+            await self.collect()
+            await asyncio.sleep(VIDEO_STATUS_PUSH_INTERVAL)
+
+
+_collectors: dict[tuple[str, str], VideoStatusCollector] = {}
+
+
+def get_video_status_collector(event_id: str, scope: str) -> VideoStatusCollector:
+    """Return the status collector of an event and scope, created on first use."""
+    if (event_id, scope) not in _collectors:
+        _collectors[event_id, scope] = VideoStatusCollector(event_id, scope)
+    return _collectors[event_id, scope]
+
+
+async def close_video_status_collectors(_app: web.Application) -> None:
+    """Stop all collectors, so open status streams end on shutdown."""
+    while _collectors:
+        _, collector = _collectors.popitem()
+        collector.stop()
+
+
+class VideoEventsStream(web.View):
+
+    """Class representing the video event status stream (server-sent events)."""
+
+    async def get(self) -> web.StreamResponse:
+        """Get route function that streams video status changes."""
+        try:
+            event_id = self.request.rel_url.query["event_id"]
+        except Exception:
+            return web.HTTPBadRequest(reason="Mangler event_id.")
+        try:
+            user = await check_login(self)
+            # the subscriber must have access to the event itself
+            await get_event(user, event_id)
+        except Exception:
+            return web.HTTPUnauthorized()
+
+        response = web.StreamResponse(
+            headers={
+                "Content-Type": "text/event-stream",
+                "Cache-Control": "no-cache",
+                "X-Accel-Buffering": "no",
+            },
+        )
+        await response.prepare(self.request)
+        collector = get_video_status_collector(
+            event_id, get_auth_scope(user["token"]),
+        )
+        queue = collector.subscribe(user)
+        try:
+            while True:
+                try:
+                    changes = await asyncio.wait_for(
+                        queue.get(), VIDEO_STATUS_KEEPALIVE,
+                    )
+                except TimeoutError:
+                    # comment line keeps proxies from closing an idle stream
+                    await response.write(b": keepalive\n\n")
+                    continue
+                if changes is None:
+                    # tells the page to stop reconnecting and poll instead
+                    await response.write(b"event: close\ndata: \n\n")
+                    break
+                await response.write(f"data: {json.dumps(changes)}\n\n".encode())
+        except ConnectionResetError:
+            logging.debug(f"Video status stream closed by client {event_id}")
+        finally:
+            collector.unsubscribe(queue)
+        return response
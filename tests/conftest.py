@@ -1,6 +1,7 @@
 """Conftest module."""
 
 import time
+from collections.abc import AsyncIterator
 from http import HTTPStatus
 from os import environ as env
 from pathlib import Path
@@ -13,6 +14,8 @@ from dotenv import load_dotenv
 from requests.exceptions import ConnectionError as RequestsConnectionError
 
 from photo_service_gui import create_app
+from photo_service_gui.services.client_session_pool import close_client_sessions
+from photo_service_gui.services.status_adapter import close_status_writer
 
 load_dotenv()
 HOST_PORT = int(env.get("HOST_PORT", "8080"))
@@ -25,6 +28,14 @@ async def client(aiohttp_client: Any) -> _TestClient:
     return await aiohttp_client(app)
 
 
+@pytest.fixture(autouse=True)
+async def client_sessions() -> AsyncIterator[None]:
+    """Close shared client sessions and status writer created during the test."""
+    yield
+    await close_status_writer()
+    await close_client_sessions()
+
+
 def is_responsive(url: str) -> bool:
     """Return true if response from service is 200."""
     url = f"{url}/ping"
@@ -7,4 +7,19 @@ Modules:
     test_status_adapter
     test_config_adapter
     test_events_adapter
+    test_client_session_pool
+    test_ttl_cache
+    test_google_cloud_storage_adapter
+    test_cloud_storage_service
+    test_thumbnail_service
+    test_foto_service
+    test_transcode_service
+    test_directory_index
+    test_photos_file_adapter
+    test_video_events_stream
+    test_single_flight
+    test_video_events
+    test_status_writer
+    test_time_utils
+    test_live_stream_service
 """
@@ -0,0 +1,32 @@
+"""Integration test cases for the client_session_pool."""
+
+import pytest
+
+from photo_service_gui.services.client_session_pool import (
+    close_client_sessions,
+    get_client_session,
+    init_client_sessions,
+)
+
+SERVICE_URL = "http://localhost:8092"
+OTHER_SERVICE_URL = "http://localhost:8082"
+
+
+@pytest.mark.integration
+async def test_get_client_session_is_shared() -> None:
+    """Should return the same session for the same service."""
+    session = get_client_session(SERVICE_URL)
+    assert get_client_session(SERVICE_URL) is session
+    assert get_client_session(OTHER_SERVICE_URL) is not session
+
+
+@pytest.mark.integration
+async def test_close_client_sessions() -> None:
+    """Should close all sessions and create new ones on next use."""
+    init_client_sessions([SERVICE_URL, OTHER_SERVICE_URL])
+    session = get_client_session(SERVICE_URL)
+
+    await close_client_sessions()
+
+    assert session.closed
+    assert get_client_session(SERVICE_URL) is not session
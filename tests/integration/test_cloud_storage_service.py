@@ -0,0 +1,85 @@
+"""Integration test cases for the cloud_storage_service."""
+
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import CloudStorageService, cloud_storage_service
+
+
+@pytest.mark.integration
+async def test_list_blobs_runs_in_thread_pool(mocker: Any) -> None:
+    """Should run blocking storage call outside the event loop thread."""
+    calling_threads = []
+
+    def list_blobs(event_id: str, prefix: str) -> list[dict]:
+        calling_threads.append(threading.current_thread().name)
+        return [{"name": f"{event_id}/{prefix}photo.jpg"}]
+
+    mocker.patch.object(
+        cloud_storage_service.GoogleCloudStorageAdapter,
+        "list_blobs",
+        side_effect=list_blobs,
+    )
+    result = await CloudStorageService().list_blobs("event_1", "CAPTURE/")
+    assert result == [{"name": "event_1/CAPTURE/photo.jpg"}]
+    assert calling_threads[0].startswith("cloud-storage")
+
+
+@pytest.mark.integration
+async def test_delete_blob_time_limit(mocker: Any) -> None:
+    """Should give up on a storage call exceeding the time limit."""
+    mocker.patch.object(
+        cloud_storage_service.GoogleCloudStorageAdapter,
+        "delete_blob",
+        side_effect=lambda _blob_name: time.sleep(0.5),
+    )
+    mocker.patch.object(cloud_storage_service, "GOOGLE_STORAGE_TIMEOUT", 0.01)
+    with pytest.raises(TimeoutError):
+        await CloudStorageService().delete_blob("event_1/CAPTURE/photo.jpg")
+
+
+@pytest.mark.integration
+async def test_get_queue_length_is_cached(mocker: Any) -> None:
+    """Should count blobs once and serve the count from cache."""
+    cloud_storage_service._queue_length_cache.clear()  # noqa: SLF001
+    count_blobs = mocker.patch.object(
+        cloud_storage_service.GoogleCloudStorageAdapter,
+        "count_blobs",
+        return_value=42,
+    )
+    service = CloudStorageService()
+    assert await service.get_queue_length("event_1", "CAPTURE/") == 42  # noqa: PLR2004
+    assert await service.get_queue_length("event_1", "CAPTURE/") == 42  # noqa: PLR2004
+    count_blobs.assert_called_once_with("event_1", "CAPTURE/")
+
+
+@pytest.mark.integration
+async def test_move_blobs_reports_result_per_blob(mocker: Any) -> None:
+    """Should move all blobs, also after one move has failed."""
+
+    def move_blob(source_blob_name: str, destination_blob_name: str) -> str:
+        if "b.jpg" in source_blob_name:
+            err_msg = "GoogleCloudStorageAdapter.move_blob"
+            raise Exception(err_msg)
+        return destination_blob_name
+
+    mocker.patch.object(
+        cloud_storage_service.GoogleCloudStorageAdapter,
+        "move_blob",
+        side_effect=move_blob,
+    )
+    results = await CloudStorageService().move_blobs(
+        {
+            "event_1/DETECT/a.jpg": "event_1/DETECT_ARCHIVE/a.jpg",
+            "event_1/DETECT/b.jpg": "event_1/DETECT_ARCHIVE/b.jpg",
+            "event_1/DETECT/c.jpg": "event_1/DETECT_ARCHIVE/c.jpg",
+        },
+    )
+    assert results == {
+        "event_1/DETECT/a.jpg": "",
+        "event_1/DETECT/b.jpg": "GoogleCloudStorageAdapter.move_blob",
+        "event_1/DETECT/c.jpg": "",
+    }
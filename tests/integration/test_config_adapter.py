@@ -1,11 +1,18 @@
 """Integration test cases for the config_adapter."""
 
 import os
+from pathlib import Path
+from typing import Any
 
 import pytest
 from aiohttp import web
 
 from photo_service_gui.services import ConfigAdapter
+from photo_service_gui.services.config_adapter import (
+    GlobalSettings,
+    convert_config_value,
+)
+from photo_service_gui.services.ttl_cache import TTLCache
 
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
@@ -156,6 +163,79 @@ async def test_get_config_img_res_tuple(
         )
 
 
+@pytest.mark.integration
+async def test_get_configs(
+    config_adapter: ConfigAdapter,
+    mock_token: str,
+) -> None:
+    """Should return typed config values."""
+    try:
+        result = await config_adapter.get_configs(
+            token=mock_token,
+            event_id="event-123",
+            key_types={
+                "CONFIDENCE_LIMIT": "str",
+                "VIDEO_CLIP_FPS": "int",
+                "VIDEO_ANALYTICS_DEFAULT_IMAGE_SIZES": "list",
+            },
+        )
+        assert isinstance(result["CONFIDENCE_LIMIT"], str)
+        assert isinstance(result["VIDEO_CLIP_FPS"], int)
+        assert isinstance(result["VIDEO_ANALYTICS_DEFAULT_IMAGE_SIZES"], list)
+    except Exception:
+        pytest.skip("Service not available or authentication required")
+
+
+@pytest.mark.integration
+async def test_get_configs_reads_keys_of_other_services_fresh(
+    config_adapter: ConfigAdapter, mocker: Any,
+) -> None:
+    """Should cache own settings, but read photo urls written by detect again."""
+    get_all_configs = mocker.patch.object(
+        ConfigAdapter,
+        "get_all_configs",
+        side_effect=[
+            [
+                {"key": "CONFIDENCE_LIMIT", "value": "0.5"},
+                {"key": "LATEST_DETECTED_PHOTO_URL", "value": "photo_1.jpg"},
+            ],
+            [
+                {"key": "CONFIDENCE_LIMIT", "value": "0.5"},
+                {"key": "LATEST_DETECTED_PHOTO_URL", "value": "photo_2.jpg"},
+            ],
+        ],
+    )
+    mocker.patch(
+        "photo_service_gui.services.config_adapter._config_cache",
+        TTLCache(16, 60),
+    )
+    key_types = {"CONFIDENCE_LIMIT": "str", "LATEST_DETECTED_PHOTO_URL": "str"}
+    first = await config_adapter.get_configs("token", "event_fresh", key_types)
+    second = await config_adapter.get_configs("token", "event_fresh", key_types)
+    assert first["LATEST_DETECTED_PHOTO_URL"] == "photo_1.jpg"
+    assert second["LATEST_DETECTED_PHOTO_URL"] == "photo_2.jpg"
+    assert get_all_configs.call_count == 2  # noqa: PLR2004
+    # own settings alone are served from cache
+    await config_adapter.get_configs(
+        "token", "event_fresh", {"CONFIDENCE_LIMIT": "str"},
+    )
+    assert get_all_configs.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_convert_config_value() -> None:
+    """Should convert config values to the given type."""
+    assert convert_config_value("key", "True", "bool") is True
+    assert convert_config_value("key", "no", "bool") is False
+    assert convert_config_value("key", "20", "int") == int("20")
+    assert convert_config_value("key", '["a", "b"]', "list") == ["a", "b"]
+    assert convert_config_value("key", "['a', 'b']", "list") == ["a", "b"]
+    assert convert_config_value("key", ["a"], "list") == ["a"]
+    assert convert_config_value("key", "480x640", "img_res_tuple") == (480, 640)
+    with pytest.raises(ValueError, match="unknown config type"):
+        convert_config_value("key", "value", "float")
+
+
 @pytest.mark.integration
 async def test_create_config(
     config_adapter: ConfigAdapter,
@@ -227,3 +307,27 @@ async def test_update_config_list(
         assert isinstance(result, str)
     except Exception:
         pytest.skip("Service not available or authentication failed")
+
+
+@pytest.mark.integration
+async def test_global_settings_reload(tmp_path: Path) -> None:
+    """Should parse settings once and reload only when the file changes."""
+    settings_file = tmp_path / "global_settings.json"
+    settings_file.write_text('{"KEY": "first"}')
+    os.utime(settings_file, ns=(1_000_000_000, 1_000_000_000))
+    global_settings = GlobalSettings(settings_file)
+
+    values = global_settings.get_values()
+    assert values["KEY"] == "first"
+    assert global_settings.get_values() is values
+    with pytest.raises(TypeError):
+        values["KEY"] = "changed"  # type: ignore[index]
+
+    settings_file.write_text('{"KEY": "second"}')
+    os.utime(settings_file, ns=(2_000_000_000, 2_000_000_000))
+    assert global_settings.get_values()["KEY"] == "second"
+
+    # invalid file - keep last valid settings
+    settings_file.write_text("{")
+    os.utime(settings_file, ns=(3_000_000_000, 3_000_000_000))
+    assert global_settings.get_values()["KEY"] == "second"
@@ -0,0 +1,41 @@
+"""Integration test cases for the directory_index."""
+
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import directory_index
+from photo_service_gui.services.directory_index import DirectoryIndex
+
+
+@pytest.mark.integration
+async def test_unchanged_folder_is_not_rescanned(tmp_path: Path, mocker: Any) -> None:
+    """Should count files once while folder is unchanged."""
+    (tmp_path / "clip_1.mp4").write_bytes(b"video")
+    (tmp_path / "archive").mkdir()
+    os.utime(tmp_path, (1000, 1000))
+    scandir = mocker.spy(directory_index.os, "scandir")
+    index = DirectoryIndex(str(tmp_path))
+    assert index.count_files() == 1
+    assert index.count_files() == 1
+    assert scandir.call_count == 1
+
+
+@pytest.mark.integration
+async def test_changed_folder_is_rescanned(tmp_path: Path) -> None:
+    """Should see files added and removed since last scan."""
+    os.utime(tmp_path, (1000, 1000))
+    index = DirectoryIndex(str(tmp_path))
+    assert index.get_file_names() == []
+    (tmp_path / "clip_1.mp4").write_bytes(b"video")
+    assert index.get_file_names() == ["clip_1.mp4"]
+    (tmp_path / "clip_1.mp4").unlink()
+    assert index.count_files() == 0
+
+
+@pytest.mark.integration
+async def test_missing_folder(tmp_path: Path) -> None:
+    """Should count no files in a missing folder."""
+    assert DirectoryIndex(str(tmp_path / "RAW_CAPTURE")).count_files() == 0
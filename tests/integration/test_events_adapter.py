@@ -1,11 +1,13 @@
 """Integration test cases for the events_adapter."""
 
 import os
+from typing import Any
 
 import pytest
 from aiohttp import web
 
 from photo_service_gui.services import EventsAdapter
+from photo_service_gui.services.events_adapter import invalidate_event_cache
 
 EVENT_HOST_SERVER = os.getenv("EVENT_HOST_SERVER", "localhost")
 EVENT_HOST_PORT = os.getenv("EVENT_HOST_PORT", "8082")
@@ -166,3 +168,27 @@ async def test_sync_events(
         assert isinstance(result, str)
     except Exception:
         pytest.skip("Service not available or authentication failed")
+
+
+@pytest.mark.integration
+async def test_get_event_is_cached_per_token(mocker: Any) -> None:
+    """Should fetch event once per token, until invalidated."""
+    fetch_event = mocker.patch.object(
+        EventsAdapter,
+        "fetch_event",
+        return_value={"id": "cached-event", "timezone": "Europe/Oslo"},
+    )
+    event = await EventsAdapter().get_event("token_a", "cached-event")
+    event["name"] = "changed by caller"
+    assert await EventsAdapter().get_event("token_a", "cached-event") == {
+        "id": "cached-event", "timezone": "Europe/Oslo",
+    }
+    assert fetch_event.call_count == 1
+    await EventsAdapter().get_event("token_b", "cached-event")
+    assert fetch_event.call_count == 2  # noqa: PLR2004
+
+    invalidate_event_cache("cached-event")
+    await EventsAdapter().get_event("token_a", "cached-event")
+    assert fetch_event.call_count == 3  # noqa: PLR2004
+    invalidate_event_cache()
+
@@ -0,0 +1,84 @@
+"""Integration test cases for the foto_service."""
+
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import FotoService, PhotosAdapter, foto_service
+
+
+@pytest.mark.integration
+async def test_delete_all_local_photos_bulk(mocker: Any) -> None:
+    """Should use bulk delete endpoint when enabled."""
+    mocker.patch.object(foto_service, "PHOTOS_BULK_DELETE", True)
+    mocker.patch.object(PhotosAdapter, "delete_photos_by_event", return_value=204)
+    get_all_photos = mocker.patch.object(PhotosAdapter, "get_all_photos")
+    result = await FotoService().delete_all_local_photos("token", "event_1")
+    assert result == "Alle lokale kopier er slettet."
+    get_all_photos.assert_not_called()
+
+
+@pytest.mark.integration
+async def test_delete_all_local_photos_one_by_one(mocker: Any) -> None:
+    """Should delete every photo, also after one delete has failed."""
+    mocker.patch.object(foto_service, "PHOTOS_BULK_DELETE", False)
+    delete_photos_by_event = mocker.patch.object(
+        PhotosAdapter, "delete_photos_by_event",
+    )
+    mocker.patch.object(
+        PhotosAdapter,
+        "get_all_photos",
+        return_value=[{"id": "1"}, {"id": "2"}, {"id": "3"}],
+    )
+    delete_photo = mocker.patch.object(
+        PhotosAdapter,
+        "delete_photo",
+        side_effect=[204, Exception("Error - 500"), 204],
+    )
+    result = await FotoService().delete_all_local_photos("token", "event_1")
+    assert result == "2 av 3 lokale kopier er slettet."
+    assert delete_photo.call_count == 3  # noqa: PLR2004
+    delete_photos_by_event.assert_not_called()
+
+
+@pytest.mark.integration
+async def test_update_race_info(mocker: Any) -> None:
+    """Should patch biblist of changed photos only."""
+    patch_photo = mocker.patch.object(PhotosAdapter, "patch_photo", return_value=204)
+    form = {
+        "biblist_1": "[1, 2]",
+        "old_biblist_1": "[1]",
+        "biblist_2": "[3]",
+        "old_biblist_2": "[3]",
+    }
+    result = await FotoService().update_race_info("token", "event_1", form)
+    assert result == "Oppdatert 1 bilder."
+    patch_photo.assert_called_once_with(
+        "token", "1", {"biblist": [1, 2], "event_id": "event_1"},
+    )
+
+
+@pytest.mark.integration
+async def test_patch_photo_fallback(mocker: Any) -> None:
+    """Should get and update full photo when PATCH is not supported."""
+    response = mocker.MagicMock(status=405)
+    session = mocker.MagicMock()
+    session.patch.return_value.__aenter__.return_value = response
+    mocker.patch(
+        "photo_service_gui.services.photos_adapter.get_client_session",
+        return_value=session,
+    )
+    mocker.patch.dict(
+        "photo_service_gui.services.photos_adapter._photo_patch_supported",
+        {"value": True},
+    )
+    mocker.patch.object(
+        PhotosAdapter, "get_photo", return_value={"id": "1", "starred": False},
+    )
+    update_photo = mocker.patch.object(
+        PhotosAdapter, "update_photo", return_value=204,
+    )
+    await FotoService().star_photo("token", "1")
+    await FotoService().unstar_photo("token", "1")
+    assert session.patch.call_count == 1
+    update_photo.assert_called_with("token", "1", {"id": "1", "starred": False})
@@ -0,0 +1,113 @@
+"""Integration test cases for the google_cloud_storage_adapter."""
+
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import google_cloud_storage_adapter
+from photo_service_gui.services.google_cloud_storage_adapter import (
+    GoogleCloudStorageAdapter,
+    get_bucket,
+)
+
+
+@pytest.fixture
+def create_storage_client(mocker: Any) -> Any:
+    """Replace storage client creation with a mock."""
+    google_cloud_storage_adapter._storage_handles.clear()  # noqa: SLF001
+    return mocker.patch.object(
+        google_cloud_storage_adapter,
+        "_create_storage_client",
+        side_effect=mocker.MagicMock,
+    )
+
+
+@pytest.mark.integration
+async def test_get_bucket_is_shared(create_storage_client: Any) -> None:
+    """Should create client once and reuse bucket handles."""
+    bucket = get_bucket("langrenn-sprint")
+    assert get_bucket("langrenn-sprint") is bucket
+    get_bucket("other-bucket")
+    assert create_storage_client.call_count == 1
+
+
+@pytest.mark.integration
+async def test_get_bucket_after_fork(create_storage_client: Any, mocker: Any) -> None:
+    """Should create new client when used from another process."""
+    bucket = get_bucket("langrenn-sprint")
+    mocker.patch.object(
+        google_cloud_storage_adapter.os, "getpid", return_value=-1,
+    )
+    assert get_bucket("langrenn-sprint") is not bucket
+    assert create_storage_client.call_count == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("create_storage_client")
+async def test_count_blobs(mocker: Any) -> None:
+    """Should count blob names under prefix, excluding sub-folders."""
+    mocker.patch.dict(
+        google_cloud_storage_adapter.os.environ,
+        {"GOOGLE_STORAGE_BUCKET": "langrenn-sprint"},
+    )
+    bucket = get_bucket("langrenn-sprint")
+    bucket.list_blobs.return_value = iter(["a.mp4", "b.mp4", "c.mp4"])
+    count = GoogleCloudStorageAdapter().count_blobs("event_1", "CAPTURE/")
+    assert count == 3  # noqa: PLR2004
+    bucket.list_blobs.assert_called_once_with(
+        prefix="event_1/CAPTURE/",
+        delimiter="/",
+        fields="items(name),nextPageToken",
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("create_storage_client")
+async def test_list_blobs_page(mocker: Any) -> None:
+    """Should return one page of blobs and the token for next page."""
+    mocker.patch.dict(
+        google_cloud_storage_adapter.os.environ,
+        {"GOOGLE_STORAGE_BUCKET": "langrenn-sprint"},
+    )
+    blob = mocker.MagicMock()
+    blob.name = "event_1/DETECT/photo.jpg"
+    blob.public_url = "https://storage.googleapis.com/langrenn-sprint/photo.jpg"
+    blob.metadata = {}
+    bucket = get_bucket("langrenn-sprint")
+    bucket.list_blobs.return_value.pages = iter([[blob]])
+    bucket.list_blobs.return_value.next_page_token = "token_2"  # noqa: S105
+    photos, next_page_token = GoogleCloudStorageAdapter().list_blobs_page(
+        "event_1", "DETECT/", "", 60,
+    )
+    assert photos == [
+        {"name": blob.name, "url": blob.public_url, "metadata": {}},
+    ]
+    assert next_page_token == "token_2"  # noqa: S105
+    bucket.list_blobs.assert_called_once_with(
+        prefix="event_1/DETECT/", max_results=60, page_token=None,
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("create_storage_client")
+async def test_delete_blobs(mocker: Any) -> None:
+    """Should delete blobs in one batch and report result per blob."""
+    mocker.patch.dict(
+        google_cloud_storage_adapter.os.environ,
+        {"GOOGLE_STORAGE_BUCKET": "langrenn-sprint"},
+    )
+    bucket = get_bucket("langrenn-sprint")
+    batch = bucket.client.batch.return_value.__enter__.return_value
+    batch._responses = [  # noqa: SLF001
+        mocker.MagicMock(status_code=204),
+        mocker.MagicMock(status_code=404),
+    ]
+    results = GoogleCloudStorageAdapter().delete_blobs(
+        ["event_1/DETECT/a.jpg", "event_1/DETECT/b.jpg"],
+    )
+    assert results == {
+        "event_1/DETECT/a.jpg": "",
+        "event_1/DETECT/b.jpg": "HTTP 404",
+    }
+    bucket.client.batch.assert_called_once_with(raise_exception=False)
+    assert bucket.delete_blob.call_count == 2  # noqa: PLR2004
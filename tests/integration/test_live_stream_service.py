@@ -0,0 +1,55 @@
+"""Integration test cases for the live_stream_service."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import LiveStreamService, live_stream_service
+
+
+def fake_channel(channel_id: str, state: str) -> SimpleNamespace:
+    """Return a channel resource with the given state."""
+    return SimpleNamespace(
+        name=f"projects/p/locations/l/channels/{channel_id}",
+        streaming_state=SimpleNamespace(name=state),
+        streaming_error=None,
+    )
+
+
+@pytest.fixture
+def service(mocker: Any) -> LiveStreamService:
+    """Live stream service with fake adapter, and empty status cache."""
+    adapter = mocker.patch.object(live_stream_service, "LiveStreamAdapter").return_value
+    adapter.parent = "projects/p/locations/l"
+
+    def list_channels() -> list:
+        time.sleep(0.05)
+        return [fake_channel("srt_1", "STREAMING"), fake_channel("srt_2", "STOPPED")]
+
+    adapter.list_channels.side_effect = list_channels
+    live_stream_service._channel_status_cache.clear()  # noqa: SLF001
+    return LiveStreamService(project_id="p", location="l", bucket_name="b")
+
+
+@pytest.mark.integration
+async def test_get_channel_statuses(service: LiveStreamService) -> None:
+    """Should map channel id to status."""
+    statuses = await service.get_channel_statuses()
+    assert statuses["srt_1"]["state"] == "STREAMING"
+    assert statuses["srt_2"] == {
+        "channel_id": "srt_2", "state": "STOPPED", "streaming_error": None,
+    }
+
+
+@pytest.mark.integration
+async def test_get_channel_statuses_is_shared(service: LiveStreamService) -> None:
+    """Should list channels once for concurrent and cached lookups."""
+    results = await asyncio.gather(
+        *(service.get_channel_statuses() for _ in range(5)),
+    )
+    await service.get_channel_statuses()
+    assert all(result == results[0] for result in results)
+    assert service.adapter.list_channels.call_count == 1
@@ -0,0 +1,123 @@
+"""Integration test cases for the photos_file_adapter."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import PhotosFileAdapter, photos_file_adapter
+
+
+@pytest.fixture
+def folder(tmp_path: Path) -> str:
+    """Folder with photos, modified in the order 3, 1, 2 and a sub-folder."""
+    for i, name in enumerate(["photo_3.jpg", "photo_1.jpg", "photo_2.png"]):
+        (tmp_path / name).write_bytes(b"photo")
+        os.utime(tmp_path / name, (1000 + i, 1000 + i))
+    (tmp_path / "photo_config.jpg").write_bytes(b"config")
+    (tmp_path / "archive.jpg").mkdir()
+    return str(tmp_path)
+
+
+@pytest.mark.integration
+async def test_list_files_filters(folder: str) -> None:
+    """Should list files matching suffix, prefix and exclude filters."""
+    names = PhotosFileAdapter().list_files(
+        folder, suffixes=(".jpg",), prefix="photo_", exclude="_config",
+    )
+    assert sorted(names) == ["photo_1.jpg", "photo_3.jpg"]
+
+
+@pytest.mark.integration
+async def test_list_files_sorted_by_mtime(folder: str) -> None:
+    """Should list files oldest first, and skip files modified recently."""
+    (Path(folder) / "photo_4.jpg").write_bytes(b"photo")
+    names = PhotosFileAdapter().list_files(
+        folder, exclude="_config", min_age=60, sort_by_mtime=True,
+    )
+    assert list(names) == ["photo_3.jpg", "photo_1.jpg", "photo_2.png"]
+
+
+@pytest.mark.integration
+async def test_get_files_page(folder: str) -> None:
+    """Should return fixed size pages."""
+    adapter = PhotosFileAdapter()
+    assert adapter.get_files_page(folder, 0, 2, sort_by_mtime=True) == [
+        "photo_3.jpg",
+        "photo_1.jpg",
+    ]
+    assert adapter.get_files_page(folder, 1, 2, sort_by_mtime=True) == [
+        "photo_2.png",
+        "photo_config.jpg",
+    ]
+    assert adapter.get_files_page(folder, 2, 2, sort_by_mtime=True) == []
+
+
+@pytest.mark.integration
+async def test_get_all_capture_files_from_cloud(mocker: Any) -> None:
+    """Should list captured files in cloud storage without blocking."""
+    list_blobs = mocker.patch.object(
+        photos_file_adapter.CloudStorageService,
+        "list_blobs",
+        return_value=[{"name": "event_1/CAPTURE/clip.mp4", "url": "url"}],
+    )
+    files = await PhotosFileAdapter().get_all_capture_files("event_1", "cloud_storage")
+    assert files == [{"name": "event_1/CAPTURE/clip.mp4", "url": "url"}]
+    list_blobs.assert_called_once_with("event_1", "CAPTURE/")
+
+
+@pytest.mark.integration
+async def test_move_to_error_archive_local(tmp_path: Path, mocker: Any) -> None:
+    """Should move local captured file to error archive folder."""
+    mocker.patch.object(photos_file_adapter, "CAPTURED_FILE_PATH", str(tmp_path))
+    error_folder = tmp_path / "error_archive"
+    mocker.patch.object(
+        photos_file_adapter, "CAPTURED_ERROR_ARCHIVE_PATH", str(error_folder),
+    )
+    (tmp_path / "clip.mp4").write_bytes(b"video")
+    name = await PhotosFileAdapter().move_to_error_archive(
+        "event_1", "local_storage", "clip.mp4",
+    )
+    assert name == "clip.mp4"
+    assert (error_folder / "clip.mp4").exists()
+
+
+@pytest.mark.integration
+async def test_convert_raw_to_mp4_re_encodes_when_remux_fails(
+    tmp_path: Path, mocker: Any,
+) -> None:
+    """Should re-encode the clip when copying the streams fails."""
+    output = '{"streams": [{"codec_type": "video", "codec_name": "h264"}]}'
+    mocker.patch.object(
+        photos_file_adapter,
+        "get_probe_command",
+        return_value=[sys.executable, "-c", f"print('{output}')"],
+    )
+    mocker.patch.object(
+        photos_file_adapter,
+        "get_remux_command",
+        return_value=[sys.executable, "-c", "import sys; sys.exit('remux failed')"],
+    )
+    encode = mocker.patch.object(
+        photos_file_adapter,
+        "get_transcode_command",
+        side_effect=lambda input_file, output_file: [
+            sys.executable,
+            "-c",
+            "import shutil, sys; shutil.copy(sys.argv[1], sys.argv[2])",
+            input_file,
+            output_file,
+        ],
+    )
+    (tmp_path / "CAPTURE").mkdir()
+    mocker.patch.object(
+        photos_file_adapter, "CAPTURED_FILE_PATH", str(tmp_path / "CAPTURE"),
+    )
+    raw_file = tmp_path / "clip.mp4"
+    raw_file.write_bytes(b"video")
+    PhotosFileAdapter().convert_raw_to_mp4(str(raw_file))
+    encode.assert_called_once()
+    assert (tmp_path / "CAPTURE" / "clip.mp4").read_bytes() == b"video"
+    assert not raw_file.exists()
@@ -0,0 +1,144 @@
+"""Integration test cases for the single_flight module."""
+
+import asyncio
+import base64
+import json
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services.single_flight import (
+    SingleFlight,
+    get_auth_scope,
+    single_flight,
+)
+from photo_service_gui.services.ttl_cache import TTLCache
+
+
+def create_token(payload: dict) -> str:
+    """Return unsigned token with the given payload."""
+    payload_part = base64.urlsafe_b64encode(json.dumps(payload).encode())
+    return f"header.{payload_part.decode().rstrip('=')}.signature"
+
+
+class FakeAdapter:
+
+    """Adapter counting upstream reads."""
+
+    def __init__(self) -> None:
+        """Initialize the fake adapter."""
+        self.calls = 0
+
+    @single_flight
+    async def get_status(self, token: str, event_id: str) -> list:
+        """Return status after a short delay."""
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if event_id == "missing":
+            err_msg = "get_status failed - 404"
+            raise Exception(err_msg)
+        return [{"token": token, "event_id": event_id}]
+
+
+@pytest.mark.integration
+async def test_concurrent_identical_reads_are_shared() -> None:
+    """Should call upstream once, each caller gets its own copy."""
+    adapter = FakeAdapter()
+    results = await asyncio.gather(
+        *(adapter.get_status("token", "event_1") for _ in range(5)),
+    )
+    assert adapter.calls == 1
+    expected = [{"token": "token", "event_id": "event_1"}]
+    assert all(result == expected for result in results)
+    results[0][0]["event_id"] = "changed"
+    assert results[1][0]["event_id"] == "event_1"
+
+
+@pytest.mark.integration
+async def test_reads_with_other_token_are_not_shared() -> None:
+    """Should call upstream once per token and arguments."""
+    adapter = FakeAdapter()
+    results = await asyncio.gather(
+        adapter.get_status("token_a", "event_1"),
+        adapter.get_status("token_b", "event_1"),
+        adapter.get_status("token_a", "event_2"),
+    )
+    assert adapter.calls == 3  # noqa: PLR2004
+    assert results[1] == [{"token": "token_b", "event_id": "event_1"}]
+
+
+@pytest.mark.integration
+async def test_get_auth_scope() -> None:
+    """Should use role, else subject, else the token itself as scope."""
+    assert get_auth_scope(create_token({"sub": "a", "role": "admin"})) == (
+        "role:admin"
+    )
+    assert get_auth_scope(create_token({"sub": "a"})) == "sub:a"
+    assert get_auth_scope("not-a-jwt") == "not-a-jwt"
+
+
+@pytest.mark.integration
+async def test_reads_with_same_scope_are_shared_once_verified(mocker: Any) -> None:
+    """Should share reads between accepted tokens of same role only."""
+    mocker.patch(
+        "photo_service_gui.services.single_flight._verified_tokens",
+        TTLCache(16, 60),
+    )
+    adapter = FakeAdapter()
+    token_a = create_token({"sub": "a", "role": "admin"})
+    token_b = create_token({"sub": "b", "role": "admin"})
+    token_c = create_token({"sub": "c", "role": "admin"})
+    await adapter.get_status(token_a, "event_1")
+    await adapter.get_status(token_b, "event_1")
+    adapter.calls = 0
+    await asyncio.gather(
+        adapter.get_status(token_a, "event_1"),
+        adapter.get_status(token_b, "event_1"),
+    )
+    assert adapter.calls == 1
+    # token not yet accepted by the backend gets a read of its own
+    adapter.calls = 0
+    await asyncio.gather(
+        adapter.get_status(token_a, "event_1"),
+        adapter.get_status(token_c, "event_1"),
+    )
+    assert adapter.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_sequential_reads_are_not_cached() -> None:
+    """Should call upstream again when previous read has completed."""
+    adapter = FakeAdapter()
+    await adapter.get_status("token", "event_1")
+    await adapter.get_status("token", "event_1")
+    assert adapter.calls == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_error_is_shared() -> None:
+    """Should raise the same error to all concurrent callers."""
+    adapter = FakeAdapter()
+    results = await asyncio.gather(
+        adapter.get_status("token", "missing"),
+        adapter.get_status("token", "missing"),
+        return_exceptions=True,
+    )
+    assert adapter.calls == 1
+    assert all("404" in str(result) for result in results)
+
+
+@pytest.mark.integration
+async def test_cancelled_caller_does_not_cancel_read() -> None:
+    """Should complete the read for remaining callers."""
+    group = SingleFlight()
+
+    async def read() -> str:
+        await asyncio.sleep(0.01)
+        return "status"
+
+    first = asyncio.create_task(group.do("key", read))
+    second = asyncio.create_task(group.do("key", read))
+    await asyncio.sleep(0)
+    first.cancel()
+    assert await second == "status"
+    assert len(group) == 0
@@ -1,19 +1,27 @@
 """Integration test cases for the status_adapter."""
 
 import os
+from typing import Any
 
 import pytest
 from aiohttp import web
 
-from photo_service_gui.services import StatusAdapter
+from photo_service_gui.services import StatusAdapter, status_writer
+from photo_service_gui.services.status_adapter import (
+    check_before_supported,
+    filter_status,
+    get_status_url,
+    is_before_supported,
+)
 
 PHOTOS_HOST_SERVER = os.getenv("PHOTOS_HOST_SERVER", "localhost")
 PHOTOS_HOST_PORT = os.getenv("PHOTOS_HOST_PORT", "8092")
 
 
 @pytest.fixture
-def status_adapter() -> StatusAdapter:
-    """Create a StatusAdapter instance."""
+def status_adapter(mocker: Any) -> StatusAdapter:
+    """Create a StatusAdapter instance, status is written without retries."""
+    mocker.patch.object(status_writer, "STATUS_WRITER_RETRIES", 0)
     return StatusAdapter()
 
 
@@ -84,13 +92,14 @@ async def test_create_status(
 ) -> None:
     """Should create a new status message."""
     try:
-        result = await status_adapter.create_status(
+        written = await status_adapter.create_status(
             token=mock_token,
             event=sample_event,
             status_type="info",
             message="Test status message",
             details={"test": "data"},
         )
+        result = await written
         assert isinstance(result, str)
         assert len(result) > 0
     except Exception:
@@ -105,13 +114,15 @@ async def test_create_and_delete_all_status(
 ) -> None:
     """Should create and then delete all status messages."""
     try:
-        # Create status
-        await status_adapter.create_status(
-            token=mock_token,
-            event=sample_event,
-            status_type="info",
-            message="Test status message",
-            details={"test": "data"},
+        # Create status, wait for it to be written
+        await (
+            await status_adapter.create_status(
+                token=mock_token,
+                event=sample_event,
+                status_type="info",
+                message="Test status message",
+                details={"test": "data"},
+            )
         )
 
         # Delete all status for event
@@ -122,3 +133,44 @@ async def test_create_and_delete_all_status(
         assert isinstance(result, int)
     except Exception:
         pytest.skip("Service not available or authentication failed")
+
+
+@pytest.mark.integration
+async def test_get_status_url_with_cursors() -> None:
+    """Should add type and quoted cursors to url only when given."""
+    url = get_status_url("event-123", 20, since="2026-01-24T10:00:00+01:00")
+    assert url.endswith(
+        "/status?count=20&eventId=event-123&since=2026-01-24T10%3A00%3A00%2B01%3A00",
+    )
+    url = get_status_url("event-123", 20, "VIDEO_SERVICE_DETECT", before="T1")
+    assert url.endswith("&type=VIDEO_SERVICE_DETECT&before=T1")
+
+
+@pytest.mark.integration
+async def test_filter_status() -> None:
+    """Should keep messages between the cursors, cursor times included."""
+    status = [
+        {"time": "2026-01-24T10:00:03"},
+        {"time": "2026-01-24T10:00:02"},
+        {"time": "2026-01-24T10:00:01"},
+    ]
+    assert filter_status(status) == status
+    assert filter_status(status, since="2026-01-24T10:00:02") == status[:2]
+    assert filter_status(status, before="2026-01-24T10:00:02") == status[1:]
+    assert filter_status(
+        status, since="2026-01-24T10:00:02", before="2026-01-24T10:00:02",
+    ) == status[1:2]
+
+
+@pytest.mark.integration
+async def test_check_before_supported(mocker: Any) -> None:
+    """Should notice when the status service returns messages after before."""
+    mocker.patch.dict(
+        "photo_service_gui.services.status_adapter._status_before_supported",
+        {"value": True},
+    )
+    status = [{"time": "2026-01-24T10:00:01"}]
+    check_before_supported(status, "2026-01-24T10:00:01")
+    assert is_before_supported()
+    check_before_supported(status, "2026-01-24T10:00:00")
+    assert not is_before_supported()
@@ -0,0 +1,127 @@
+"""Integration test cases for the status_writer."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from aiohttp import ClientConnectionError, web
+
+from photo_service_gui.services import StatusAdapter, StatusWriter, status_writer
+from photo_service_gui.services.status_adapter import (
+    close_status_writer,
+    get_status_writer,
+)
+
+EVENT = {"id": "event_1", "timezone": "Europe/Oslo"}
+
+
+def get_status_body(message: str) -> dict:
+    """Return status message for the event."""
+    return StatusAdapter().get_status_body(EVENT, "info", message, {})
+
+
+@pytest.fixture
+def writer(mocker: Any) -> StatusWriter:
+    """Status writer without retry delay."""
+    mocker.patch.object(status_writer, "STATUS_WRITER_RETRY_DELAY", 0)
+    mocker.patch.object(status_writer, "STATUS_WRITER_FLUSH_INTERVAL", 0.01)
+    return StatusWriter(mocker.AsyncMock())
+
+
+@pytest.mark.integration
+async def test_messages_are_batched_per_token(
+    writer: StatusWriter, mocker: Any,
+) -> None:
+    """Should send queued messages in one batch per token."""
+    create_status_batch = mocker.patch.object(
+        writer,
+        "send_batch",
+        side_effect=lambda _token, statuses: [
+            status["message"] for status in statuses
+        ],
+    )
+    futures = [
+        await writer.write("token_a", get_status_body("first")),
+        await writer.write("token_b", get_status_body("second")),
+        await writer.write("token_a", get_status_body("third")),
+    ]
+    assert await asyncio.gather(*futures) == ["first", "second", "third"]
+    assert create_status_batch.call_count == 2  # noqa: PLR2004
+    token, statuses = create_status_batch.call_args_list[0].args
+    assert token == "token_a"  # noqa: S105
+    assert [status["message"] for status in statuses] == ["first", "third"]
+    assert statuses[0]["event_id"] == "event_1"
+    await writer.close()
+
+
+@pytest.mark.integration
+async def test_connection_errors_are_retried(writer: StatusWriter, mocker: Any) -> None:
+    """Should retry only messages that failed on connection errors."""
+    create_status_batch = mocker.patch.object(
+        writer,
+        "send_batch",
+        side_effect=[
+            [ClientConnectionError(), web.HTTPBadRequest(reason="Error - 422")],
+            ["id_1"],
+        ],
+    )
+    first = await writer.write("token", get_status_body("first"))
+    second = await writer.write("token", get_status_body("second"))
+    assert await first == "id_1"
+    with pytest.raises(web.HTTPBadRequest):
+        await second
+    assert create_status_batch.call_count == 2  # noqa: PLR2004
+    await writer.close()
+
+
+@pytest.mark.integration
+async def test_close_writes_queued_messages(writer: StatusWriter, mocker: Any) -> None:
+    """Should write queued messages before stopping."""
+    written = []
+
+    async def create_status_batch(_token: str, statuses: list) -> list:
+        await asyncio.sleep(0.01)
+        written.extend(statuses)
+        return ["id"] * len(statuses)
+
+    mocker.patch.object(writer, "send_batch", create_status_batch)
+    for i in range(5):
+        await writer.write("token", get_status_body(f"message {i}"))
+    await writer.close()
+    assert len(written) == 5  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_wrong_number_of_results_fails_batch(
+    writer: StatusWriter, mocker: Any,
+) -> None:
+    """Should fail the batch and keep writing later messages."""
+    mocker.patch.object(writer, "send_batch", side_effect=[["id_1"], ["id_3"]])
+    first = await writer.write("token", get_status_body("first"))
+    second = await writer.write("token", get_status_body("second"))
+    with pytest.raises(Exception, match="Got 1 results for 2 status messages"):
+        await first
+    with pytest.raises(Exception, match="Got 1 results"):
+        await second
+    third = await writer.write("token", get_status_body("third"))
+    assert await third == "id_3"
+    await writer.close()
+
+
+@pytest.mark.integration
+async def test_create_status_is_queued(mocker: Any) -> None:
+    """Should queue status message in the status writer, not wait for it."""
+    write = mocker.patch.object(StatusWriter, "write")
+    await StatusAdapter().create_status("token", EVENT, "info", "message", {})
+    token, status = write.call_args.args
+    assert token == "token"  # noqa: S105
+    assert status["message"] == "message"
+
+
+@pytest.mark.integration
+async def test_status_writer_per_event_loop() -> None:
+    """Should reuse writer in the running loop, a new one after close."""
+    writer = get_status_writer()
+    assert get_status_writer() is writer
+    await close_status_writer()
+    assert get_status_writer() is not writer
@@ -0,0 +1,113 @@
+"""Integration test cases for the thumbnail_service."""
+
+import io
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+from PIL import Image
+
+from photo_service_gui.services import ThumbnailService, thumbnail_service
+from photo_service_gui.services.thumbnail_service import (
+    ThumbnailDiskCache,
+    create_thumbnail,
+    get_file_bytes,
+    get_file_version,
+)
+
+
+def create_jpeg(width: int, height: int) -> bytes:
+    """Return a jpeg image of the given size."""
+    output = io.BytesIO()
+    Image.new("RGB", (width, height), "blue").save(output, format="JPEG")
+    return output.getvalue()
+
+
+@pytest.mark.integration
+async def test_create_thumbnail() -> None:
+    """Should downscale to given height and keep aspect ratio."""
+    thumbnail = create_thumbnail(create_jpeg(1600, 1200), 200, "WEBP")
+    with Image.open(io.BytesIO(thumbnail)) as image:
+        assert image.format == "WEBP"
+        assert image.size == (267, 200)
+
+
+@pytest.mark.integration
+async def test_disk_cache_removes_least_recently_used(tmp_path: Path) -> None:
+    """Should remove least recently used files when full."""
+    disk_cache = ThumbnailDiskCache(str(tmp_path), max_bytes=250)
+    disk_cache.set("first", ".jpg", b"1" * 100)
+    disk_cache.set("second", ".jpg", b"2" * 100)
+    # second is least recently used
+    os.utime(tmp_path / "second.jpg", (1000, 1000))
+    os.utime(tmp_path / "first.jpg", (2000, 2000))
+    disk_cache.set("third", ".jpg", b"3" * 100)
+    assert disk_cache.get("second", ".jpg") is None
+    assert disk_cache.get("first", ".jpg") == b"1" * 100
+    assert disk_cache.get("third", ".jpg") == b"3" * 100
+
+
+@pytest.mark.integration
+async def test_disk_cache_overwrite_counts_size_once(tmp_path: Path) -> None:
+    """Should not count the size of an overwritten file twice."""
+    disk_cache = ThumbnailDiskCache(str(tmp_path), max_bytes=250)
+    disk_cache.set("first", ".jpg", b"1" * 100)
+    disk_cache.set("second", ".jpg", b"2" * 100)
+    disk_cache.set("second", ".jpg", b"2" * 100)
+    assert disk_cache.get("first", ".jpg") == b"1" * 100
+
+
+@pytest.mark.integration
+async def test_get_file_bytes_outside_files_folder() -> None:
+    """Should reject paths outside the files folder."""
+    with pytest.raises(ValueError, match="Ugyldig filnavn"):
+        get_file_bytes("../../pyproject.toml")
+
+
+@pytest.mark.integration
+async def test_get_thumbnail_is_cached(tmp_path: Path, mocker: Any) -> None:
+    """Should create thumbnail from file once and serve it from disk cache."""
+    (tmp_path / "photo.jpg").write_bytes(create_jpeg(800, 600))
+    mocker.patch.object(thumbnail_service, "VISION_ROOT_PATH", str(tmp_path))
+    mocker.patch.object(
+        thumbnail_service,
+        "_disk_cache",
+        ThumbnailDiskCache(str(tmp_path / "cache"), max_bytes=1024 * 1024),
+    )
+    spy = mocker.spy(thumbnail_service, "create_thumbnail")
+    version = get_file_version("photo.jpg")
+    thumbnail = await ThumbnailService().get_thumbnail("", "photo.jpg", version)
+    assert (
+        await ThumbnailService().get_thumbnail("", "photo.jpg", version) == thumbnail
+    )
+    assert spy.call_count == 1
+
+
+@pytest.mark.integration
+async def test_get_version_changes_when_file_replaced(
+    tmp_path: Path, mocker: Any,
+) -> None:
+    """Should give replaced photo a new version and cache key."""
+    mocker.patch.object(thumbnail_service, "VISION_ROOT_PATH", str(tmp_path))
+    (tmp_path / "photo.jpg").write_bytes(create_jpeg(800, 600))
+    os.utime(tmp_path / "photo.jpg", (1000, 1000))
+    service = ThumbnailService()
+    first_version = await service.get_version("", "photo.jpg")
+    (tmp_path / "photo.jpg").write_bytes(create_jpeg(400, 300))
+    second_version = await service.get_version("", "photo.jpg")
+    assert first_version != second_version
+    assert service.get_cache_key("", "photo.jpg", first_version) != (
+        service.get_cache_key("", "photo.jpg", second_version)
+    )
+
+
+@pytest.mark.integration
+async def test_get_version_of_blob_is_generation(mocker: Any) -> None:
+    """Should use the blob generation as version of photos in cloud storage."""
+    mocker.patch(
+        "photo_service_gui.services.thumbnail_service.CloudStorageService.get_blob_generation",
+        return_value="1700000000000001",
+    )
+    version = await ThumbnailService().get_version("photo.jpg", "")
+    assert version == "1700000000000001"
@@ -0,0 +1,51 @@
+"""Integration test cases for the time_utils module."""
+
+import datetime as dt
+
+import pytest
+
+from photo_service_gui.services.time_utils import (
+    format_local_time,
+    format_time_ago,
+    get_event_tz,
+    get_times_ago,
+    get_zone_info,
+)
+
+NOW = dt.datetime(2026, 1, 24, 12, 0, 0)  # noqa: DTZ001
+
+
+@pytest.mark.integration
+async def test_get_zone_info_is_reused() -> None:
+    """Should create time zone object once per name."""
+    assert get_zone_info("Europe/Oslo") is get_zone_info("Europe/Oslo")
+    assert get_event_tz({"timezone": ""}) is dt.UTC
+
+
+@pytest.mark.integration
+async def test_format_local_time() -> None:
+    """Should format local time with one call per format."""
+    event = {"timezone": "Europe/Oslo"}
+    log_time = format_local_time(event, "log")
+    assert dt.datetime.fromisoformat(log_time).second >= 0
+    assert log_time[10] == "T"
+    assert len(format_local_time(event, "HH:MM")) == 5  # noqa: PLR2004
+    assert len(format_local_time(event, "")) == 8  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_format_time_ago() -> None:
+    """Should return seconds, minutes or hours since timestamp."""
+    assert format_time_ago("2026-01-24T11:59:30", NOW) == "30 sec"
+    assert format_time_ago("2026-01-24T11:45:00", NOW) == "15 min"
+    assert format_time_ago("2026-01-24T09:00:00", NOW) == "3 hours"
+    assert format_time_ago("", NOW) == "-"
+    assert format_time_ago("not a time", NOW) == "Error"
+
+
+@pytest.mark.integration
+async def test_get_times_ago() -> None:
+    """Should return time ago for each timestamp."""
+    now = dt.datetime.now(dt.UTC).replace(tzinfo=None)
+    timestamps = [now.isoformat(timespec="seconds"), "", "bad"]
+    assert get_times_ago(timestamps, {"timezone": ""}) == ["0 sec", "-", "Error"]
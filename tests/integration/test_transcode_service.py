@@ -0,0 +1,194 @@
+"""Integration test cases for the transcode_service."""
+
+import os
+import sys
+from collections.abc import AsyncIterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services import TranscodeService, transcode_service
+from photo_service_gui.services.photos_file_adapter import can_remux
+
+
+def fake_transcode_command(input_file: str, output_file: str, *_args: Any) -> list:
+    """Return command copying input to output, or failing for bad files."""
+    script = (
+        "import shutil, sys\n"
+        "if 'bad' in sys.argv[1]:\n"
+        "    sys.exit('Invalid data found when processing input')\n"
+        "shutil.copy(sys.argv[1], sys.argv[2])\n"
+    )
+    return [sys.executable, "-c", script, input_file, output_file]
+
+
+def fake_probe_command(input_file: str) -> list:
+    """Return command printing h264 codec for files named so, else mpeg2."""
+    codec = "h264" if "h264" in input_file else "mpeg2video"
+    output = f'{{"streams": [{{"codec_type": "video", "codec_name": "{codec}"}}]}}'
+    return [sys.executable, "-c", f"print('{output}')"]
+
+
+def create_service(tmp_path: Path) -> TranscodeService:
+    """Return transcode service on temporary folders."""
+    return TranscodeService(
+        str(tmp_path / "RAW_CAPTURE"),
+        str(tmp_path / "CAPTURE"),
+        str(tmp_path / "RAW_CAPTURE" / "error_archive"),
+    )
+
+
+@pytest.fixture
+async def service(tmp_path: Path, mocker: Any) -> AsyncIterator[TranscodeService]:
+    """Transcode service owning the pipeline, with fake ffmpeg."""
+    mocker.patch.object(
+        transcode_service, "get_transcode_command", fake_transcode_command,
+    )
+    mocker.patch.object(transcode_service, "get_remux_command", fake_transcode_command)
+    mocker.patch.object(transcode_service, "get_probe_command", fake_probe_command)
+    (tmp_path / "RAW_CAPTURE").mkdir()
+    (tmp_path / "CAPTURE" / ".transcoding").mkdir(parents=True)
+    service = create_service(tmp_path)
+    assert service._acquire_lock()  # noqa: SLF001
+    yield service
+    await service.close()
+
+
+@pytest.mark.integration
+async def test_transcode(service: TranscodeService, tmp_path: Path) -> None:
+    """Should write output to capture folder and delete raw file."""
+    raw_file = tmp_path / "RAW_CAPTURE" / "clip_1.ts"
+    raw_file.write_bytes(b"video")
+    assert await service.transcode(raw_file)
+    assert (tmp_path / "CAPTURE" / "clip_1.mp4").read_bytes() == b"video"
+    assert not raw_file.exists()
+    assert not list((tmp_path / "CAPTURE" / ".transcoding").iterdir())
+    stats = await service.get_stats()
+    assert stats["done"] == 1
+    assert stats["remuxed"] == 0
+    assert stats["recent_jobs"][0]["error"] == ""
+    assert stats["recent_jobs"][0]["mode"] == "encode"
+
+
+@pytest.mark.integration
+async def test_transcode_remux(
+    service: TranscodeService, tmp_path: Path, mocker: Any,
+) -> None:
+    """Should copy streams, not re-encode, when codecs are compatible."""
+    encode = mocker.spy(transcode_service, "get_transcode_command")
+    raw_file = tmp_path / "RAW_CAPTURE" / "clip_h264.ts"
+    raw_file.write_bytes(b"video")
+    assert await service.transcode(raw_file)
+    assert (tmp_path / "CAPTURE" / "clip_h264.mp4").read_bytes() == b"video"
+    assert (await service.get_stats())["remuxed"] == 1
+    encode.assert_not_called()
+
+
+@pytest.mark.integration
+async def test_can_remux() -> None:
+    """Should remux only H.264 video with AAC or no audio."""
+    h264_aac = (
+        '{"streams": [{"codec_type": "video", "codec_name": "h264"},'
+        ' {"codec_type": "audio", "codec_name": "aac"}]}'
+    )
+    h264_mp3 = (
+        '{"streams": [{"codec_type": "video", "codec_name": "h264"},'
+        ' {"codec_type": "audio", "codec_name": "mp3"}]}'
+    )
+    assert can_remux(h264_aac)
+    assert not can_remux(h264_mp3)
+    assert not can_remux('{"streams": []}')
+    assert not can_remux("")
+
+
+@pytest.mark.integration
+async def test_transcode_failed(service: TranscodeService, tmp_path: Path) -> None:
+    """Should move raw file to error archive and report the error."""
+    raw_file = tmp_path / "RAW_CAPTURE" / "bad_clip.ts"
+    raw_file.write_bytes(b"garbage")
+    assert not await service.transcode(raw_file)
+    assert (tmp_path / "RAW_CAPTURE" / "error_archive" / "bad_clip.ts").exists()
+    assert not (tmp_path / "CAPTURE" / "bad_clip.mp4").exists()
+    stats = await service.get_stats()
+    assert stats["failed"] == 1
+    assert stats["recent_jobs"][0]["error"] == (
+        "Invalid data found when processing input"
+    )
+
+
+@pytest.mark.integration
+async def test_scan_skips_files_being_written(
+    service: TranscodeService, tmp_path: Path,
+) -> None:
+    """Should claim complete files once, skip recently modified files."""
+    old_file = tmp_path / "RAW_CAPTURE" / "clip_1.ts"
+    old_file.write_bytes(b"video")
+    os.utime(old_file, (1000, 1000))
+    (tmp_path / "RAW_CAPTURE" / "clip_2.ts").write_bytes(b"video")
+    assert await service.scan() == 1
+    assert await service.scan() == 0
+    assert (await service.get_stats())["queue_depth"] == 1
+    assert (tmp_path / "RAW_CAPTURE" / ".processing" / "clip_1.ts").exists()
+    assert not old_file.exists()
+
+
+@pytest.fixture
+def settings(mocker: Any) -> None:
+    """Use default encoder settings, without event config."""
+    mocker.patch.object(
+        TranscodeService,
+        "load_settings",
+        return_value={"preset": "fast", "crf": 23, "audio_bitrate": "128k"},
+    )
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("settings")
+async def test_only_lock_owner_transcodes(
+    service: TranscodeService, tmp_path: Path,
+) -> None:
+    """Should run pipeline in owner only, started and reported from any worker."""
+    other = create_service(tmp_path)
+    result = await other.start("token", "event_1")
+    assert result.startswith("Transkoding startet")
+    assert not other.is_owner()
+    assert not other.is_running()
+    await service.supervise()
+    assert service.is_running()
+    stats = await other.get_stats()
+    assert stats["active"]
+    assert stats["event_id"] == "event_1"
+    await other.stop()
+    await service.supervise()
+    assert not service.is_running()
+    assert not service.is_owner()
+    assert not (await other.get_stats())["active"]
+
+
+@pytest.mark.integration
+@pytest.mark.usefixtures("settings")
+async def test_other_worker_takes_over(
+    service: TranscodeService, tmp_path: Path,
+) -> None:
+    """Should let another worker take the lock when the owner closes."""
+    other = create_service(tmp_path)
+    await other.start("token", "event_1")
+    assert not other.is_owner()
+    await service.close()
+    await other.supervise()
+    assert other.is_owner()
+    assert other.is_running()
+    await other.close()
+
+
+@pytest.mark.integration
+async def test_no_state_files_before_start(tmp_path: Path) -> None:
+    """Should not take the lock or write stats until transcoding is started."""
+    idle = TranscodeService(
+        str(tmp_path / "idle" / "RAW_CAPTURE"), str(tmp_path / "idle" / "CAPTURE"),
+    )
+    await idle.supervise()
+    await idle.stop()
+    assert not idle.is_owner()
+    assert not (tmp_path / "idle").exists()
@@ -0,0 +1,59 @@
+"""Integration test cases for the ttl_cache."""
+
+from typing import Any
+
+import pytest
+
+from photo_service_gui.services.ttl_cache import TTLCache
+
+
+@pytest.mark.integration
+async def test_get_and_set() -> None:
+    """Should return cached value, or default when missing."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set(("event-123", "key"), "value")
+    assert cache.get(("event-123", "key")) == "value"
+    assert cache.get(("event-123", "other")) is None
+    assert cache.get(("event-123", "other"), "default") == "default"
+
+
+@pytest.mark.integration
+async def test_expired_entry(mocker: Any) -> None:
+    """Should not return value after time to live has passed."""
+    monotonic = mocker.patch(
+        "photo_service_gui.services.ttl_cache.time.monotonic", return_value=100.0,
+    )
+    cache = TTLCache(maxsize=10, ttl=5)
+    cache.set("key", "value")
+    monotonic.return_value = 104.0
+    assert cache.get("key") == "value"
+    monotonic.return_value = 106.0
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+@pytest.mark.integration
+async def test_size_bound() -> None:
+    """Should evict least recently used entry when full."""
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    cache.get("a")
+    cache.set("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+
+@pytest.mark.integration
+async def test_delete_and_clear() -> None:
+    """Should remove entries."""
+    cache = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.delete("a")
+    cache.delete("missing")
+    assert cache.get("a") is None
+    assert cache.list_keys() == ["b"]
+    cache.clear()
+    assert len(cache) == 0
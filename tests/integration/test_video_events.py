@@ -0,0 +1,142 @@
+"""Integration test cases for the video_events status."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from photo_service_gui.views import video_events
+from photo_service_gui.views.video_events import (
+    get_analytics_status_feed,
+    render_status_row,
+)
+
+EVENT = {"id": "event_feed"}
+
+
+def status_row(my_id: str, message: str) -> dict:
+    """Return a status message."""
+    return {
+        "id": my_id,
+        "time": "2026-01-24T10:00:00",
+        "type": "VIDEO_SERVICE_DETECT",
+        "message": message,
+        "details": {},
+    }
+
+
+@pytest.mark.integration
+async def test_render_status_row_error_with_details() -> None:
+    """Should render error messages red, with details."""
+    res = status_row("row_error", "Error detecting")
+    res["details"] = "stack trace"
+    row = render_status_row(res)
+    assert "<span id=red>Error detecting</span>" in row
+    assert "stack trace</pre></details>" in row
+    assert "detect.png" in row
+
+
+@pytest.mark.integration
+async def test_feed_is_only_rendered_when_changed(mocker: Any) -> None:
+    """Should keep tag and html until new messages arrive."""
+    get_status = mocker.patch.object(
+        video_events.StatusAdapter,
+        "get_status",
+        side_effect=[
+            [status_row("1", "first")],
+            [status_row("1", "first")],
+            [status_row("2", "second"), status_row("1", "first")],
+        ],
+    )
+    render = mocker.spy(video_events, "render_status_row")
+
+    tag, html = await get_analytics_status_feed("token", EVENT)
+    assert await get_analytics_status_feed("token", EVENT) == (tag, html)
+    assert render.call_count == 1
+
+    new_tag, new_html = await get_analytics_status_feed("token", EVENT)
+    assert new_tag != tag
+    assert new_html.endswith(html)
+    assert "second" in new_html
+    assert get_status.call_count == 3  # noqa: PLR2004
+
+
+@pytest.fixture
+def status_parts(mocker: Any) -> dict:
+    """Fake all parts of the video status."""
+    return {
+        "feed": mocker.patch.object(
+            video_events, "get_analytics_status_feed", return_value=("tag", "ok"),
+        ),
+        "raw_queue": mocker.patch.object(
+            video_events.PhotosFileAdapter,
+            "get_local_raw_capture_queue_length",
+            return_value=1,
+        ),
+        "queue": mocker.patch.object(
+            video_events.PhotosFileAdapter,
+            "get_local_capture_queue_length",
+            return_value=2,
+        ),
+        "cloud_queue": mocker.patch.object(
+            video_events.CloudStorageService, "get_queue_length", return_value=3,
+        ),
+        "configs": mocker.patch.object(
+            video_events.ConfigAdapter,
+            "get_configs",
+            return_value={
+                "CONFIDENCE_LIMIT": "0.5",
+                "VIDEO_STORAGE_MODE": "cloud_storage",
+                "DETECT_ANALYTICS_IMAGE_SIZE": "640",
+                "VIDEO_ANALYTICS_DEFAULT_IMAGE_SIZES": ["640"],
+                "VIDEO_CLIP_DURATION": "2",
+                "VIDEO_CLIP_FPS": "25",
+                "TRIGGER_LINE_PHOTO_URL": "trigger.jpg",
+                "LATEST_DETECTED_PHOTO_URL": "latest.jpg",
+            },
+        ),
+        "instances": mocker.patch.object(
+            video_events, "get_service_instances", return_value=[{"id": "1"}],
+        ),
+    }
+
+
+@pytest.mark.integration
+async def test_get_video_status(status_parts: dict) -> None:
+    """Should combine all parts, configs are fetched once."""
+    status = await video_events.get_video_status({"token": "token"}, EVENT)
+    assert status["video_status"] == "ok"
+    assert status["local_raw_captured_queue_length"] == 1
+    assert status["cloud_captured_queue_length"] == 3  # noqa: PLR2004
+    assert status["service_status"]["storage_mode_name"] == "cloud_storage"
+    assert status["photo_latest"] == "latest.jpg"
+    assert status["trigger_line_url"] == "trigger.jpg"
+    assert status["service_instances"] == [{"id": "1"}]
+    assert status_parts["configs"].call_count == 1
+
+
+@pytest.mark.integration
+async def test_get_video_status_slow_part(status_parts: dict, mocker: Any) -> None:
+    """Should return default for a part exceeding its time limit."""
+
+    async def slow_queue_length(*_args: Any) -> int:
+        await asyncio.sleep(1)
+        return 3
+
+    status_parts["cloud_queue"].side_effect = slow_queue_length
+    mocker.patch.object(video_events, "VIDEO_STATUS_TIMEOUT", 0.05)
+    status = await video_events.get_video_status({"token": "token"}, EVENT)
+    assert status["cloud_captured_queue_length"] == 0
+    assert status["video_status"] == "ok"
+    assert status["local_captured_queue_length"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.integration
+async def test_get_video_status_failing_part(status_parts: dict) -> None:
+    """Should return defaults for a failing part, others are kept."""
+    status_parts["configs"].side_effect = Exception("get_configs failed")
+    status = await video_events.get_video_status({"token": "token"}, EVENT)
+    assert status["service_status"] == {}
+    assert status["photo_latest"] == ""
+    assert status["trigger_line_url"] == ""
+    assert status["cloud_captured_queue_length"] == 3  # noqa: PLR2004
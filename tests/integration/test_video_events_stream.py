@@ -0,0 +1,131 @@
+"""Integration test cases for the video_events_stream."""
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from photo_service_gui.views import video_events_stream
+from photo_service_gui.views.video_events_stream import VideoStatusCollector
+
+USER = {"name": "operator", "loggedin": True, "token": "token"}
+
+
+@pytest.fixture
+def get_video_status(mocker: Any) -> Any:
+    """Fake status collection, counting calls."""
+    mocker.patch.object(
+        video_events_stream,
+        "get_event",
+        return_value={"id": "event_1"},
+    )
+    return mocker.patch.object(
+        video_events_stream,
+        "get_video_status",
+        side_effect=[
+            {"video_status": "ok", "cloud_captured_queue_length": 1},
+            {"video_status": "ok", "cloud_captured_queue_length": 2},
+            {"video_status": "ok", "cloud_captured_queue_length": 2},
+        ],
+    )
+
+
+@pytest.mark.integration
+async def test_collect_once_for_all_subscribers(get_video_status: Any) -> None:
+    """Should collect once and send only changes to each subscriber."""
+    collector = VideoStatusCollector("event_1")
+    queues = [asyncio.Queue(), asyncio.Queue()]
+    collector._subscribers = dict.fromkeys(queues, USER)  # noqa: SLF001
+
+    await collector.collect()
+    await collector.collect()
+    await collector.collect()
+
+    assert get_video_status.call_count == 3  # noqa: PLR2004
+    for queue in queues:
+        assert queue.get_nowait() == {
+            "video_status": "ok", "cloud_captured_queue_length": 1,
+        }
+        assert queue.get_nowait() == {"cloud_captured_queue_length": 2}
+        assert queue.empty()
+
+
+@pytest.mark.integration
+async def test_new_subscriber_gets_full_status(get_video_status: Any) -> None:
+    """Should send current status to a subscriber that joins later."""
+    collector = VideoStatusCollector("event_1")
+    first = collector.subscribe(USER)
+    status = await first.get()
+    second = collector.subscribe(USER)
+    assert second.get_nowait() == status
+    assert get_video_status.call_count == 1
+    collector.unsubscribe(first)
+    collector.stop()
+    assert second.get_nowait() is None
+    assert collector._task is None  # noqa: SLF001
+
+
+@pytest.mark.integration
+async def test_expired_login_ends_own_stream_only(mocker: Any) -> None:
+    """Should end stream of subscriber whose token fails, collect with next."""
+    mocker.patch.object(
+        video_events_stream,
+        "get_event",
+        side_effect=[Exception("Login expired"), {"id": "event_1"}],
+    )
+    mocker.patch.object(
+        video_events_stream, "get_video_status", return_value={"video_status": "ok"},
+    )
+    collector = VideoStatusCollector("event_1")
+    valid: asyncio.Queue = asyncio.Queue()
+    expired: asyncio.Queue = asyncio.Queue()
+    collector._subscribers = {  # noqa: SLF001
+        valid: USER,
+        expired: {**USER, "token": "expired"},
+    }
+    await collector.collect()
+    assert expired.get_nowait() is None
+    assert valid.get_nowait() == {"video_status": "ok"}
+    assert list(collector._subscribers) == [valid]  # noqa: SLF001
+
+
+@pytest.mark.integration
+async def test_collectors_per_auth_scope() -> None:
+    """Should not share collectors between authorization scopes."""
+    admin = video_events_stream.get_video_status_collector("event_1", "role:admin")
+    other = video_events_stream.get_video_status_collector("event_1", "role:user")
+    assert admin is not other
+    assert admin is video_events_stream.get_video_status_collector(
+        "event_1", "role:admin",
+    )
+    await video_events_stream.close_video_status_collectors(None)
+
+
+@pytest.mark.integration
+async def test_slow_subscriber_gets_full_status() -> None:
+    """Should replace queued changes with full status when queue is full."""
+    collector = VideoStatusCollector("event_1")
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    for length in range(3):
+        changes = collector.update({"video_status": "ok", "queue_length": length})
+        collector._send(queue, changes)  # noqa: SLF001
+    assert queue.get_nowait() == {"video_status": "ok", "queue_length": 2}
+    assert queue.empty()
+
+
+@pytest.mark.integration
+async def test_stream_sends_close_event_when_collect_fails(
+    client: Any, mocker: Any,
+) -> None:
+    """Should tell the page to stop reconnecting when its token fails."""
+    mocker.patch.object(video_events_stream, "check_login", return_value=USER)
+    mocker.patch.object(
+        video_events_stream, "get_event", return_value={"id": "event_1"},
+    )
+    mocker.patch.object(
+        video_events_stream,
+        "get_video_status",
+        side_effect=Exception("Login expired"),
+    )
+    response = await client.get("/video_events/stream?event_id=event_1")
+    assert await response.text() == "event: close\ndata: \n\n"